@@ -0,0 +1,167 @@
+"""
+Append-only store for articles.csv.
+
+articles.csv only ever grows: a run appends its new articles and never
+rewrites the rows already there. Two sidecar files next to it replace the
+full read that used to rebuild the dedupe set and the next article_id:
+
+    articles.csv.idx   - 8-byte BLAKE2b digest of each stored (url, badge) pair
+    articles.csv.meta  - JSON with next_article_id, the number of indexed rows
+                         and the CSV size they were indexed at
+
+The sidecars are written after the CSV rows, so a crash (or a hand edit of
+articles.csv) leaves a size mismatch that is detected on open; the index is
+then rebuilt from one scan of the CSV.
+"""
+import csv
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+ARTICLE_FIELDNAMES = [
+    "article_id",
+    "badge",
+    "first_name",
+    "last_name",
+    "title",
+    "source",
+    "date_published",
+    "url"
+]
+
+DIGEST_SIZE = 8
+
+
+def article_digest(url, badge):
+    """Dedupe key of an article: digest of its URL and officer badge."""
+    return hashlib.blake2b(f"{url}\t{badge}".encode("utf-8"), digest_size=DIGEST_SIZE).digest()
+
+
+class ArticleStore:
+    """
+    articles.csv with a persistent (url, badge) index and article_id counter.
+
+    Args:
+        csv_path: Path to articles.csv
+    """
+
+    def __init__(self, csv_path):
+        self.csv_path = Path(csv_path)
+        self.index_path = self.csv_path.with_name(self.csv_path.name + ".idx")
+        self.meta_path = self.csv_path.with_name(self.csv_path.name + ".meta")
+        self.next_article_id = 1
+        self.rows = 0
+        self._digests = set()
+        self._open()
+
+    def _csv_size(self):
+        return self.csv_path.stat().st_size if self.csv_path.exists() else 0
+
+    def _open(self):
+        try:
+            meta = json.loads(self.meta_path.read_text(encoding="utf-8"))
+            data = self.index_path.read_bytes()
+            if meta["csv_size"] != self._csv_size() or len(data) != meta["rows"] * DIGEST_SIZE:
+                raise ValueError("index does not match articles.csv")
+        except (OSError, ValueError, KeyError) as e:
+            if self.csv_path.exists():
+                logging.info(f"Articles: Rebuilding index for {self.csv_path} ({e})")
+            self._rebuild()
+            return
+        self._digests = {data[i:i + DIGEST_SIZE] for i in range(0, len(data), DIGEST_SIZE)}
+        self.rows = meta["rows"]
+        self.next_article_id = meta["next_article_id"]
+        logging.info(f"Articles: Index has {self.rows} articles, next article_id will be {self.next_article_id}")
+
+    def _rebuild(self):
+        """Scan articles.csv once and rewrite the index and meta files."""
+        digests = []
+        if self.csv_path.exists():
+            with self.csv_path.open("r", newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    url = row.get("url", "")
+                    badge = row.get("badge", "")
+                    if url and badge:
+                        digests.append(article_digest(url, badge))
+                    try:
+                        article_id = int(row.get("article_id", 0))
+                        if article_id >= self.next_article_id:
+                            self.next_article_id = article_id + 1
+                    except ValueError:
+                        pass
+        self._digests = set(digests)
+        self.rows = len(digests)
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        tmp_path.write_bytes(b"".join(digests))
+        os.replace(tmp_path, self.index_path)
+        self._write_meta()
+        logging.info(f"Articles: Indexed {self.rows} existing articles, next article_id will be {self.next_article_id}")
+
+    def _write_meta(self):
+        meta = {"next_article_id": self.next_article_id, "rows": self.rows, "csv_size": self._csv_size()}
+        tmp_path = self.meta_path.with_name(self.meta_path.name + ".tmp")
+        tmp_path.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp_path, self.meta_path)
+
+    def append(self, articles):
+        """
+        Assign article_ids to new articles and append them to articles.csv.
+
+        Only articles whose exact URL+badge combination is not stored yet are
+        kept, so the same article can still be linked to several officers.
+        Articles missing a URL or badge cannot be keyed and are skipped too,
+        but counted apart from the duplicates.
+
+        Args:
+            articles: Article dicts scraped this run (article_id is set on the new ones)
+
+        Returns:
+            Tuple of (new_articles_list, duplicate_count, unkeyed_count)
+        """
+        new_articles = []
+        new_digests = []
+        duplicate_count = 0
+        unkeyed_count = 0
+        for article in articles:
+            url = article.get("url", "")
+            badge = article.get("badge", "")
+            if not url or not badge:
+                unkeyed_count += 1
+                logging.debug(f"Articles: Skipping article without url or badge: '{url}' for badge '{badge}'")
+                continue
+            digest = article_digest(url, badge)
+            if digest in self._digests:
+                duplicate_count += 1
+                logging.debug(f"Articles: Skipping duplicate article: {url} for badge {badge}")
+                continue
+            article["article_id"] = self.next_article_id
+            self.next_article_id += 1
+            self._digests.add(digest)
+            new_digests.append(digest)
+            new_articles.append(article)
+
+        if not new_articles:
+            return new_articles, duplicate_count, unkeyed_count
+
+        write_header = self._csv_size() == 0
+        if not write_header:
+            # A file saved without a trailing newline would glue the first new row onto the last one
+            with self.csv_path.open("rb") as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) not in (b"\n", b"\r")
+        with self.csv_path.open("a", newline="", encoding="utf-8") as f:
+            if not write_header and needs_newline:
+                f.write("\r\n")
+            writer = csv.DictWriter(f, fieldnames=ARTICLE_FIELDNAMES, extrasaction="ignore")
+            if write_header:
+                writer.writeheader()
+            writer.writerows(new_articles)
+            f.flush()
+            os.fsync(f.fileno())
+        with self.index_path.open("ab") as f:
+            f.write(b"".join(new_digests))
+        self.rows += len(new_digests)
+        self._write_meta()
+        return new_articles, duplicate_count, unkeyed_count
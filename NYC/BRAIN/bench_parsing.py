@@ -0,0 +1,209 @@
+"""
+Micro-benchmark: per-officer parsing and name-matching cost.
+
+Times the pure-Python work THOTH does for one officer once the pages are
+loaded: parsing a 50-a profile snapshot, scoring the 50-a search result rows
+(identity.best_match, as _search_and_open_profile does) and ranking the
+payroll rows (identity.rank on payroll_api.row_identity, as _rank_payroll_rows
+does, then identity.last_names_match, as _match_last_name does).
+
+The officers and candidate rows come from a seeded generator with suffixes,
+compound last names, truncated first names and one-letter typos, so the
+names.py LRU caches see a realistic mix of repeats and new strings instead
+of one officer over and over. Each case is run with the caches active and
+with the uncached functions; the caches are cleared before every timing run.
+No browser or network access is needed.
+
+Usage:
+    python3 bench_parsing.py [--officers N] [--repeat R] [--seed S]
+"""
+import argparse
+import logging
+import random
+import timeit
+from contextlib import contextmanager
+
+import identity
+import names
+import payroll_api
+from fiftya_parser import parse_profile_snapshot
+from identity import Identity
+
+FIRST_NAMES = [
+    "Lenita", "Leonard", "Lena", "Lisa", "Maria", "Mario", "Marie", "Michael", "Michelle", "Jose",
+    "Joseph", "Josephine", "Ana", "Anna", "Christopher", "Christina", "Daniel", "Danielle", "Kevin",
+    "Sean", "Shawn", "Kimberly", "Robert", "Roberto", "Angel", "Angela", "Luis", "Louis", "Tiffany",
+    "Brian", "Bryan", "Carlos", "Jennifer", "Jonathan", "Nicholas", "Nicole", "Samantha", "Stephen",
+    "Steven", "Victor", "Yolanda", "Alexander", "Alexandra", "Francis", "Frances", "Gregory", "Rafael",
+]
+LAST_NAMES = [
+    "Harrison", "Garcia", "Rodriguez", "Perez", "Smith", "Perez-Smith", "O'Brien", "O'Neill", "Williams",
+    "Johnson", "De La Cruz", "Delacruz", "Nguyen", "Kowalski", "Murphy", "Murray", "Rivera", "Rivers",
+    "Santiago", "Torres", "Cruz-Ortiz", "Ortiz", "McCarthy", "MacArthur", "Brown", "Browne", "Lee",
+    "Leigh", "Chen", "Cheng", "Gonzalez", "Gonzales", "Ramirez", "Ramos", "Fitzgerald", "Vasquez",
+    "Velasquez", "Hernandez", "Fernandez", "Kelly", "Kelley", "Sullivan", "Reyes", "Reyes-Diaz",
+]
+SUFFIXES = ["", "", "", "", " Jr", " Sr", " II", " III"]
+INITIALS = "ABCDEFGHIJKLMNOPRSTW"
+
+
+def _typo(rng, name):
+    """Swap two neighbouring letters (a keying error the trigram score has to absorb)."""
+    if len(name) < 4:
+        return name
+    i = rng.randrange(1, len(name) - 2)
+    return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+
+
+def _variant(rng, first, last):
+    """A candidate name near (first, last): truncated, typo'd, suffixed or a namesake."""
+    roll = rng.random()
+    if roll < 0.15:
+        return first[:rng.randint(3, len(first))], last
+    if roll < 0.3:
+        return first, _typo(rng, last)
+    if roll < 0.45:
+        return rng.choice(FIRST_NAMES), last
+    if roll < 0.55:
+        return first, last + rng.choice(SUFFIXES[4:])
+    return rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+
+
+def _snapshot(rng, first, last, badge):
+    return {
+        "url": f"https://www.50-a.org/officer/{badge}",
+        "title": f"Officer {first} {rng.choice(INITIALS)}. {last}",
+        "identity_text": (
+            f"{first} {last}\nPolice Officer at {rng.randint(1, 123)}th Precinct since April 20{rng.randint(10, 24)} "
+            "Also served at Housing Bureau, Patrol Services Bureau, Transit Bureau\n"
+            f"Service started March 20{rng.randint(0, 20):02d}\nBadge #{badge}, Black Female\nTax #{rng.randint(900000, 999999)}\n"
+            f"{first.lower()}.{names.norm(last)}@nypd.org\nmade ${rng.randint(60, 190)},456.78 last year"
+        ),
+        "image_href": f"/img/officer/{badge}.jpg",
+        "badge_texts": [f"#{badge}", None, None, None],
+        "anchor_hrefs": [f"/command/precinct-{rng.randint(1, 123)}", None, None, None, None],
+        "compensation": f"${rng.randint(60, 190)},456.78 last year",
+        "has_discipline": rng.random() < 0.5,
+        "has_news": True,
+        "news": [
+            {"href": f"https://news.example.com/{badge}-{i}", "title": f"Story {i}", "tail": f", Example News, 2023-05-0{i + 1}"}
+            for i in range(rng.randint(0, 5))
+        ],
+        "substantiated": ["Abuse of Authority", "Discourtesy"][:rng.randint(0, 2)],
+        "summary": [["Complaints", str(rng.randint(0, 40))], ["Allegations", str(rng.randint(0, 90))]],
+        "has_lawsuits": True,
+        "lawsuits_text": f"Named in {rng.randint(0, 9)} known lawsuits, ${rng.randint(0, 900)},000 total settlements",
+    }
+
+
+def _payroll_row(rng, first, last):
+    year = rng.choice(["2024", "2025"])
+    start = f"{rng.randint(1, 12):02d}/01/{rng.randint(1995, 2023)}"
+    return [year, "POLICE DEPARTMENT", "", last.upper(), first.upper(), rng.choice(INITIALS), start,
+            "MANHATTAN", "POLICE OFFICER", "ACTIVE", "85292.00", "per Annum", "2085.72", "85000.00",
+            "0.00", "0.00", "4000.00"]
+
+
+def make_officers(count, seed):
+    """Generated officers, each with a profile snapshot, 50-a search rows and payroll rows."""
+    rng = random.Random(seed)
+    officers = []
+    for _ in range(count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES) + rng.choice(SUFFIXES)
+        badge = str(rng.randint(1000, 99999))
+        search_rows = [f"{last}, {first} {rng.choice(INITIALS)}."]
+        for _ in range(rng.randint(3, 20)):
+            row_first, row_last = _variant(rng, first, last)
+            search_rows.append(f"{row_last}, {row_first} {rng.choice(INITIALS)}.")
+        rng.shuffle(search_rows)
+        payroll_rows = [_payroll_row(rng, *_variant(rng, first, last)) for _ in range(rng.randint(10, 60))]
+        officers.append({
+            "first": first,
+            "last": last,
+            "snapshot": _snapshot(rng, first, last, badge),
+            "search_rows": search_rows,
+            "payroll_rows": payroll_rows,
+        })
+    return officers
+
+
+def officer_work(officer):
+    """Everything parsed or compared for one officer."""
+    parse_profile_snapshot(officer["snapshot"], "https://www.50-a.org")
+    first, last = officer["first"], officer["last"]
+    candidates = []
+    for row in officer["search_rows"]:
+        row_first, row_last = names.split_candidate_name(row)
+        candidates.append((row, Identity(row_first, row_last, names.extract_initial(row))))
+    identity.best_match(Identity(first, last), candidates, identity.MATCH_THRESHOLD)
+    query = Identity(first, last)
+    source = Identity(last=last)
+    rows = ((cells, payroll_api.row_identity(cells)) for cells in officer["payroll_rows"])
+    for cells, _ in identity.rank(query, rows, identity.MATCH_THRESHOLD):
+        identity.last_names_match(source, Identity(last=cells[3]))
+
+
+CACHED = ("norm", "strip_suffix", "split_candidate_name")
+
+
+def clear_caches():
+    for name in CACHED:
+        fn = getattr(names, name)
+        if hasattr(fn, "cache_clear"):  # Not while uncached() has swapped it out
+            fn.cache_clear()
+
+
+@contextmanager
+def uncached():
+    """Swap the memoized helpers for their undecorated versions (identity.py imported them by name)."""
+    saved = {name: getattr(names, name) for name in CACHED}
+    for module in (names, identity):
+        for name, fn in saved.items():
+            if hasattr(module, name):
+                setattr(module, name, fn.__wrapped__)
+    try:
+        yield
+    finally:
+        for module in (names, identity):
+            for name, fn in saved.items():
+                if hasattr(module, name):
+                    setattr(module, name, fn)
+
+
+def time_run(officers, repeat):
+    """Best per-officer time over repeat runs, caches cleared before each run."""
+    def run():
+        for officer in officers:
+            officer_work(officer)
+    return min(timeit.repeat(run, setup=clear_caches, number=1, repeat=repeat)) / len(officers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--officers", type=int, default=500, help="Distinct officers per timing run (default: 500)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs; the best is reported (default: 5)")
+    parser.add_argument("--seed", type=int, default=50, help="Name generator seed (default: 50)")
+    args = parser.parse_args()
+
+    # parse_profile_snapshot logs at INFO; the benchmark measures parsing, not logging
+    logging.disable(logging.INFO)
+
+    officers = make_officers(args.officers, args.seed)
+    candidates = sum(len(o["search_rows"]) + len(o["payroll_rows"]) for o in officers)
+    print(f"{len(officers)} officers, {candidates} candidate rows ({candidates / len(officers):.0f} per officer)")
+
+    with uncached():
+        plain = time_run(officers, args.repeat)
+    cached = time_run(officers, args.repeat)
+
+    print(f"{'case':<12} {'us/officer':>11}")
+    print(f"{'uncached':<12} {plain * 1e6:>11.1f}")
+    print(f"{'lru-cached':<12} {cached * 1e6:>11.1f}")
+    print(f"speedup: {plain / cached:.2f}x")
+    # Counters from the last cached run (caches cleared before it)
+    for name, info in names.cache_info().items():
+        print(f"{name}: {info.hits} hits, {info.misses} misses")
+
+
+if __name__ == "__main__":
+    main()
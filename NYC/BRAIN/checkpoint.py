@@ -0,0 +1,97 @@
+"""
+Append-only checkpoint journal for enrichment runs (--resume).
+
+Every time a record finishes an enrichment phase (50-a, payroll) one JSON
+line is appended with the officer's identity key, the fields that phase set
+on the record and the phase's return value (the 50-a articles). After a
+crash, --resume loads the journal and the enrichment passes copy journaled
+fields onto the rebuilt records instead of scraping those officers again.
+
+Entries are keyed by officer identity rather than list position, so a
+rebuilt list in a different order (or an officer appearing in several
+trials) still resumes correctly.
+"""
+import json
+import logging
+import threading
+from pathlib import Path
+
+
+class CheckpointJournal:
+    """
+    Journal of completed (phase, officer) pairs.
+
+    Args:
+        path: Journal file (.jsonl)
+        resume: Load existing entries instead of starting a fresh journal
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._done = {}
+        self.skipped = 0
+        if resume:
+            self._load()
+        elif self.path.exists():
+            self.path.unlink()
+        self._file = self.path.open("a", encoding="utf-8")
+        if resume and self._file.tell() and not self.path.read_bytes().endswith(b"\n"):
+            self._file.write("\n")  # terminate a line cut short by the crash
+
+    def _load(self):
+        if not self.path.exists():
+            logging.info(f"Checkpoint: no journal at {self.path}, starting fresh")
+            return
+        lines = 0
+        with self.path.open("r", encoding="utf-8") as f:
+            for number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # The last line may be cut short by the crash we are resuming from
+                    logging.warning(f"Checkpoint: ignoring unreadable journal line {number}")
+                    continue
+                self._done[(entry["phase"], entry["key"])] = entry
+                lines += 1
+        logging.info(f"Checkpoint: loaded {lines} journal entries from {self.path}")
+
+    def completed(self, phase, key):
+        """
+        Look up a completed phase for an officer.
+
+        Returns:
+            Journal entry dict (fields, result), or None if the phase has not run
+        """
+        with self._lock:
+            entry = self._done.get((phase, key))
+            if entry is not None:
+                self.skipped += 1
+            return entry
+
+    def record(self, phase, key, fields, result=None):
+        """
+        Append one completed phase for an officer and flush it to disk.
+
+        Args:
+            phase: Phase label ('50-a', 'payroll')
+            key: Officer identity key
+            fields: Record fields set or changed by the phase
+            result: Phase return value to replay on resume
+        """
+        entry = {"phase": phase, "key": key, "fields": fields, "result": result}
+        line = json.dumps(entry, default=str) + "\n"
+        with self._lock:
+            self._done[(phase, key)] = json.loads(line)
+            self._file.write(line)
+            self._file.flush()
+
+    def finish(self):
+        """Close and delete the journal once the run's outputs are written."""
+        with self._lock:
+            self._file.close()
+            self.path.unlink(missing_ok=True)
+        logging.info(f"Checkpoint: run complete, removed {self.path}")
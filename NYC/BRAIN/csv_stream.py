@@ -0,0 +1,104 @@
+"""
+Streaming CSV output.
+
+StreamingCSVWriter writes each officer's row as soon as the record is fully
+enriched, to <name>.partial next to the final file, flushing after every row
+so HERMES (or `tail -f`) can follow a long run. Rows are emitted in record
+order: a record that finishes early waits in memory until every record
+before it has been written. commit() writes anything still outstanding and
+atomically renames the partial file over the final CSV.
+"""
+import csv
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+
+
+def partial_path(path):
+    """Path of the in-progress file for a CSV: <name>.partial in the same directory."""
+    path = Path(path)
+    return path.with_name(path.name + ".partial")
+
+
+class StreamingCSVWriter:
+    """
+    Ordered, flushed row writer with an atomic final rename.
+
+    Args:
+        path: Final CSV path
+        fieldnames: CSV header
+        row_fn: Function mapping a record dict to a row dict
+    """
+
+    def __init__(self, path, fieldnames, row_fn):
+        self.path = Path(path)
+        self.tmp_path = partial_path(self.path)
+        self.row_fn = row_fn
+        self.written = 0
+        self._lock = threading.Lock()
+        self._pending = {}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.tmp_path.open("w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames)
+        self._writer.writeheader()
+        self._file.flush()
+        logging.info(f"CSV stream: writing rows to {self.tmp_path} as officers finish")
+
+    def _drain(self):
+        # Caller holds the lock; write the longest ready prefix
+        while self.written in self._pending:
+            self._writer.writerow(self.row_fn(self._pending.pop(self.written)))
+            self.written += 1
+
+    def submit(self, idx, record):
+        """Mark record #idx as fully enriched; writes it (and any queued successors) once its turn comes."""
+        with self._lock:
+            if idx < self.written:
+                return
+            self._pending[idx] = record
+            self._drain()
+            self._file.flush()
+
+    def commit(self, records):
+        """
+        Write every row not streamed yet and move the partial file into place.
+
+        Args:
+            records: The full record list (rows that never reached submit()
+                     are written from it, exactly as a batch write would)
+
+        Returns:
+            Number of data rows in the final file
+        """
+        with self._lock:
+            for idx in range(self.written, len(records)):
+                self._pending.setdefault(idx, records[idx])
+            self._drain()
+            self._file.close()
+            os.replace(self.tmp_path, self.path)
+        logging.info(f"CSV stream: committed {self.written} rows to {self.path}")
+        return self.written
+
+
+def link_or_copy(src, dst):
+    """
+    Make dst a hardlink to src (or a copy when linking is impossible), replacing dst atomically.
+
+    Returns:
+        'hardlink' or 'copy'
+    """
+    src, dst = Path(src), Path(dst)
+    tmp = partial_path(dst)
+    if tmp.exists():
+        tmp.unlink()
+    try:
+        os.link(src, tmp)
+        method = "hardlink"
+    except OSError:
+        # Different filesystem, or links not supported
+        shutil.copyfile(src, tmp)
+        method = "copy"
+    os.replace(tmp, dst)
+    return method
@@ -0,0 +1,120 @@
+"""
+Postgres access for THOTH: a small connection pool and streamed lookups.
+
+Enrich mode used to send every delta source_id as one `= ANY(%s)` array and
+fetchall() the result (twice, for the optional profile_url column). For the
+50k-row delta files HERMES can produce, stream_officers() instead COPYs the
+ids into a temporary table and reads the joined rows back through a
+server-side (named) cursor, itersize rows per round trip, in delta-file order.
+"""
+import csv
+import io
+import logging
+import os
+from contextlib import contextmanager
+
+from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
+
+OFFICERS_TABLE = ("cwd_raw", "officers_raw")
+DEFAULT_ITERSIZE = 2000
+
+
+def connect_kwargs_from_env():
+    """psycopg2.connect() settings from PGHOST/PGPORT/DB_NAME/DB_USER/DB_PASS."""
+    return {
+        "host": os.getenv('PGHOST', 'localhost'),
+        "port": os.getenv('PGPORT', '5433'),
+        "database": os.getenv('DB_NAME', 'copwatch'),
+        "user": os.getenv('DB_USER', 'postgres'),
+        "password": os.getenv('DB_PASS', ''),
+    }
+
+
+class Database:
+    """
+    Thread-safe connection pool.
+
+    Args:
+        minconn: Connections opened up front
+        maxconn: Upper bound on open connections
+        **connect_kwargs: psycopg2.connect() settings (default: from the environment)
+    """
+
+    def __init__(self, minconn=1, maxconn=4, **connect_kwargs):
+        self._pool = ThreadedConnectionPool(minconn, maxconn, **(connect_kwargs or connect_kwargs_from_env()))
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; commits on success, rolls back on error, then returns it to the pool."""
+        conn = self._pool.getconn()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            # Includes GeneratorExit from an abandoned stream_officers() iterator
+            conn.rollback()
+            raise
+        finally:
+            self._pool.putconn(conn)
+
+    def close(self):
+        self._pool.closeall()
+
+    def _has_column(self, conn, table, column):
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM information_schema.columns WHERE table_schema = %s AND table_name = %s AND column_name = %s",
+                (table[0], table[1], column)
+            )
+            return cursor.fetchone() is not None
+
+    def stream_officers(self, source_ids, itersize=DEFAULT_ITERSIZE):
+        """
+        Look up officer names for source_ids, streamed in chunks.
+
+        Args:
+            source_ids: Iterable of source_ids, in the order results should come back
+            itersize: Rows fetched per round trip from the server-side cursor
+
+        Yields:
+            Dicts with source_id, found (False when the id is not in officers_raw),
+            first_name, last_name, badge, profile_url and service_start (None
+            when the optional column does not exist)
+
+        The pooled connection is held until the iterator is exhausted or
+        closed; wrap it in contextlib.closing() when it may be abandoned.
+        """
+        with self.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("CREATE TEMP TABLE _thoth_source_ids (ord integer, source_id text) ON COMMIT DROP")
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(enumerate(source_ids))
+                buffer.seek(0)
+                cursor.copy_expert("COPY _thoth_source_ids (ord, source_id) FROM STDIN WITH (FORMAT csv)", buffer)
+                cursor.execute("ANALYZE _thoth_source_ids")
+
+            # Stored 50-a profile URLs let enrichment skip the search, and a stored
+            # service start lets payroll matching skip 50-a (optional columns)
+            optional = []
+            for column in ("profile_url", "service_start"):
+                if self._has_column(conn, OFFICERS_TABLE, column):
+                    optional.append(f"o.{column} AS {column}")
+                else:
+                    logging.info(f"DB: {column} not available in cwd_raw.officers_raw")
+                    optional.append(f"NULL AS {column}")
+
+            # DISTINCT ON keeps one row per requested id even if officers_raw repeats it
+            query = f"""
+                SELECT DISTINCT ON (t.ord)
+                       t.source_id, o.source_id IS NOT NULL AS found,
+                       o.first_name, o.last_name, o.badge, {", ".join(optional)}
+                FROM _thoth_source_ids t
+                LEFT JOIN {OFFICERS_TABLE[0]}.{OFFICERS_TABLE[1]} o ON o.source_id = t.source_id
+                ORDER BY t.ord
+            """
+            with conn.cursor(name="thoth_officers", cursor_factory=RealDictCursor) as cursor:
+                cursor.itersize = itersize
+                cursor.execute(query)
+                for row in cursor:
+                    yield row
@@ -0,0 +1,183 @@
+"""
+Persistent key/value cache for enrichment results.
+
+Entries are JSON values stored in SQLite with a TTL and an LRU size cap.
+Each entry has one primary key (e.g. a 50-a officer id) and any number of
+alias keys (e.g. a normalized name) that resolve to it. An entry can also
+carry a tag (e.g. the payroll fiscal year); looking it up with a different
+expected tag treats it as stale.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace   TEXT NOT NULL,
+    key         TEXT NOT NULL,
+    value       TEXT NOT NULL,
+    stored_at   REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    tag         TEXT,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS idx_entries_lru ON entries (namespace, accessed_at);
+CREATE TABLE IF NOT EXISTS aliases (
+    namespace TEXT NOT NULL,
+    alias     TEXT NOT NULL,
+    key       TEXT NOT NULL,
+    PRIMARY KEY (namespace, alias)
+);
+"""
+
+
+class CacheEntry:
+    """A cached value with its age; fresh is False once the TTL has passed or its tag is outdated."""
+
+    def __init__(self, key, value, stored_at, fresh):
+        self.key = key
+        self.value = value
+        self.stored_at = stored_at
+        self.fresh = fresh
+
+    @property
+    def age_days(self):
+        return (time.time() - self.stored_at) / 86400.0
+
+
+class DiskCache:
+    """
+    SQLite-backed cache shared by threads and THOTH processes.
+
+    Args:
+        path: Path to the SQLite file
+        namespace: Logical cache name (several caches can share one file)
+        ttl_seconds: Entries older than this are stale (None = never stale)
+        max_entries: LRU cap for this namespace (None = unbounded)
+    """
+
+    def __init__(self, path, namespace, ttl_seconds=None, max_entries=None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def _resolve(self, key, alias):
+        if key is not None:
+            return key
+        row = self._conn.execute(
+            "SELECT key FROM aliases WHERE namespace = ? AND alias = ?",
+            (self.namespace, alias),
+        ).fetchone()
+        return row[0] if row else None
+
+    def lookup(self, key=None, alias=None, tag=None):
+        """
+        Fetch an entry by primary key or alias, fresh or stale.
+
+        An entry is stale once its TTL has passed or, when tag is given, if it
+        was stored with a different tag. Nothing is counted here: the caller
+        may still reject the entry (e.g. a name alias that belongs to another
+        officer), so it reports the outcome it acted on with tally().
+
+        Returns:
+            CacheEntry, or None if nothing is cached
+        """
+        now = time.time()
+        with self._lock:
+            resolved = self._resolve(key, alias)
+            row = None
+            if resolved is not None:
+                row = self._conn.execute(
+                    "SELECT value, stored_at, tag FROM entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, resolved),
+                ).fetchone()
+            if row is None:
+                return None
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                    (now, self.namespace, resolved),
+                )
+            stored_at, stored_tag = row[1], row[2]
+            fresh = self.ttl_seconds is None or (now - stored_at) <= self.ttl_seconds
+            if tag is not None and stored_tag != tag:
+                fresh = False
+        return CacheEntry(resolved, json.loads(row[0]), stored_at, fresh)
+
+    def tally(self, entry):
+        """
+        Count one lookup by the entry the caller used: a hit if fresh, a
+        stale if expired, a miss for None (nothing cached, or rejected).
+        """
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            elif entry.fresh:
+                self.hits += 1
+            else:
+                self.stale += 1
+
+    def get(self, key=None, alias=None, tag=None):
+        """Return the cached value if present and fresh, else None (counted)."""
+        entry = self.lookup(key=key, alias=alias, tag=tag)
+        self.tally(entry)
+        return entry.value if entry and entry.fresh else None
+
+    def put(self, key, value, aliases=(), tag=None):
+        """
+        Store a value under key and point every alias at it, then enforce the LRU cap.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, stored_at, accessed_at, tag) VALUES (?, ?, ?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), now, now, tag),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO aliases (namespace, alias, key) VALUES (?, ?, ?)",
+                [(self.namespace, alias, key) for alias in aliases if alias],
+            )
+            if self.max_entries:
+                self._evict()
+
+    def _evict(self):
+        count = self._conn.execute(
+            "SELECT COUNT(*) FROM entries WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+        excess = count - self.max_entries
+        if excess <= 0:
+            return
+        self._conn.execute(
+            "DELETE FROM entries WHERE namespace = ? AND key IN ("
+            "SELECT key FROM entries WHERE namespace = ? ORDER BY accessed_at ASC LIMIT ?)",
+            (self.namespace, self.namespace, excess),
+        )
+        self._conn.execute(
+            "DELETE FROM aliases WHERE namespace = ? AND key NOT IN ("
+            "SELECT key FROM entries WHERE namespace = ?)",
+            (self.namespace, self.namespace),
+        )
+        logging.info(f"Cache[{self.namespace}]: evicted {excess} least-recently-used entries")
+
+    def stats(self):
+        """Return a one-line hit/miss summary for the log."""
+        total = self.hits + self.misses + self.stale
+        rate = (self.hits / total * 100) if total else 0.0
+        return f"{self.hits} hits, {self.stale} stale, {self.misses} misses ({rate:.0f}% hit rate)"
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
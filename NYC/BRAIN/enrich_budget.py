@@ -0,0 +1,139 @@
+"""
+Priority order and run budgets for --enrich-mode.
+
+HERMES tags every delta row high, medium or low priority. Enrich-mode officers
+are looked up and enriched in priority order (stable, so delta-file order
+holds within a level), and --budget caps a run by wall time ('30m', '2h', '90s')
+or by source lookups ('500r'). Once the budget is spent, lookups that have
+not started are deferred instead of run; lookups already in flight finish.
+The enrichment CSV then holds only the columns whose source actually ran,
+and the deferred columns are written back out as a new delta file in the
+input format, so the next run picks them up.
+"""
+import csv
+import logging
+import re
+import threading
+import time
+from pathlib import Path
+
+PRIORITY_RANK = {"high": 0, "medium": 1, "low": 2}
+
+# Same columns as the --enrich-mode input
+DELTA_FIELDNAMES = ["source_id", "column_name", "current_value", "priority"]
+
+_BUDGET_RE = re.compile(r"\s*(\d+(?:\.\d+)?)\s*([a-z]*)\s*", re.IGNORECASE)
+_SECONDS_PER_UNIT = {"": 60, "s": 1, "sec": 1, "m": 60, "min": 60, "h": 3600, "hr": 3600}
+_REQUEST_UNITS = {"r", "req", "requests"}
+
+
+def priority_rank(priority):
+    """Sort rank of a delta priority (unknown values sort with low)."""
+    return PRIORITY_RANK.get((priority or "").strip().lower(), PRIORITY_RANK["low"])
+
+def parse_budget(spec):
+    """
+    Parse a --budget spec: a duration ('90s', '30m', '2h'; a bare number is
+    minutes) or a number of source lookups ('500r').
+
+    Returns:
+        Tuple of (seconds, requests); the one not given is None
+
+    Raises:
+        ValueError: If the spec is malformed or not positive
+    """
+    m = _BUDGET_RE.fullmatch(spec or "")
+    unit = m.group(2).lower() if m else None
+    if not m or (unit not in _SECONDS_PER_UNIT and unit not in _REQUEST_UNITS):
+        raise ValueError(f"budget must look like 30m, 2h, 90s or 500r, got '{spec}'")
+    amount = float(m.group(1))
+    if amount <= 0:
+        raise ValueError(f"budget must be positive, got '{spec}'")
+    if unit in _REQUEST_UNITS:
+        return None, int(amount)
+    return amount * _SECONDS_PER_UNIT[unit], None
+
+
+class RunBudget:
+    """
+    Time or lookup budget shared by every enrichment worker.
+
+    The clock starts at start() (when enrichment begins), or at the first
+    take() if start() was not called. Only live source lookups are charged;
+    cache, registry and in-memory hits never call take(). Exhaustion is
+    permanent: once take() has refused a lookup, every later lookup is
+    refused too.
+
+    Args:
+        seconds: Wall-time budget, or None
+        requests: Maximum source lookups, or None
+    """
+
+    def __init__(self, seconds=None, requests=None):
+        self.seconds = seconds
+        self.requests = requests
+        self.started = None
+        self.used = 0
+        self.deferred = 0
+        self.exhausted = None  # Reason, once the budget is spent
+        self._lock = threading.Lock()
+
+    def describe(self):
+        if self.requests is not None:
+            return f"{self.requests} lookups"
+        return f"{self.seconds / 60:g} min"
+
+    def start(self):
+        """Start the wall-time clock (no-op if already started)."""
+        with self._lock:
+            if self.started is None:
+                self.started = time.monotonic()
+
+    def take(self):
+        """Claim one source lookup; False once the budget is spent (the caller defers the lookup)."""
+        with self._lock:
+            if self.started is None:
+                self.started = time.monotonic()
+            if self.exhausted is None:
+                elapsed = time.monotonic() - self.started
+                if self.seconds is not None and elapsed >= self.seconds:
+                    self.exhausted = f"time budget of {self.describe()} spent after {self.used} lookups"
+                elif self.requests is not None and self.used >= self.requests:
+                    self.exhausted = f"lookup budget of {self.describe()} spent after {elapsed / 60:.1f} min"
+                if self.exhausted is not None:
+                    logging.warning(f"Budget: {self.exhausted}; deferring the remaining lookups")
+            if self.exhausted is not None:
+                self.deferred += 1
+                return False
+            self.used += 1
+            return True
+
+    def stats(self):
+        elapsed = (time.monotonic() - self.started) / 60 if self.started is not None else 0.0
+        state = self.exhausted or "not exhausted"
+        return f"{self.used} lookups in {elapsed:.1f} min of {self.describe()}; {self.deferred} deferred ({state})"
+
+
+def write_delta(path, rows):
+    """
+    Write leftover enrich work as a delta CSV that --enrich-mode accepts.
+
+    Args:
+        path: Output path (replaced atomically)
+        rows: Iterable of (source_id, column_name, current_value, priority)
+
+    Returns:
+        Number of rows written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    count = 0
+    with tmp_path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(DELTA_FIELDNAMES)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    tmp_path.replace(path)
+    return count
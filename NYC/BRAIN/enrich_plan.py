@@ -0,0 +1,115 @@
+"""
+Field-level plan for --enrich-mode runs.
+
+Every database column HERMES can ask for comes from exactly one source: the
+50-a profile (search, then the profile page's identity block) or NYC payroll.
+EnrichPlan maps each officer's requested columns to the sources and page
+visits needed, so the 50-a pass only visits officers that need a 50-a column
+and the payroll pass only visits officers that need a payroll column.
+
+Payroll rows carry no badge or tax id; officers who share a name are told
+apart by the 50-a service start. An officer who needs payroll and has no
+stored service start therefore also visits 50-a, even when no 50-a column
+was requested.
+--plan-only logs the plan and exits before a browser is started.
+"""
+import logging
+from collections import Counter
+
+# Database column -> (source, what has to be loaded/extracted for it)
+COLUMN_SOURCES = {
+    "profile_url":        ("50-a", "search result"),
+    "race":               ("50-a", "identity text"),
+    "gender":             ("50-a", "identity text"),
+    "tax_id":             ("50-a", "identity text"),
+    "email":              ("50-a", "identity text"),
+    "badge":              ("50-a", "badge element"),
+    "precinct_number":    ("50-a", "command link"),
+    "current_assignment": ("50-a", "identity text"),
+    "assignment_start":   ("50-a", "identity text"),
+    "service_start":      ("50-a", "identity text"),
+    "last_earned":        ("50-a", "compensation"),
+    "base_salary":        ("payroll", "payroll row"),
+    "pay_basis":          ("payroll", "payroll row"),
+}
+
+# Same labels as the enrichment passes (_run_enrich_task)
+SOURCES = ("50-a", "payroll")
+
+
+class EnrichPlan:
+    """
+    Sources each enrich-mode officer needs, keyed by source_id.
+
+    Args:
+        records: Enrich-mode records (source_id, enrich_columns, profile_url, service_start)
+    """
+
+    def __init__(self, records=()):
+        self._sources = {}
+        self.columns = Counter()
+        self.unknown = Counter()
+        self.groups = Counter()
+        self.visits = Counter()
+        self.known_profiles = 0
+        self.payroll_dependencies = 0
+        self.add(records)
+
+    def add(self, records):
+        """Plan more records (an enrich run streams its officers in chunks)."""
+        for record in records:
+            sources = set()
+            for column in record.get("enrich_columns", []):
+                if column not in COLUMN_SOURCES:
+                    self.unknown[column] += 1
+                    continue
+                source, _ = COLUMN_SOURCES[column]
+                if column == "profile_url" and record.get("profile_url"):
+                    # Already stored; no visit needed for this column alone
+                    continue
+                sources.add(source)
+                self.columns[column] += 1
+            if "payroll" in sources and "50-a" not in sources and not record.get("service_start"):
+                sources.add("50-a")
+                self.payroll_dependencies += 1
+            sources = frozenset(sources)
+            self._sources[record.get("source_id")] = sources
+            self.groups[" + ".join(s for s in SOURCES if s in sources) or "nothing to fetch"] += 1
+            if "50-a" in sources:
+                if record.get("profile_url"):
+                    self.known_profiles += 1
+                    self.visits["50-a profile"] += 1
+                else:
+                    self.visits["50-a search"] += 1
+                    self.visits["50-a profile"] += 1
+            if "payroll" in sources:
+                self.visits["payroll lookup"] += 1
+
+    def needs(self, record, source):
+        """True if record has a requested column from source (records outside the plan need everything)."""
+        sources = self._sources.get(record.get("source_id"))
+        return sources is None or source in sources
+
+    def count(self, source):
+        return sum(1 for sources in self._sources.values() if source in sources)
+
+    def log_summary(self, payroll_source="explorer UI"):
+        """Log the plan: officers per source group, columns, and page visits per source."""
+        logging.info(f"ENRICH PLAN: {len(self._sources)} officers")
+        for group, count in self.groups.most_common():
+            logging.info(f"ENRICH PLAN:   {count:>6} officers need {group}")
+        for column, count in sorted(self.columns.items(), key=lambda item: (COLUMN_SOURCES[item[0]][0], item[0])):
+            source, extraction = COLUMN_SOURCES[column]
+            logging.info(f"ENRICH PLAN:   {column:<20} {count:>6}  {source} ({extraction})")
+        for column, count in self.unknown.most_common():
+            logging.warning(f"ENRICH PLAN:   {column:<20} {count:>6}  no source - will be skipped")
+        if self.payroll_dependencies:
+            logging.info(
+                f"ENRICH PLAN: {self.payroll_dependencies} payroll-only officers have no stored service start "
+                f"and also visit 50-a to tell same-name payroll rows apart"
+            )
+        logging.info(
+            f"ENRICH PLAN: page visits - 50-a search {self.visits['50-a search']}, "
+            f"50-a profile {self.visits['50-a profile']} ({self.known_profiles} via stored profile URL), "
+            f"payroll {self.visits['payroll lookup']} ({payroll_source})"
+        )
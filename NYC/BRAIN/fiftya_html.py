@@ -0,0 +1,351 @@
+"""
+Offline 50-a.org profile parsing from raw HTML (no browser required).
+
+snapshot_from_html() builds the same snapshot dict that PROFILE_SNAPSHOT_JS
+returns in the browser. The page is parsed with lxml and the selectors
+fiftya_parser uses are compiled to XPath. innerText follows the HTML rules the
+identity regexes depend on (block boundaries become one newline, <p> two,
+<br> a forced newline, table cells a tab, whitespace collapsed, hidden
+elements skipped). The snapshot then goes through the shared
+parse_profile_snapshot(); tests/test_fiftya_html.py checks saved profiles
+against the browser's PROFILE_SNAPSHOT_JS output.
+
+Bulk mode for saved pages:
+
+    python3 fiftya_html.py saved_profiles/*.html > profiles.jsonl
+"""
+import json
+import logging
+import re
+import sys
+import time
+from urllib.request import Request, urlopen
+
+from lxml import etree
+
+from fiftya_parser import ANCHOR_SELECTORS, BADGE_SELECTORS, IMAGE_SELECTOR, parse_profile_snapshot
+
+# Elements rendered as blocks by the browser's default stylesheet (innerText line breaks)
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "body", "caption", "center", "dd", "details", "dialog",
+    "div", "dl", "dt", "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4",
+    "h5", "h6", "header", "hgroup", "hr", "html", "legend", "li", "main", "menu", "nav", "ol", "p",
+    "pre", "search", "section", "summary", "table", "ul",
+}
+HIDDEN_TAGS = {"script", "style", "template", "noscript", "head", "title"}
+CELL_TAGS = {"td", "th"}
+
+_COLLAPSIBLE_RE = re.compile(r"[ \t\n\r]+")
+
+USER_AGENT = "Mozilla/5.0 (compatible; THOTH/1.0; +https://github.com/copwatchdog)"
+
+
+class _Forced:
+    """A string innerText emits as is (<br> newline, tab after a table cell)."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text
+
+
+_BR = _Forced("\n")
+_TAB = _Forced("\t")
+
+
+def _join_text(items):
+    """
+    The browser's innerText from collected items, for a rendered element with the default stylesheet.
+
+    Text between two boundaries (block edges, <br>, cell tabs) has its
+    whitespace collapsed and trimmed; runs of block boundaries become the
+    largest required number of newlines, and boundaries at either end are dropped.
+
+    Args:
+        items: Text strings, required line break counts (int) and _Forced strings
+
+    Returns:
+        innerText string
+    """
+    out = []
+    pending = 0  # Required line break count waiting for the next text
+    run = []
+    for item in items + [0]:
+        if isinstance(item, str):
+            run.append(item)
+            continue
+        text = _COLLAPSIBLE_RE.sub(" ", "".join(run)).strip(" ")
+        run = []
+        if text:
+            if pending and out:
+                out.append("\n" * pending)
+            out.append(text)
+            pending = 0
+        if isinstance(item, int):
+            pending = max(pending, item)
+        else:
+            # Forced <br> newline or cell tab: never collapsed, kept at the ends too
+            if pending and out:
+                out.append("\n" * pending)
+            out.append(item.text)
+            pending = 0
+    return "".join(out)
+
+
+def _collect_text(el, items):
+    if el.text:
+        items.append(el.text)
+    for child in el:
+        tag = child.tag
+        # Comments and processing instructions have no string tag; only their tail is text
+        if not isinstance(tag, str) or tag in HIDDEN_TAGS or child.get("hidden") is not None:
+            pass
+        elif tag == "br":
+            items.append(_BR)
+        elif tag in CELL_TAGS:
+            items.append(0)
+            _collect_text(child, items)
+            items.append(0)
+            if any(isinstance(s.tag, str) and s.tag in CELL_TAGS for s in child.itersiblings()):
+                items.append(_TAB)
+        elif tag == "tr":
+            _collect_text(child, items)
+            table = next(child.iterancestors("table"), None)
+            if table is not None and table.xpath("(.//tr)[last()]")[0] != child:
+                items.append(_BR)
+        elif tag in BLOCK_TAGS:
+            breaks = 2 if tag == "p" else 1
+            items.append(breaks)
+            _collect_text(child, items)
+            items.append(breaks)
+        else:
+            _collect_text(child, items)
+        if child.tail:
+            items.append(child.tail)
+
+
+class Node:
+    """
+    Element wrapper with the querySelector-style calls fiftya_parser's
+    selectors need; queries run as compiled XPath.
+
+    Args:
+        el: lxml element
+        axis: XPath axis queries search ('descendant', or 'descendant-or-self' for the document)
+    """
+
+    __slots__ = ("el", "axis")
+
+    def __init__(self, el, axis="descendant"):
+        self.el = el
+        self.axis = axis
+
+    def query_selector_all(self, selector):
+        return [Node(el) for el in _xpath(selector, self.axis)(self.el)]
+
+    def query_selector(self, selector):
+        found = _xpath(selector, self.axis, first=True)(self.el)
+        return Node(found[0]) if found else None
+
+    def get_attribute(self, name):
+        return self.el.get(name)
+
+    def text_content(self):
+        return self.el.xpath("string()")
+
+    def inner_text(self):
+        items = []
+        _collect_text(self.el, items)
+        return _join_text(items)
+
+    def news_tail(self):
+        tail = [self.el.tail or ""]
+        for node in self.el.itersiblings():
+            if node.tag in ("br", "a"):
+                break
+            tail.append(node.tail or "")
+        return "".join(tail).strip()
+
+
+def parse_html(html):
+    """
+    Parse an HTML document.
+
+    Returns:
+        Document root Node with query_selector()/query_selector_all(), or None for an empty document
+    """
+    root = etree.fromstring(html.encode("utf-8"), etree.HTMLParser(encoding="utf-8")) if html else None
+    return Node(root, axis="descendant-or-self") if root is not None else None
+
+
+# === Selectors (tag, .class, [attr], [attr=v], [attr^=v], [attr*=v], [attr$=v], descendant combinator) to XPath ===
+_COMPOUND_RE = re.compile(r"^([a-zA-Z][a-zA-Z0-9-]*|\*)?((?:\.[\w-]+)*)((?:\[[^\]]+\])*)$")
+_ATTR_RE = re.compile(r"\[\s*([\w-]+)\s*(?:([\^*$]?=)\s*['\"]?([^'\"\]]*)['\"]?)?\s*\]")
+
+
+def _parse_selector(selector):
+    compounds = []
+    for part in selector.split():
+        m = _COMPOUND_RE.match(part)
+        if not m:
+            raise ValueError(f"Unsupported selector: {selector}")
+        tag = m.group(1) if m.group(1) and m.group(1) != "*" else None
+        classes = set(c for c in m.group(2).split(".") if c)
+        attrs = _ATTR_RE.findall(m.group(3))
+        compounds.append((tag, classes, attrs))
+    return compounds
+
+
+_xpath_cache = {}
+
+
+def _xpath_compound(compound):
+    tag, classes, attrs = compound
+    step = tag or "*"
+    for cls in sorted(classes):
+        step += f"[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+    for name, op, value in attrs:
+        if not op:
+            step += f"[@{name}]"
+        elif op == "=":
+            step += f"[@{name}='{value}']"
+        elif op == "^=":
+            step += f"[starts-with(@{name}, '{value}')]"
+        elif op == "*=":
+            step += f"[contains(@{name}, '{value}')]"
+        else:
+            step += f"[substring(@{name}, string-length(@{name}) - {len(value) - 1}) = '{value}']"
+    return step
+
+
+def _xpath(selector, axis, first=False):
+    """
+    Compile a selector to XPath for lxml trees.
+
+    Like querySelector, ancestor compounds may match above the queried element,
+    so they become ancestor:: predicates rather than a descendant path. With
+    first, the single location step ends in [1] so evaluation stops at the
+    first match in document order.
+    """
+    key = (selector, axis, first)
+    compiled = _xpath_cache.get(key)
+    if compiled is None:
+        expr = ""
+        for compound in _parse_selector(selector):
+            step = _xpath_compound(compound)
+            expr = f"{step}[ancestor::{expr}]" if expr else step
+        compiled = _xpath_cache[key] = etree.XPath(f"{axis}::{expr}{'[1]' if first else ''}")
+    return compiled
+
+
+def snapshot_from_html(html, url=None):
+    """
+    Build a profile snapshot (same shape as PROFILE_SNAPSHOT_JS) from raw HTML.
+
+    Args:
+        html: Profile page HTML
+        url: URL the page was fetched from
+
+    Returns:
+        Snapshot dict, or None if the page has no div.identity
+    """
+    doc = parse_html(html)
+    identity = doc.query_selector("div.identity") if doc is not None else None
+    if identity is None:
+        return None
+
+    def text(el):
+        return el.inner_text().strip() if el is not None else None
+
+    image = identity.query_selector(IMAGE_SELECTOR)
+    anchor_hrefs = []
+    for sel in ANCHOR_SELECTORS:
+        el = identity.query_selector(sel)
+        anchor_hrefs.append(el.get_attribute("href") if el is not None else None)
+
+    discipline = identity.query_selector("div.discipline")
+    news = identity.query_selector("div.news")
+    news_items = []
+    if news is not None:
+        for a in news.query_selector_all("a[href^='http']"):
+            news_items.append({"href": a.get_attribute("href"), "title": a.inner_text().strip(), "tail": a.news_tail()})
+
+    substantiated = doc.query_selector("div.substantiated")
+    summary = doc.query_selector("div.container.summary")
+    summary_pairs = []
+    if summary is not None:
+        for div in summary.query_selector_all("div.column div"):
+            name = div.query_selector("span.name")
+            count = div.query_selector("span.count")
+            if name is not None and count is not None:
+                summary_pairs.append([name.inner_text().strip(), count.inner_text().strip()])
+    lawsuits = doc.query_selector("div.lawsuits-details")
+    title = doc.query_selector("title")
+
+    return {
+        "url": url,
+        # document.title: the <title> text with ASCII whitespace collapsed
+        "title": " ".join(_COLLAPSIBLE_RE.split(title.text_content().strip(" \t\n\r"))) if title is not None else "",
+        "identity_text": identity.inner_text().strip(),
+        "image_href": image.get_attribute("href") if image is not None else None,
+        "badge_texts": [text(identity.query_selector(sel)) for sel in BADGE_SELECTORS],
+        "anchor_hrefs": anchor_hrefs,
+        "compensation": text(identity.query_selector("span.compensation")),
+        "has_discipline": bool(discipline is not None and discipline.query_selector("article.message")),
+        "has_news": news is not None,
+        "news": news_items,
+        "substantiated": [li.inner_text().strip() for li in substantiated.query_selector_all("li")] if substantiated is not None else [],
+        "summary": summary_pairs,
+        "has_lawsuits": lawsuits is not None,
+        "lawsuits_text": lawsuits.inner_text() if lawsuits is not None else None,
+    }
+
+
+def parse_profile_html(html, url=None, base_url="https://50-a.org"):
+    """
+    Parse a 50-a profile page from raw HTML.
+
+    Args:
+        html: Profile page HTML
+        url: URL the page was fetched from (becomes profile_url)
+        base_url: 50-a.org base URL used to absolutize relative links
+
+    Returns:
+        Tuple of (fields_dict, articles_list), or (None, []) if the page has no profile
+    """
+    snapshot = snapshot_from_html(html, url)
+    if snapshot is None:
+        return None, []
+    return parse_profile_snapshot(snapshot, base_url)
+
+
+def fetch_profile_html(url, timeout=30):
+    """
+    Fetch a profile page with plain HTTP (no JavaScript execution).
+
+    Returns:
+        Page HTML as a string
+    """
+    request = Request(url, headers={"User-Agent": USER_AGENT, "Accept": "text/html"})
+    with urlopen(request, timeout=timeout) as resp:
+        charset = resp.headers.get_content_charset() or "utf-8"
+        return resp.read().decode(charset, errors="replace")
+
+
+if __name__ == "__main__":
+    # Bulk-parse saved profile pages: one JSON line per file on stdout, timing on stderr
+    paths = sys.argv[1:]
+    if not paths:
+        print("usage: python3 fiftya_html.py PROFILE.html [...]", file=sys.stderr)
+        sys.exit(2)
+    logging.basicConfig(level=logging.WARNING)
+    started = time.perf_counter()
+    parsed = 0
+    for path in paths:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            fields, articles = parse_profile_html(f.read())
+        print(json.dumps({"file": path, "fields": fields, "articles": articles}))
+        parsed += 1
+    elapsed = time.perf_counter() - started
+    rate = parsed / elapsed if elapsed else float("inf")
+    print(f"Parsed {parsed} profiles in {elapsed:.3f}s ({rate:.0f}/s)", file=sys.stderr)
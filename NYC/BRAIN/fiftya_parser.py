@@ -0,0 +1,371 @@
+"""
+50-a.org officer profile extraction.
+
+A single page.evaluate(PROFILE_SNAPSHOT_JS) serializes everything THOTH reads
+from a profile page (identity text, badge/anchor candidates, compensation,
+discipline and news blocks, summary counts, lawsuits) into one JSON snapshot.
+parse_profile_snapshot() then turns that snapshot into record fields and
+articles in pure Python, so a profile costs one browser round trip.
+"""
+import logging
+import re
+from datetime import datetime
+
+BADGE_SELECTORS = ["span.badge", ".badge", "span.badge-number", "div.badge"]
+ANCHOR_SELECTORS = ["div.command a.command", "a[href*='precinct']", "a[href*='pct']", "a[href*='precincts']", "a"]
+IMAGE_SELECTOR = "a.is-pulled-right.ml-1.is-hidden-mobile"
+
+SUMMARY_MAPPING = {
+    "Complaints": "num_complaints",
+    "Allegations": "num_allegations",
+    "Substantiated": "num_substantiated",
+    "Substantiated (Charges)": "num_substantiated_charges",
+    "Unsubstantiated": "num_unsubstantiated",
+    "Within NYPD Guidelines": "num_within_guidelines"
+}
+
+# Identity-text patterns, compiled once (parse_profile_snapshot runs per officer)
+BADGE_RE = re.compile(r'Badge\s*#?\s*([0-9]+)', re.I)
+_RACE_GENDER_RE = re.compile(r'Badge\s*#?\d+,\s*([A-Za-z\s]+?)\s+(Male|Female)', re.I)
+_EMAIL_RE = re.compile(r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})')
+_TAX_RE = re.compile(r'Tax\s*#?\s*(\d+)', re.I)
+_DIGITS_RE = re.compile(r'(\d+)')
+_PRECINCT_DESC_RE = re.compile(r'(Police Officer|Detective|Sergeant|Lieutenant|Captain)\s+at\s+(.+?)(?:Service started|$)', re.I | re.DOTALL)
+_WHITESPACE_RE = re.compile(r'\s+')
+_PRECINCT_NUMBER_RE = re.compile(r'(\d{1,3})')
+_PRECINCT_SLUG_RE = re.compile(r'/([A-Za-z0-9\-]+)$')
+_PRECINCT_TEXT_RE = re.compile(r'Precinct\s+(\d{1,3})', re.I)
+_SERVICE_START_RES = (
+    re.compile(r"Service\s+started\s+([A-Za-z]+)\s+(\d{4})", re.I),
+    re.compile(r"Started\s+([A-Za-z]+)\s+(\d{4})", re.I),
+)
+_DOLLARS_RE = re.compile(r'\$[\d,]+(?:\.\d+)?')
+_MADE_RE = re.compile(r'made\s*\$([\d,]+(?:\.\d+)?)', re.I)
+_LAWSUITS_RE = re.compile(r"Named in (\d+) known lawsuits")
+_SETTLEMENTS_RE = re.compile(r"\$(\d[\d,]*) total settlements")
+_SINCE_RE = re.compile(r'^(.+?)\s+since\s+([A-Za-z]+\s+\d{4})', re.I)
+_ALSO_SERVED_RE = re.compile(r'Also served at\s+(.+)$', re.I)
+_ALSO_SERVED_TAIL_RE = re.compile(r'\s*Also served at.+$', re.I)
+
+# Returns null when the page has no div.identity
+PROFILE_SNAPSHOT_JS = """
+({badgeSelectors, anchorSelectors, imageSelector}) => {
+    const identity = document.querySelector("div.identity");
+    if (!identity) return null;
+    const text = (el) => el ? el.innerText.trim() : null;
+    const first = (root, sel) => root ? root.querySelector(sel) : null;
+
+    const image = first(identity, imageSelector);
+    const badgeTexts = badgeSelectors.map((sel) => text(first(identity, sel)));
+    const anchorHrefs = anchorSelectors.map((sel) => {
+        const el = first(identity, sel);
+        return el ? el.getAttribute("href") : null;
+    });
+
+    const discipline = first(identity, "div.discipline");
+    const news = first(identity, "div.news");
+    const newsItems = news ? Array.from(news.querySelectorAll("a[href^='http']")).map((a) => {
+        // Source and date are text siblings after the anchor: <a>Title</a>, Source, Date<br>
+        let tail = "";
+        let node = a.nextSibling;
+        while (node && node.nodeName !== "BR" && node.nodeName !== "A") {
+            if (node.nodeType === 3) tail += node.textContent;
+            node = node.nextSibling;
+        }
+        return {href: a.getAttribute("href"), title: a.innerText.trim(), tail: tail.trim()};
+    }) : [];
+
+    const substantiated = document.querySelector("div.substantiated");
+    const summary = document.querySelector("div.container.summary");
+    const lawsuits = document.querySelector("div.lawsuits-details");
+
+    return {
+        url: location.href,
+        title: document.title,
+        identity_text: identity.innerText.trim(),
+        image_href: image ? image.getAttribute("href") : null,
+        badge_texts: badgeTexts,
+        anchor_hrefs: anchorHrefs,
+        compensation: text(first(identity, "span.compensation")),
+        has_discipline: !!(discipline && discipline.querySelector("article.message")),
+        has_news: !!news,
+        news: newsItems,
+        substantiated: substantiated ? Array.from(substantiated.querySelectorAll("li")).map((li) => li.innerText.trim()) : [],
+        summary: summary ? Array.from(summary.querySelectorAll("div.column div")).map((div) => {
+            const name = div.querySelector("span.name");
+            const count = div.querySelector("span.count");
+            return (name && count) ? [name.innerText.trim(), count.innerText.trim()] : null;
+        }).filter((pair) => pair) : [],
+        has_lawsuits: !!lawsuits,
+        lawsuits_text: lawsuits ? lawsuits.innerText : null,
+    };
+}
+"""
+
+SNAPSHOT_ARGS = {
+    "badgeSelectors": BADGE_SELECTORS,
+    "anchorSelectors": ANCHOR_SELECTORS,
+    "imageSelector": IMAGE_SELECTOR,
+}
+
+
+def _parse_precinct_desc(precinct_desc):
+    """
+    Parse precinct description into three components:
+    - Current assignment (precinct/unit name)
+    - Current assignment start date
+    - Previous assignments (comma-separated list)
+
+    Example input: "Quartermaster Section since April 2024 Also served at Housing Bureau, Patrol Services Bureau, Transit Bureau"
+
+    Args:
+        precinct_desc: Raw precinct description string (can be None)
+
+    Returns:
+        Tuple of (current_assignment, assignment_start, previous_assignments)
+    """
+    if not precinct_desc:
+        return (None, None, None)
+
+    current_assignment = None
+    assignment_start = None
+    previous_assignments = None
+
+    # Pattern: "Unit Name since Month Year Also served at Previous1, Previous2, Previous3"
+    # Look for "since" pattern to extract current assignment and start date
+    since_match = _SINCE_RE.search(precinct_desc)
+    if since_match:
+        current_assignment = since_match.group(1).strip()
+        assignment_start = since_match.group(2).strip()
+    else:
+        # No "since" found - treat entire string as current assignment
+        current_assignment = precinct_desc.strip()
+
+    # Look for "Also served at" pattern to extract previous assignments
+    also_match = _ALSO_SERVED_RE.search(precinct_desc)
+    if also_match:
+        previous_assignments = also_match.group(1).strip()
+        # If we found "Also served at", remove it from current_assignment if it's there
+        if current_assignment and "Also served at" in current_assignment:
+            current_assignment = _ALSO_SERVED_TAIL_RE.sub('', current_assignment).strip()
+
+    logging.debug(f"Parsed precinct: current='{current_assignment}', start='{assignment_start}', previous='{previous_assignments}'")
+    return (current_assignment, assignment_start, previous_assignments)
+
+def _parse_article_item(item):
+    """
+    Parse one news anchor from the snapshot.
+
+    50-a.org structure in div.news: <a href="url">Title</a>, Source, Date<br>
+    The source and date are TEXT SIBLINGS of the anchor (item['tail']).
+
+    Args:
+        item: Dict with href, title and tail keys
+
+    Returns:
+        Dict with keys: title, source, date_published, url (or None if parsing fails)
+    """
+    url = item.get("href")
+    title = (item.get("title") or "").strip()
+    if not url or not title:
+        logging.debug(f"Article parser: missing url or title (url={url}, title={title})")
+        return None
+
+    source = None
+    date_published = None
+    sibling_text = item.get("tail") or ""
+    # Parse sibling text: ", Source, Date"
+    if sibling_text:
+        sibling_text = sibling_text.lstrip(", ").strip()
+        parts = [p.strip() for p in sibling_text.split(",")]
+        if len(parts) >= 1:
+            source = parts[0]
+        if len(parts) >= 2:
+            date_published = parts[1]
+
+    logging.debug(f"Article parsed: title='{title}', source='{source}', date='{date_published}', url='{url}'")
+    return {
+        "title": title,
+        "source": source,
+        "date_published": date_published,
+        "url": url
+    }
+
+def _parse_service_start(identity_text):
+    for pattern in _SERVICE_START_RES:
+        m = pattern.search(identity_text)
+        if m:
+            month_str, year = m.groups()
+            try:
+                month = datetime.strptime(month_str[:3], "%b").month
+                logging.info(f"50-a: Started {month_str} {year}")
+                return f"{month:02}/01/{year}"
+            except Exception:
+                return None
+    return None
+
+def parse_profile_snapshot(snapshot, base_url):
+    """
+    Turn a profile snapshot into record fields and articles.
+
+    Args:
+        snapshot: Dict produced by PROFILE_SNAPSHOT_JS
+        base_url: 50-a.org base URL used to absolutize relative links
+
+    Returns:
+        Tuple of (fields_dict, articles_list). Articles are not yet linked to
+        an officer (no badge/first_name/last_name).
+    """
+    base = base_url.rstrip("/")
+    identity_text = snapshot.get("identity_text") or ""
+    fields = {}
+
+    # Profile URL (page URL on 50-a.org)
+    current_url = snapshot.get("url")
+    profile_url = current_url if current_url and "/officer/" in current_url else None
+    if profile_url:
+        logging.info(f"50-a: Profile URL captured: {profile_url}")
+    fields["profile_url"] = profile_url
+
+    # Officer image URL if available
+    officer_image = None
+    href = snapshot.get("image_href")
+    if href:
+        officer_image = href if href.startswith("http") else base + href
+        logging.info(f"50-a: Officer image found: {officer_image}")
+    fields["officer_image"] = officer_image
+
+    # Race and Gender (e.g., "Badge #4748, White Male")
+    race = None
+    gender = None
+    race_gender_match = _RACE_GENDER_RE.search(identity_text)
+    if race_gender_match:
+        race = race_gender_match.group(1).strip()
+        gender = race_gender_match.group(2).strip()
+        logging.info(f"50-a: {race} {gender}")
+    fields["race"] = race
+    fields["gender"] = gender
+
+    email = None
+    email_match = _EMAIL_RE.search(identity_text)
+    if email_match:
+        email = email_match.group(1)
+        logging.info(f"50-a: Email: {email}")
+    fields["email"] = email
+
+    # Tax ID (e.g., "Tax #965911")
+    tax_id = None
+    tax_match = _TAX_RE.search(identity_text)
+    if tax_match:
+        tax_id = tax_match.group(1)
+        logging.info(f"50-a: Tax: #{tax_id}")
+    fields["tax_id"] = tax_id
+
+    badge = None
+    for sel, txt in zip(BADGE_SELECTORS, snapshot.get("badge_texts") or []):
+        if txt is None:
+            continue
+        m = _DIGITS_RE.search(txt)
+        if m:
+            badge = m.group(1)
+            logging.info(f"50-a: badge extracted via selector '{sel}': {badge}")
+            break
+    if not badge:
+        m = BADGE_RE.search(identity_text)
+        if m:
+            badge = m.group(1)
+    if badge:
+        logging.info(f"50-a: Badge: #{badge}")
+    fields["badge"] = badge
+
+    # Precinct description, parsed into three fields
+    precinct_desc_raw = None
+    precinct_desc_match = _PRECINCT_DESC_RE.search(identity_text)
+    if precinct_desc_match:
+        precinct_desc_raw = _WHITESPACE_RE.sub(' ', precinct_desc_match.group(2).strip()).strip()
+        logging.info(f"50-a: Raw precinct desc: {precinct_desc_raw}")
+    current_assignment, assignment_start, previous_assignments = _parse_precinct_desc(precinct_desc_raw)
+    fields["current_assignment"] = current_assignment
+    fields["assignment_start"] = assignment_start
+    fields["previous_assignments"] = previous_assignments
+    logging.info(f"50-a: Current Assignment: '{current_assignment}' | Start: '{assignment_start}' | Previous: '{previous_assignments}'")
+
+    precinct_link = None
+    precinct_number = None
+    for href in snapshot.get("anchor_hrefs") or []:
+        if href:
+            if href.startswith("http"):
+                precinct_link = href
+            else:
+                precinct_link = base + "/" + href.lstrip("/")
+            m_num = _PRECINCT_NUMBER_RE.search(href)
+            if m_num:
+                precinct_number = int(m_num.group(1))
+            else:
+                m_str = _PRECINCT_SLUG_RE.search(href)
+                if m_str:
+                    precinct_number = m_str.group(1)
+            break
+    if not precinct_link:
+        m = _PRECINCT_TEXT_RE.search(identity_text)
+        if m:
+            precinct_number = int(m.group(1))
+            logging.info(f"50-a: precinct number extracted from text: {precinct_number}")
+    fields["precinct_link"] = precinct_link
+    fields["precinct_number"] = precinct_number
+
+    fields["service_start"] = _parse_service_start(identity_text)
+
+    last_earned = None
+    comp_text = snapshot.get("compensation")
+    if comp_text is not None:
+        m = _DOLLARS_RE.search(comp_text)
+        last_earned = m.group(0) if m else comp_text
+        logging.info(f"50-a: Made {last_earned} last year")
+    else:
+        m = _MADE_RE.search(identity_text)
+        if m:
+            last_earned = f"${m.group(1)}"
+            logging.info(f"50-a: Made {last_earned} last year")
+    fields["last_earned"] = last_earned
+
+    news_items = snapshot.get("news") or []
+    fields["has_discipline"] = "Y" if snapshot.get("has_discipline") else "N"
+    fields["has_articles"] = "Y" if snapshot.get("has_news") and news_items else "N"
+
+    articles = []
+    if snapshot.get("has_news"):
+        logging.info(f"50-a: Found {len(news_items)} potential news items")
+        for item in news_items:
+            article = _parse_article_item(item)
+            if article:
+                articles.append(article)
+
+    allegations = snapshot.get("substantiated") or []
+    if allegations:
+        logging.info(f"50-a: Substantiated Allegations: {', '.join(allegations)}")
+
+    logging.info(f"50-a: has_discipline={fields['has_discipline']} has_articles={fields['has_articles']}")
+
+    for label, count_text in snapshot.get("summary") or []:
+        try:
+            count = int(count_text)
+        except Exception:
+            continue
+        if label in SUMMARY_MAPPING:
+            fields[SUMMARY_MAPPING[label]] = count
+            logging.info(f"50-a: summary '{label}' -> {count}")
+
+    if snapshot.get("has_lawsuits"):
+        text = snapshot.get("lawsuits_text") or ""
+        m = _LAWSUITS_RE.search(text)
+        fields["num_lawsuits"] = int(m.group(1)) if m else 0
+        m2 = _SETTLEMENTS_RE.search(text)
+        if m2:
+            settlement_value = int(m2.group(1).replace(",", ""))
+            fields["total_settlements"] = f"${settlement_value:,}"
+        else:
+            fields["total_settlements"] = 0
+        logging.info(f"50-a: lawsuits={fields.get('num_lawsuits')} settlements={fields.get('total_settlements')}")
+
+    return fields, articles
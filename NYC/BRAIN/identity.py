@@ -0,0 +1,289 @@
+"""
+Officer identity resolution: scored matching with a blocking index.
+
+An Identity holds whatever is known about an officer on one side of a match
+(trials page, 50-a search row, payroll row): first and last name, middle
+initial, badge, tax id and service start. score() compares two identities
+field by field and returns a confidence in [0, 1]:
+
+    - last names: a hard gate. Exact (normalized, suffix stripped) = 1.0
+      and compound last names ('Perez-Smith' vs 'Smith') score high; any
+      other pair scores 0, however close the spelling ('Harris' vs
+      'Harrison', 'Martin' vs 'Martinez' are different officers)
+    - first names: a hard gate. Exact = 1.0 and a truncated first name
+      ('Chris' vs 'Christopher') scores high; any other pair of known first
+      names ('Maria' vs 'Mario') scores 0, however close the spelling
+    - initial, badge, tax id: a conflict multiplies the confidence down
+      (a different badge or tax id almost rules a candidate out)
+    - service start: closer dates score higher
+
+Only fields present on both sides count towards the confidence. rank()
+orders candidates best first; equal confidences are broken by trigram
+similarity of the full names, the only place spelling closeness counts.
+
+IdentityIndex blocks a candidate set by Soundex codes of the last name (and
+of each part of a compound last name) and by last-name trigrams, so a query
+is scored against the few candidates sharing a block instead of the whole
+set. match_all() resolves every officer of a run in one pass.
+"""
+from collections import Counter
+
+from names import norm, split_name_parts, strip_suffix
+
+# Field weights for the name/date part of the confidence
+WEIGHTS = {"last": 0.35, "first": 0.25, "initial": 0.05, "badge": 0.15, "tax_id": 0.15, "service_start": 0.05}
+
+# Confidence multipliers when both sides have the field and it differs
+CONFLICT_PENALTY = {"initial": 0.8, "badge": 0.3, "tax_id": 0.3}
+
+# Confidence needed to accept a match (exact names = 1.0; a truncated first
+# name or compound last name alone still passes; a conflicting initial does not)
+MATCH_THRESHOLD = 0.85
+
+# Minimum shared-trigram ratio for the trigram block (spellings the phonetic key misses)
+TRIGRAM_BLOCK_RATIO = 0.5
+
+COMPOUND_SIMILARITY = 0.9
+TRUNCATED_SIMILARITY = 0.85
+SERVICE_START_HORIZON_DAYS = 1095
+
+
+class Identity:
+    """
+    What is known about an officer on one side of a match.
+
+    Args:
+        first, last: Names as found (normalized internally)
+        initial: Middle initial
+        badge, tax_id: Identifiers (placeholders such as 'N/A' are ignored)
+        service_start: datetime of service/agency start
+    """
+
+    __slots__ = ("first", "last", "last_parts", "initial", "badge", "tax_id", "service_start")
+
+    def __init__(self, first="", last="", initial="", badge=None, tax_id=None, service_start=None):
+        self.first = norm(first or "")
+        base = strip_suffix(last or "")
+        self.last = norm(base)
+        self.last_parts = tuple(p for p in (norm(part) for part in split_name_parts(base)) if p)
+        self.initial = (initial or "").strip().upper()[:1]
+        self.badge = _identifier(badge)
+        self.tax_id = _identifier(tax_id)
+        self.service_start = service_start
+
+    def __repr__(self):
+        return f"Identity({self.first!r}, {self.last!r}, badge={self.badge!r})"
+
+
+def _identifier(value):
+    value = str(value or "").strip().lstrip("#")
+    return None if value.upper() in ("", "N/A", "NOT_FOUND", "UNVERIFIED") else value
+
+def soundex(name):
+    """American Soundex code of a normalized name ('' for names without letters)."""
+    letters = [c for c in name if c.isalpha()]
+    if not letters:
+        return ""
+    codes = {**dict.fromkeys("bfpv", "1"), **dict.fromkeys("cgjkqsxz", "2"), **dict.fromkeys("dt", "3"),
+             "l": "4", **dict.fromkeys("mn", "5"), "r": "6"}
+    result = letters[0].upper()
+    previous = codes.get(letters[0], "")
+    for c in letters[1:]:
+        code = codes.get(c, "")
+        if code and code != previous:
+            result += code
+            if len(result) == 4:
+                break
+        if c not in "hw":
+            previous = code
+    return result.ljust(4, "0")
+
+def trigrams(name):
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def _trigram_similarity(a, b):
+    ta, tb = trigrams(a), trigrams(b)
+    return 2 * len(ta & tb) / (len(ta) + len(tb))
+
+def last_name_similarity(a, b):
+    """
+    Similarity of two Identity last names.
+
+    Exact = 1.0; one name's parts all appearing in the other ('Perez-Smith'
+    vs 'Smith', 'De La Cruz' vs 'Delacruz') = 0.9; else 0.0. Close spellings
+    are different names: trigram similarity only orders candidates (tie_break).
+    """
+    if not a.last or not b.last:
+        return 0.0
+    if a.last == b.last:
+        return 1.0
+    shorter, longer = sorted((a, b), key=lambda i: len(i.last_parts))
+    if shorter.last_parts and set(shorter.last_parts) <= set(longer.last_parts):
+        return COMPOUND_SIMILARITY
+    if len(a.last_parts) > 1 or len(b.last_parts) > 1:
+        # Same letters, different spacing/hyphenation
+        if shorter.last in longer.last_parts or longer.last == "".join(shorter.last_parts):
+            return COMPOUND_SIMILARITY
+    return 0.0
+
+def last_names_match(a, b):
+    """True when the last names are equal or one is a compound form of the other."""
+    return last_name_similarity(a, b) > 0
+
+def first_names_compatible(a, b):
+    """False only when both first names are known and neither is a prefix of the other."""
+    if not a.first or not b.first:
+        return True
+    return a.first.startswith(b.first) or b.first.startswith(a.first)
+
+def first_name_similarity(a, b):
+    """Exact = 1.0; one a prefix of the other (trials page truncation) = 0.85; else 0.0."""
+    if not a.first or not b.first:
+        return 0.0
+    if a.first == b.first:
+        return 1.0
+    if first_names_compatible(a, b):
+        return TRUNCATED_SIMILARITY
+    return 0.0
+
+def tie_break(query, candidate):
+    """Trigram similarity of the full names; orders candidates with equal confidence."""
+    return _trigram_similarity(f"{query.first} {query.last}", f"{candidate.first} {candidate.last}")
+
+def score(query, candidate):
+    """
+    Confidence in [0, 1] that candidate is the officer described by query.
+
+    0.0 when the last names differ or the first names are incompatible.
+    """
+    last = last_name_similarity(query, candidate)
+    if not last or not first_names_compatible(query, candidate):
+        return 0.0
+    total = WEIGHTS["last"] * last
+    weight = WEIGHTS["last"]
+    penalty = 1.0
+
+    if query.first and candidate.first:
+        total += WEIGHTS["first"] * first_name_similarity(query, candidate)
+        weight += WEIGHTS["first"]
+    for field in ("initial", "badge", "tax_id"):
+        mine, theirs = getattr(query, field), getattr(candidate, field)
+        if mine and theirs:
+            weight += WEIGHTS[field]
+            if mine == theirs:
+                total += WEIGHTS[field]
+            else:
+                penalty *= CONFLICT_PENALTY[field]
+    if query.service_start and candidate.service_start:
+        days = abs((query.service_start - candidate.service_start).days)
+        total += WEIGHTS["service_start"] * max(0.0, 1 - days / SERVICE_START_HORIZON_DAYS)
+        weight += WEIGHTS["service_start"]
+    return round(total / weight * penalty, 4)
+
+def rank(query, candidates, min_confidence=0.0):
+    """
+    Score candidates for query, best first.
+
+    Equal confidences are ordered by tie_break(), then by input order.
+
+    Args:
+        query: Identity to resolve
+        candidates: Iterable of (item, Identity)
+        min_confidence: Minimum score kept
+
+    Returns:
+        List of (item, confidence) with confidence above 0 and at least min_confidence
+    """
+    scored = []
+    for pos, (item, identity) in enumerate(candidates):
+        s = score(query, identity)
+        if s > 0 and s >= min_confidence:
+            scored.append((-s, -tie_break(query, identity), pos, item))
+    scored.sort(key=lambda entry: entry[:3])
+    return [(item, -s) for s, _, _, item in scored]
+
+def best_match(query, candidates, min_confidence):
+    """
+    Highest-ranked (candidate, identity) pair for query from a short list.
+
+    Args:
+        query: Identity to resolve
+        candidates: Iterable of (item, Identity)
+        min_confidence: Minimum score accepted
+
+    Returns:
+        Tuple of (item, confidence), or (None, best confidence seen)
+    """
+    ranked = rank(query, candidates)
+    if not ranked:
+        return None, 0.0
+    best, best_score = ranked[0]
+    return (best, best_score) if best_score >= min_confidence else (None, best_score)
+
+
+class IdentityIndex:
+    """
+    Blocking index over a candidate set.
+
+    Args:
+        items: Candidate objects (e.g. payroll rows)
+        identity_fn: Function mapping an item to its Identity
+    """
+
+    def __init__(self, items, identity_fn):
+        self.items = list(items)
+        self.identities = [identity_fn(item) for item in self.items]
+        self._phonetic = {}
+        self._trigram = {}
+        for pos, identity in enumerate(self.identities):
+            for key in self._phonetic_keys(identity):
+                self._phonetic.setdefault(key, []).append(pos)
+            for gram in trigrams(identity.last):
+                self._trigram.setdefault(gram, []).append(pos)
+
+    def __len__(self):
+        return len(self.items)
+
+    @staticmethod
+    def _phonetic_keys(identity):
+        keys = {soundex(identity.last)}
+        keys.update(soundex(part) for part in identity.last_parts)
+        keys.discard("")
+        return keys
+
+    def block(self, query):
+        """Positions of candidates sharing a phonetic key with query, else most of its last-name trigrams."""
+        positions = set()
+        for key in self._phonetic_keys(query):
+            positions.update(self._phonetic.get(key, ()))
+        grams = trigrams(query.last) if query.last else set()
+        if grams and not positions:
+            # Trigram block only when no phonetic key hit (common trigrams are in large buckets)
+            shared = Counter(pos for gram in grams for pos in self._trigram.get(gram, ()))
+            needed = TRIGRAM_BLOCK_RATIO * len(grams)
+            positions.update(pos for pos, count in shared.items() if count >= needed)
+        return positions
+
+    def search(self, query, min_confidence=0.0):
+        """
+        Score the query's block.
+
+        Returns:
+            List of (item, confidence) at or above min_confidence, best first
+        """
+        block = sorted(self.block(query))
+        return rank(query, ((self.items[pos], self.identities[pos]) for pos in block), min_confidence)
+
+    def match_all(self, queries, min_confidence=0.0):
+        """
+        Resolve many officers against the index in one pass.
+
+        Args:
+            queries: Iterable of Identity
+            min_confidence: Minimum score kept
+
+        Returns:
+            List (aligned with queries) of search() results
+        """
+        return [self.search(query, min_confidence) for query in queries]
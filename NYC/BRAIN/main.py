@@ -4,15 +4,43 @@ import re
 import os
 import gc
 import atexit
-import random
 import sys
 import argparse
+import queue
+import threading
+from contextlib import closing
 from datetime import datetime
 from pathlib import Path
 from playwright.sync_api import sync_playwright, TimeoutError
 
-import psycopg2
-from psycopg2.extras import RealDictCursor
+
+from throttle import HostThrottle
+import payroll_api
+from payroll_snapshot import PayrollSnapshot
+from disk_cache import DiskCache
+import identity
+from identity import Identity, IdentityIndex
+from names import (
+    norm as _norm,
+    strip_suffix as _strip_suffix,
+    split_candidate_name as _split_candidate_name,
+    extract_initial as _extract_initial,
+    split_name_parts,
+)
+from fiftya_parser import BADGE_RE, PROFILE_SNAPSHOT_JS, SNAPSHOT_ARGS, parse_profile_snapshot
+from fiftya_html import fetch_profile_html, snapshot_from_html
+import resource_policy
+from wait_profile import WaitProfile, WaitTracker
+import shards
+from checkpoint import CheckpointJournal
+from csv_stream import StreamingCSVWriter, link_or_copy, partial_path
+import rescrape_merge
+from article_store import ArticleStore
+import pg_sink
+from db import DEFAULT_ITERSIZE, Database
+from enrich_plan import COLUMN_SOURCES, EnrichPlan
+from enrich_budget import RunBudget, parse_budget, priority_rank, write_delta
+from officer_registry import OfficerRegistry, PHASE_FIELDS, PHASE_KEY_FIELD
 
 # === Configuration ===
 SITES = {
@@ -21,9 +49,20 @@ SITES = {
     "PAYROLL": "https://data.cityofnewyork.us/City-Government/Citywide-Payroll-Data-Fiscal-Year-/k397-673e/explore/query/SELECT%0A%20%20%60fiscal_year%60%2C%0A%20%20%60payroll_number%60%2C%0A%20%20%60agency_name%60%2C%0A%20%20%60last_name%60%2C%0A%20%20%60first_name%60%2C%0A%20%20%60mid_init%60%2C%0A%20%20%60agency_start_date%60%2C%0A%20%20%60work_location_borough%60%2C%0A%20%20%60title_description%60%2C%0A%20%20%60leave_status_as_of_june_30%60%2C%0A%20%20%60base_salary%60%2C%0A%20%20%60pay_basis%60%2C%0A%20%20%60regular_hours%60%2C%0A%20%20%60regular_gross_paid%60%2C%0A%20%20%60ot_hours%60%2C%0A%20%20%60total_ot_paid%60%2C%0A%20%20%60total_other_pay%60%0AWHERE%0A%20%20caseless_one_of%28%0A%20%20%20%20%60agency_name%60%2C%0A%20%20%20%20%22Police%20Department%22%2C%0A%20%20%20%20%22POLICE%20DEPARTMENT%22%0A%20%20%29%0AORDER%20BY%20%60agency_name%60%20ASC%20NULL%20LAST%2C%20%60fiscal_year%60%20DESC%20NULL%20FIRST/page/filter"
 }
 
+# Per-site readiness: pages load with domcontentloaded, then wait for the element
+# that proves they are usable. Timeouts (ms) adapt to the observed p95 between
+# the floor and the base value (see wait_profile.py).
+WAIT_PROFILES = {
+    "trials": WaitProfile("trials", "table", base_timeout_ms=30000, min_timeout_ms=10000),
+    "fiftya_search": WaitProfile("fiftya_search", "#q", base_timeout_ms=30000, min_timeout_ms=5000),
+    "fiftya_results": WaitProfile("fiftya_results", ".officer.active", base_timeout_ms=7000, min_timeout_ms=3000),
+    "fiftya_profile": WaitProfile("fiftya_profile", "div.identity", base_timeout_ms=15000, min_timeout_ms=3000),
+    "payroll_search": WaitProfile("payroll_search", "input#search-view", base_timeout_ms=30000, min_timeout_ms=5000),
+    "payroll_results": WaitProfile("payroll_results", "table tbody tr", base_timeout_ms=7000, min_timeout_ms=3000),
+}
+
 KEYWORDS = ["Date", "Time", "Rank", "Name", "Trial Room", "Case Type"]
 THRESHOLD = 2
-SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
 
 # Set up paths - uses dynamic resolution to work in any directory location
 # Supports both direct execution and HERMES_DIR environment variable override
@@ -33,12 +72,50 @@ os.makedirs(LOGS_DIR, exist_ok=True)
 
 THOTH_LOG = os.path.join(LOGS_DIR, "thoth.log")
 
+# Local stores (payroll snapshot, caches) - override with THOTH_CACHE_DIR
+CACHE_DIR = os.getenv("THOTH_CACHE_DIR") or os.path.join(THOTH_ROOT, "NYC", "CACHE")
+PAYROLL_SNAPSHOT_FILE = os.path.join(CACHE_DIR, "payroll_snapshot.sqlite")
+ENRICHMENT_CACHE_FILE = os.path.join(CACHE_DIR, "enrichment_cache.sqlite")
+CHECKPOINT_DIR = os.path.join(CACHE_DIR, "checkpoints")
+OFFICER_REGISTRY_FILE = os.path.join(CACHE_DIR, "officer_registry.sqlite")
+
 # CSV configuration - filename will be generated after extracting trial dates
 CSV_DIR = Path("../CSV")  # Output directory for CSV files
 LOCAL_CSV_FILE = "copwatchdog.csv"  # Keep a copy in the current directory
 
-# Payroll cache to avoid re-querying same officer
+# Payroll cache to avoid re-querying same officer: in-process dict in front of a
+# disk cache shared across runs and modes (None when disabled with --no-payroll-cache)
 _payroll_cache = {}
+_payroll_disk_cache = None
+_payroll_cache_memory_hits = 0
+_payroll_cache_lock = threading.Lock()  # Worker threads update the hit counter
+
+# Payroll rows prefetched through the SODA API (--payroll-backend api), indexed by
+# normalized last name; None means the explorer UI is scraped per officer instead
+_payroll_api_index = None
+# Candidate rows per officer name from the prefetch's one-pass match_all()
+_payroll_api_matches = {}
+
+# Local payroll snapshot (see --payroll-sync); None when not synced or disabled
+_payroll_snapshot = None
+
+# Persistent 50-a profile cache keyed by officer id with a normalized-name alias;
+# None when disabled (--no-fiftya-cache)
+_fiftya_cache = None
+
+# Known 50-a profile URLs from earlier monthly CSVs, keyed by normalized-name alias
+_known_profile_urls = {}
+
+# Record fields produced by a successful 50-a profile parse (what the cache stores)
+FIFTYA_CACHE_FIELDS = [
+    "profile_url", "officer_image", "race", "gender", "email", "tax_id", "badge",
+    "current_assignment", "assignment_start", "previous_assignments",
+    "precinct_link", "precinct_number", "service_start", "last_earned",
+    "has_discipline", "has_articles",
+    "num_complaints", "num_allegations", "num_substantiated", "num_substantiated_charges",
+    "num_unsubstantiated", "num_within_guidelines", "num_lawsuits", "total_settlements",
+    "enrichment_status_50a",
+]
 
 # === Parse Command Line Arguments ===
 # Parse args BEFORE setting up logging so we can determine the log mode
@@ -53,24 +130,213 @@ parser.add_argument(
     type=str,
     help="Path to delta enrichment CSV (source_id,column_name,current_value,priority) for targeted field extraction"
 )
+parser.add_argument(
+    "--plan-only",
+    action="store_true",
+    help="With --enrich-mode: log which sources (50-a, payroll) and page visits each requested column needs, then exit"
+)
+parser.add_argument(
+    "--budget",
+    type=str,
+    help="With --enrich-mode: stop starting new lookups after a wall time (30m, 2h, 90s) or a number of "
+         "source lookups (500r); columns not reached are written to a leftover delta CSV for the next run"
+)
 parser.add_argument(
     "--version-tag",
     type=str,
     help="Override version tag for re-scrape CSV filename (e.g., '2509' for September 2025)"
 )
+parser.add_argument(
+    "--fiftya-workers",
+    type=int,
+    default=1,
+    help="Number of browser pages used concurrently for the 50-a enrichment pass (default: 1)"
+)
+parser.add_argument(
+    "--per-host-limit",
+    type=int,
+    default=2,
+    help="Maximum concurrent officer lookups against a single host (default: 2)"
+)
+parser.add_argument(
+    "--payroll-workers",
+    type=int,
+    default=1,
+    help="Number of browser pages used concurrently for the payroll enrichment pass (default: 1)"
+)
+parser.add_argument(
+    "--pipeline",
+    action="store_true",
+    help="Run 50-a and payroll enrichment concurrently, starting each officer's payroll lookup as soon as its 50-a result lands"
+)
+parser.add_argument(
+    "--payroll-backend",
+    choices=["ui", "api"],
+    default="ui",
+    help="Payroll source: 'ui' scrapes the Open Data explorer per officer, 'api' sends one batched SODA query for the whole run (default: ui)"
+)
+parser.add_argument(
+    "--payroll-sync",
+    action="store_true",
+    help="Download the NYPD payroll slice into the local snapshot and exit"
+)
+parser.add_argument(
+    "--fiftya-cache-ttl",
+    type=float,
+    default=30,
+    help="Days a cached 50-a profile stays fresh before it is re-scraped (default: 30)"
+)
+parser.add_argument(
+    "--fiftya-cache-size",
+    type=int,
+    default=5000,
+    help="Maximum number of cached 50-a profiles; least recently used are evicted (default: 5000)"
+)
+parser.add_argument(
+    "--fiftya-engine",
+    choices=["browser", "http"],
+    default="browser",
+    help="How known 50-a profile URLs are fetched: 'browser' (Playwright) or 'http' (plain HTTP + offline HTML parser, browser fallback) (default: browser)"
+)
+parser.add_argument(
+    "--no-direct-profile",
+    dest="direct_profile",
+    action="store_false",
+    help="Always find 50-a profiles through search instead of opening known profile URLs directly"
+)
+parser.add_argument(
+    "--no-fiftya-cache",
+    action="store_true",
+    help="Disable the persistent 50-a profile cache"
+)
+parser.add_argument(
+    "--no-payroll-cache",
+    action="store_true",
+    help="Do not persist payroll lookups across runs (in-process cache only)"
+)
+parser.add_argument(
+    "--no-payroll-snapshot",
+    action="store_true",
+    help="Ignore the local payroll snapshot and always look payroll up live"
+)
+parser.add_argument(
+    "--resource-policy",
+    choices=sorted(resource_policy.POLICIES),
+    default="off",
+    help="Requests the browser aborts: 'off' (none), 'light' (images, media, fonts, analytics), "
+         "'strict' (light + stylesheets + scripts on 50-a profile pages) (default: off)"
+)
+parser.add_argument(
+    "--shard",
+    type=str,
+    help="Process only shard i of N (e.g. '2/4'); writes CSV/shards/<stem>.shard-i-of-N.jsonl instead of the final CSVs"
+)
+parser.add_argument(
+    "--merge-shards",
+    type=int,
+    metavar="N",
+    help="Merge a complete set of N shard files into the monthly/enrichment CSV and articles.csv, then exit"
+)
+parser.add_argument(
+    "--resume",
+    action="store_true",
+    help="Resume an interrupted run from its checkpoint journal, skipping officers already enriched"
+)
+parser.add_argument(
+    "--registry-ttl",
+    type=float,
+    default=30,
+    help="Days an officer's fields in the cross-month registry stay fresh; full scrapes skip 50-a/payroll "
+         "lookups for repeat officers whose fields are all fresh (default: 30)"
+)
+parser.add_argument(
+    "--no-registry",
+    action="store_true",
+    help="Do not use the cross-month officer registry"
+)
+parser.add_argument(
+    "--db-sink",
+    action="store_true",
+    help="Also load officer rows, new articles and enrichment values into Postgres staging tables "
+         "(COPY + upsert on source_id); connection from PGHOST/PGPORT/DB_NAME/DB_USER/DB_PASS"
+)
+parser.add_argument(
+    "--db-sink-schema",
+    type=str,
+    default=pg_sink.DEFAULT_SCHEMA,
+    help=f"Schema of the --db-sink staging tables (default: {pg_sink.DEFAULT_SCHEMA})"
+)
+parser.add_argument(
+    "--no-adaptive-waits",
+    action="store_true",
+    help="Use each wait profile's base timeout instead of adapting it to observed p95 load times"
+)
 args = parser.parse_args()
 
+shard = None
+if args.shard:
+    try:
+        shard = shards.parse_shard_spec(args.shard)
+    except ValueError as e:
+        parser.error(str(e))
+if args.shard and args.merge_shards:
+    parser.error("--shard and --merge-shards cannot be combined")
+if args.plan_only and not args.enrich_mode:
+    parser.error("--plan-only requires --enrich-mode")
+budget_spec = None
+budget_forces_pipeline = False
+if args.budget:
+    if not args.enrich_mode:
+        parser.error("--budget requires --enrich-mode")
+    try:
+        budget_spec = parse_budget(args.budget)
+    except ValueError as e:
+        parser.error(str(e))
+    # Two sequential passes would spend the budget on 50-a for every officer,
+    # low priority included, before the first payroll lookup
+    if not args.pipeline:
+        args.pipeline = True
+        budget_forces_pipeline = True
+
 # Determine operation mode
 rescrape_mode = args.rescrape_list is not None
 enrich_mode = args.enrich_mode is not None
 rescrape_targets = []
-enrich_targets = {}  # Dict: source_id -> {columns: [], priority: str}
+enrich_targets = {}  # Dict: source_id -> {columns: [], delta_rows: {column: (current_value, priority)}, priority: str}
 override_version_tag = args.version_tag
 
+# Shared across all pages/workers so concurrency never raises the per-host request rate
+throttle = HostThrottle(per_host_limit=args.per_host_limit)
+
+# Request interception applied to every browser context, with run-wide blocked/loaded counters
+browser_policy = resource_policy.POLICIES[args.resource_policy]
+resource_stats = resource_policy.ResourceStats()
+
+# Page readiness waits and idle-time metrics, shared by all pages/workers
+waits = WaitTracker(WAIT_PROFILES, adaptive=not args.no_adaptive_waits)
+
+# Checkpoint journal of completed enrichment phases (set in the main script)
+_journal = None
+
+# Postgres connection pool (see _database())
+_db = None
+
+# --enrich-mode: sources each officer needs (set in the main script)
+_enrich_plan = None
+
+# --budget: run-wide time/lookup budget, counted from the start of the run
+_budget = RunBudget(*budget_spec) if budget_spec else None
+
+# Cross-month officer registry (full scrapes) and the phases it served, by record key
+_registry = None
+_registry_served = {}
+
 # === Setup logging ===
 # Standalone mode: overwrite log (fresh start)
 # Rescrape/Enrich mode: append to log (continue HERMES workflow)
-log_mode = "a" if (rescrape_mode or enrich_mode) else "w"
+# Payroll sync: append to log (maintenance run, keep the last scrape's log)
+# Shards/merge: append to log (shard processes share one log file)
+log_mode = "a" if (rescrape_mode or enrich_mode or args.payroll_sync or shard or args.merge_shards) else "w"
 logging.basicConfig(
     filename=THOTH_LOG,
     filemode=log_mode,
@@ -78,7 +344,11 @@ logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(message)s",
 )
 logging.info("Them Dogs Gonna Get'm")
-if enrich_mode:
+if args.payroll_sync:
+    logging.info("=== PAYROLL SYNC: Appending to existing log ===")
+elif args.merge_shards:
+    logging.info(f"=== MERGE SHARDS: Appending to existing log ({args.merge_shards} shards) ===")
+elif enrich_mode:
     logging.info("=== ENRICH MODE: Appending to existing log ===")
 elif rescrape_mode:
     logging.info("=== RESCRAPE MODE: Appending to existing log ===")
@@ -94,6 +364,7 @@ if enrich_mode:
                 source_id = row.get('source_id', '').strip()
                 column_name = row.get('column_name', '').strip()
                 priority = row.get('priority', 'low').strip()
+                current_value = row.get('current_value', '') or ''
                 
                 # Parse source_id to extract identifying info (format: YYMM-badge)
                 # e.g., "2512-12345" -> version_tag=2512, badge=12345
@@ -107,6 +378,7 @@ if enrich_mode:
                 if source_id not in enrich_targets:
                     enrich_targets[source_id] = {
                         'columns': [],
+                        'delta_rows': {},
                         'priority': priority,
                         'badge': badge,
                         'version_tag': version_tag
@@ -115,6 +387,10 @@ if enrich_mode:
                 # Add column to target list for this officer
                 if column_name not in enrich_targets[source_id]['columns']:
                     enrich_targets[source_id]['columns'].append(column_name)
+                    enrich_targets[source_id]['delta_rows'][column_name] = (current_value, priority)
+                # An officer runs at the highest priority of any of its columns
+                if priority_rank(priority) < priority_rank(enrich_targets[source_id]['priority']):
+                    enrich_targets[source_id]['priority'] = priority
         
         logging.info(f"ENRICH MODE: Loaded {len(enrich_targets)} officers with {sum(len(t['columns']) for t in enrich_targets.values())} fields to enrich")
     except Exception as e:
@@ -138,52 +414,69 @@ elif rescrape_mode:
     except Exception as e:
         logging.error(f"RESCRAPE MODE: Failed to load target list: {e}")
         sys.exit(1)
-else:
+elif not args.payroll_sync and not args.merge_shards:
     logging.info("FULL SCRAPE MODE: Extracting all officers from NYPD Trials page")
+if shard:
+    logging.info(f"SHARD MODE: processing shard {shard[0]}/{shard[1]}")
 
 # === Helper Functions ===
+# Serializes every table on the page in one round trip: header texts plus the
+# td texts of each tr (rows with no td cells, e.g. header rows, are kept empty)
+TABLES_SNAPSHOT_JS = """
+() => Array.from(document.querySelectorAll('table')).map(table => ({
+    headers: Array.from(table.querySelectorAll('th')).map(th => th.innerText),
+    rows: Array.from(table.querySelectorAll('tr')).map(
+        tr => Array.from(tr.querySelectorAll('td')).map(td => td.innerText)
+    ),
+}))
+"""
+
+def snapshot_tables(page):
+    """
+    Serialize all tables on the page with a single page.evaluate.
+
+    Returns:
+        List of {"headers": [str], "rows": [[str]]} dicts with stripped cell text
+    """
+    tables = page.evaluate(TABLES_SNAPSHOT_JS)
+    return [
+        {
+            "headers": [h.strip() for h in table["headers"]],
+            "rows": [[c.strip() for c in row] for row in table["rows"]],
+        }
+        for table in tables
+    ]
+
 def score_table_by_keywords(table, keywords):
     points = 0
-    headers = [th.inner_text().strip() for th in table.query_selector_all("th")]
-    for kw in keywords:
-        if any(kw.lower() in h.lower() for h in headers):
+    lowered = [kw.lower() for kw in keywords]
+    headers = [h.lower() for h in table["headers"]]
+    for kw in lowered:
+        if any(kw in h for h in headers):
             points += 1
-    for row in table.query_selector_all("tr"):
-        for cell in row.query_selector_all("td"):
-            text = cell.inner_text().strip()
-            for kw in keywords:
-                if kw.lower() in text.lower():
+    for row in table["rows"]:
+        for text in row:
+            text = text.lower()
+            for kw in lowered:
+                if kw in text:
                     points += 0.5
     logging.info(f"Table scored {points} points based on keywords")
     return points
 
 def extract_table(table):
-    headers = [th.inner_text().strip() for th in table.query_selector_all("th")]
+    headers = table["headers"]
     records = []
-    for row in table.query_selector_all("tr"):
-        cells = row.query_selector_all("td")
+    for cells in table["rows"]:
         if not cells:
             continue
         record = {}
-        for idx, cell in enumerate(cells):
+        for idx, text in enumerate(cells):
             label = headers[idx] if idx < len(headers) else f"column_{idx}"
-            record[label] = cell.inner_text().strip()
+            record[label] = text
         records.append(record)
     logging.info(f"Extracted {len(records)} rows from table (headers: {headers})")
     return records
 
-def _norm(s: str) -> str:
-    """
-    Normalize a string by converting to lowercase and removing all non-alphanumeric characters.
-    
-    Args:
-        s: The string to normalize
-        
-    Returns:
-        Normalized string (lowercase with only alphanumeric chars)
-    """
-    return re.sub(r"[^a-z0-9]", "", s.lower()) if s else ""
-
 def _parse_mmddyyyy(s: str):
     try:
         return datetime.strptime(s, "%m/%d/%Y")
@@ -196,181 +489,6 @@ def _parse_mm01yyyy(s: str):
     except Exception:
         return None
 
-def _split_candidate_name(name_text: str):
-    """
-    Parse a name string into first and last name components.
-    
-    Handles both "Last, First" and "First Last" formats.
-    
-    Args:
-        name_text: A string containing a person's name
-        
-    Returns:
-        Tuple of (first_name, last_name)
-    """
-    if not name_text:
-        return "", ""
-    name_text = name_text.strip()
-    if "," in name_text:
-        # Handle "Last, First" format
-        last, rest = [p.strip() for p in name_text.split(",", 1)]
-        first = rest.split()[0] if rest else ""
-        return first, last
-    parts = name_text.split()
-    if len(parts) == 1:
-        # Only one name part provided
-        return parts[0], ""
-    # Assume "First Last" format
-    return parts[0], " ".join(parts[1:])
-
-
-def _extract_initial(name_text: str) -> str:
-    """
-    Extract a single-letter middle initial from a name string, if present.
-
-    Examples:
-      'Harrison, Lenita I.' -> 'I'
-      'Lenita I. Harrison' -> 'I'
-
-    Returns uppercase initial or empty string when not found.
-    """
-    if not name_text:
-        return ""
-    # Look for a single letter followed by a period (common form)
-    m = re.search(r"\b([A-Za-z])\.\b", name_text)
-    if m:
-        return m.group(1).upper()
-    # Fallback: single letter at the end or between names without a dot
-    m2 = re.search(r"\b([A-Za-z])\b(?=[^A-Za-z]*$)", name_text)
-    if m2 and len(m2.group(1)) == 1:
-        return m2.group(1).upper()
-    return ""
-
-def _parse_precinct_desc(precinct_desc):
-    """
-    Parse precinct description into three components:
-    - Current assignment (precinct/unit name)
-    - Current assignment start date
-    - Previous assignments (comma-separated list)
-    
-    Example input: "Quartermaster Section since April 2024 Also served at Housing Bureau, Patrol Services Bureau, Transit Bureau"
-    
-    Args:
-        precinct_desc: Raw precinct description string (can be None)
-    
-    Returns:
-        Tuple of (current_assignment, assignment_start, previous_assignments)
-    """
-    if not precinct_desc:
-        return (None, None, None)
-    
-    current_assignment = None
-    assignment_start = None
-    previous_assignments = None
-    
-    # Pattern: "Unit Name since Month Year Also served at Previous1, Previous2, Previous3"
-    # Look for "since" pattern to extract current assignment and start date
-    since_match = re.search(r'^(.+?)\s+since\s+([A-Za-z]+\s+\d{4})', precinct_desc, re.I)
-    if since_match:
-        current_assignment = since_match.group(1).strip()
-        assignment_start = since_match.group(2).strip()
-    else:
-        # No "since" found - treat entire string as current assignment
-        current_assignment = precinct_desc.strip()
-    
-    # Look for "Also served at" pattern to extract previous assignments
-    also_match = re.search(r'Also served at\s+(.+)$', precinct_desc, re.I)
-    if also_match:
-        previous_assignments = also_match.group(1).strip()
-        # If we found "Also served at", remove it from current_assignment if it's there
-        if current_assignment and "Also served at" in current_assignment:
-            current_assignment = re.sub(r'\s*Also served at.+$', '', current_assignment, flags=re.I).strip()
-    
-    logging.debug(f"Parsed precinct: current='{current_assignment}', start='{assignment_start}', previous='{previous_assignments}'")
-    return (current_assignment, assignment_start, previous_assignments)
-
-def _parse_article_html(article_element):
-    """
-    Parse article data from a 50-a.org news anchor element.
-    
-    Expected HTML structure in div.news:
-    <a href="url">Title</a>, Source, Date<br>
-    
-    The source and date are TEXT SIBLINGS of the anchor, not inside it.
-    
-    Args:
-        article_element: Playwright element handle for anchor tag
-        
-    Returns:
-        Dict with keys: title, source, date_published, url (or None if parsing fails)
-    """
-    try:
-        # Element should be an anchor tag
-        tag_name = article_element.evaluate("el => el.tagName").lower()
-        
-        if tag_name != "a":
-            # Not an anchor, skip
-            logging.debug(f"Article parser: skipping non-anchor element ({tag_name})")
-            return None
-        
-        # Extract URL and title from anchor
-        url = article_element.get_attribute("href")
-        title = article_element.inner_text().strip()
-        
-        if not url or not title:
-            logging.debug(f"Article parser: missing url or title (url={url}, title={title})")
-            return None
-        
-        # Get the text that follows the anchor (sibling text nodes)
-        # This contains: ", Source, Date"
-        try:
-            # Use JavaScript to get the next sibling text content
-            sibling_text = article_element.evaluate("""
-                (anchor) => {
-                    let text = '';
-                    let node = anchor.nextSibling;
-                    // Collect text until we hit a <br> or another anchor
-                    while (node && node.nodeName !== 'BR' && node.nodeName !== 'A') {
-                        if (node.nodeType === 3) { // Text node
-                            text += node.textContent;
-                        }
-                        node = node.nextSibling;
-                    }
-                    return text.trim();
-                }
-            """)
-        except Exception as e:
-            logging.debug(f"Article parser: failed to extract sibling text: {e}")
-            sibling_text = ""
-        
-        source = None
-        date_published = None
-        
-        # Parse sibling text: ", Source, Date"
-        if sibling_text:
-            # Remove leading comma and whitespace
-            sibling_text = sibling_text.lstrip(", ").strip()
-            
-            # Split by comma to get [Source, Date]
-            parts = [p.strip() for p in sibling_text.split(",")]
-            
-            if len(parts) >= 1:
-                source = parts[0]
-            if len(parts) >= 2:
-                date_published = parts[1]
-        
-        logging.debug(f"Article parsed: title='{title}', source='{source}', date='{date_published}', url='{url}'")
-        
-        return {
-            "title": title,
-            "source": source,
-            "date_published": date_published,
-            "url": url
-        }
-    except Exception as e:
-        logging.warning(f"Article parser: failed to parse article element: {e}")
-        return None
-
 def _generate_csv_filename(records, override_version_tag=None):
     """
     Generate CSV filename based on trial dates.
@@ -432,235 +550,668 @@ def _generate_csv_filename(records, override_version_tag=None):
     logging.info(f"Generated CSV filename: {filename}")
     return filename
 
-def load_existing_articles(articles_csv_path):
-    """
-    Load existing articles from articles.csv to prevent duplicates.
-    
-    Args:
-        articles_csv_path: Path to the articles.csv file
-        
-    Returns:
-        Tuple of (existing_articles_list, existing_url_badge_pairs_set, next_article_id)
-    """
-    existing_articles = []
-    existing_url_badge_pairs = set()  # Track (url, badge) combinations
-    next_article_id = 1
-    
-    if articles_csv_path.exists():
-        try:
-            with articles_csv_path.open("r", newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    existing_articles.append(row)
-                    url = row.get("url", "")
-                    badge = row.get("badge", "")
-                    if url and badge:
-                        # Track URL+badge combination to allow same article for different officers
-                        existing_url_badge_pairs.add((url, badge))
-                    # Track highest article_id to generate next ID
-                    try:
-                        article_id = int(row.get("article_id", 0))
-                        if article_id >= next_article_id:
-                            next_article_id = article_id + 1
-                    except ValueError:
-                        pass
-            
-            logging.info(f"Articles: Loaded {len(existing_articles)} existing articles from {articles_csv_path}")
-            logging.info(f"Articles: Next article_id will be {next_article_id}")
-        except Exception as e:
-            logging.warning(f"Articles: Failed to load existing articles from {articles_csv_path}: {e}")
-    else:
-        logging.info(f"Articles: No existing articles.csv found at {articles_csv_path}, will create new file")
-    
-    return existing_articles, existing_url_badge_pairs, next_article_id
+# === CSV Output ===
+fieldnames = [
+    "Date","Time","Rank","First","Last","Room","Case Type",
+    "Badge","PCT","PCT URL","Race","Gender","Tax ID","Email",
+    "Current Assignment","Assignment Start","Previous Assignments",
+    "Officer Image","Profile URL","Started","Last Earned",
+    "Disciplined","Articles",
+    "# Complaints","# Allegations","# Substantiated","# Charges",
+    "# Unsubstantiated","# Guidelined",
+    "# Lawsuits","Total Settlements",
+    "Status","Base Salary","Pay Basis","Regular Hours","Regular Gross Paid","OT Hours","Total OT Paid","Total Other Pay"
+]
 
-def save_articles_csv(articles_csv_path, articles_list):
-    """
-    Write articles to articles.csv with proper fieldnames.
-    
-    Args:
-        articles_csv_path: Path to the articles.csv file
-        articles_list: List of article dictionaries to write
-        
-    Returns:
-        Number of articles written
-    """
-    fieldnames = [
-        "article_id",
-        "badge",
-        "first_name",
-        "last_name",
-        "title",
-        "source",
-        "date_published",
-        "url"
-    ]
-    
-    try:
-        with articles_csv_path.open("w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for article in articles_list:
-                writer.writerow(article)
-        
-        logging.info(f"Articles: Wrote {len(articles_list)} articles to {articles_csv_path}")
-        return len(articles_list)
-    except Exception as e:
-        logging.error(f"Articles: Failed to write articles.csv: {e}")
-        return 0
+def _csv_row(r):
+    """Map an officer record (internal or CSV field names) to an output CSV row."""
+    return {
+        "Date":                 r.get("Date", ""),
+        "Time":                 r.get("Time", ""),
+        "Rank":                 r.get("Rank", ""),
+        "First":                r.get("First", ""),
+        "Last":                 r.get("Last", ""),
+        "Room":                 r.get("Room", r.get("Trial Room", "")),
+        "Case Type":            r.get("Case Type", ""),
+        "Badge":                r.get("Badge", r.get("badge", "")),
+        "PCT":                  r.get("PCT", r.get("precinct_number", "")),
+        "PCT URL":              r.get("PCT URL", r.get("precinct_link", "")),
+        "Race":                 r.get("Race", r.get("race", "")),
+        "Gender":               r.get("Gender", r.get("gender", "")),
+        "Tax ID":               r.get("Tax ID", r.get("tax_id", "")),
+        "Email":                r.get("Email", r.get("email", "")),
+        "Current Assignment":   r.get("Current Assignment", r.get("current_assignment", "")),
+        "Assignment Start":     r.get("Assignment Start", r.get("assignment_start", "")),
+        "Previous Assignments": r.get("Previous Assignments", r.get("previous_assignments", "")),
+        "Officer Image":        r.get("Officer Image", r.get("officer_image", "")),
+        "Profile URL":          r.get("Profile URL", r.get("profile_url", "")),
+        "Started":              r.get("Started", r.get("service_start", "")),
+        "Last Earned":          r.get("Last Earned", r.get("last_earned", "")),
+        "Disciplined":          r.get("Disciplined", r.get("has_discipline", "N")),
+        "Articles":             r.get("Articles", r.get("has_articles", "N")),
+        "# Complaints":         r.get("# Complaints", r.get("num_complaints", 0)),
+        "# Allegations":        r.get("# Allegations", r.get("num_allegations", 0)),
+        "# Substantiated":      r.get("# Substantiated", r.get("num_substantiated", 0)),
+        "# Charges":            r.get("# Charges", r.get("num_substantiated_charges", 0)),
+        "# Unsubstantiated":    r.get("# Unsubstantiated", r.get("num_unsubstantiated", 0)),
+        "# Guidelined":         r.get("# Guidelined", r.get("num_within_guidelines", 0)),
+        "# Lawsuits":           r.get("# Lawsuits", r.get("num_lawsuits", 0)),
+        "Total Settlements":    r.get("Total Settlements", r.get("total_settlements", "")),
+        "Status":               r.get("Status", r.get("leave_status_as_of_june_30", "")),
+        "Base Salary":          r.get("Base Salary", r.get("base_salary", "")),
+        "Pay Basis":            r.get("Pay Basis", r.get("pay_basis", "")),
+        "Regular Hours":        r.get("Regular Hours", r.get("regular_hours", "")),
+        "Regular Gross Paid":   r.get("Regular Gross Paid", r.get("regular_gross_paid", "")),
+        "OT Hours":             r.get("OT Hours", r.get("ot_hours", "")),
+        "Total OT Paid":        r.get("Total OT Paid", r.get("total_ot_paid", "")),
+        "Total Other Pay":      r.get("Total Other Pay", r.get("total_other_pay", "")),
+    }
 
-# === Payroll Name Matching Helpers ===
-def _strip_suffix(name: str) -> str:
+def write_csv_file(filepath, records):
     """
-    Remove common name suffixes (Jr, Sr, II, etc.) from a name.
-    
-    Args:
-        name: A name that might contain a suffix
-        
+    Write records to a CSV in one pass, via <name>.partial and an atomic rename.
+
     Returns:
-        The name without the suffix, if a suffix was found
+        Number of data rows written
     """
-    if not name:
-        return ""
-    parts = name.lower().split()
-    if parts and parts[-1] in SUFFIXES:
-        parts = parts[:-1]
-    return " ".join(parts)
+    logging.info(f"Writing CSV to {filepath}")
+    tmp_path = partial_path(filepath)
+    with tmp_path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        written = 0
+        for r in records:
+            writer.writerow(_csv_row(r))
+            written += 1
+    os.replace(tmp_path, filepath)
+    return written
 
+# === Payroll Name Matching Helpers ===
 def _match_last_name(source_last: str, candidate_last: str) -> bool:
     """
-    Compare last names, handling suffixes and allowing partial matches.
+    Compare last names, handling suffixes and compound names.
     
-    This function strips suffixes and checks if either name is contained within 
-    the other after normalization (removing non-alphanumeric chars).
+    Suffixes are stripped and the names compared with identity.last_names_match
+    (exact, or compound such as 'Perez-Smith' vs 'Smith'; 'Harris' is not 'Harrison').
     
     Args:
         source_last: The source last name to match
         candidate_last: The candidate last name to compare against
         
     Returns:
-        True if the names match by containment after normalization
+        True if the last names can belong to the same officer
     """
     if not source_last or not candidate_last:
         logging.debug(f"Last-name match skipped due to missing value: source='{source_last}', candidate='{candidate_last}'")
         return False
-    source_last_clean = _strip_suffix(source_last)
-    candidate_last_clean = _strip_suffix(candidate_last)
-    result = (_norm(source_last_clean) in _norm(candidate_last_clean) or
-              _norm(candidate_last_clean) in _norm(source_last_clean))
+    result = identity.last_names_match(Identity(last=source_last), Identity(last=candidate_last))
     logging.debug(f"Last-name match: source='{source_last}' candidate='{candidate_last}' -> {result}")
     return result
 
-# === NYPDTRIAL Extraction ===
-def extract_from_nypdtrial(page, retries=5, timeout=30000):  # Increased timeout to 30 seconds and retries to 5
-    logging.info(f"Visiting NYPD Trials: {SITES['NYPDTRIAL']}")
-    attempt = 0
-    gc.collect()  # Force garbage collection before starting
-    while attempt < retries:
-        try:
-            logging.info(f"Trails: Attempt {attempt + 1}/{retries} to load NYPD Trials page...")
-            page.goto(SITES["NYPDTRIAL"], timeout=timeout, wait_until="networkidle")
-            logging.info("Trails: Page loaded successfully")
-            # Add a verification step
-            if page.query_selector("table"):
-                logging.info("Trails: Found table elements on the page")
-                break
-            else:
-                logging.warning("Trails: Page loaded but no tables found, may need to retry")
-                attempt += 1
-        except TimeoutError:
-            attempt += 1
-            logging.warning(f"Trails: NYPD Trials page load timed out after {timeout}ms (attempt {attempt}/{retries})")
-            if attempt < retries:
-                logging.info("50-a: Waiting 5 seconds before retrying...")
-                page.wait_for_timeout(5000)  # Wait 5 seconds between attempts
-        except Exception as e:
-            attempt += 1
-            logging.error(f"Trails: Unexpected error loading page: {str(e)}")
-            if attempt >= retries:
-                logging.error(f"Trails: Failed to load NYPD Trials page after {retries} attempts")
-                return []
-            logging.info("Trails: Waiting 5 seconds before retrying...")
-            page.wait_for_timeout(5000)  # Wait 5 seconds between attempts
-    
-    if attempt >= retries:
-        logging.error(f"Trails: Failed to load NYPD Trials page after {retries} attempts")
-        return []
+def _payroll_years():
+    """
+    Return the (priority, fallback) fiscal years used for payroll matching.
+    """
+    current_year = datetime.now().year
+    return str(current_year - 1), str(current_year - 2)
 
-    tables = page.query_selector_all("table")
-    logging.info(f"Trails: Found {len(tables)} tables on the NYPD Trials page")
+def _select_payroll_row(rows, last, priority_year, fallback_year, service_start_dt):
+    """
+    Pick the best payroll row for an officer from 17-cell explorer rows.
 
-    scored_tables = [(table, score_table_by_keywords(table, KEYWORDS)) for table in tables]
-    selected_tables = [t for t, score in scored_tables if score >= THRESHOLD]
-    logging.info(f"Trails: Selected {len(selected_tables)} tables with threshold >= {THRESHOLD}")
+    A priority-year row with a matching last name wins immediately; otherwise
+    the fallback-year row whose agency start date is closest to service_start.
 
-    records = []
-    for ti, table in enumerate(selected_tables, start=1):
-        data = extract_table(table)
-        logging.info(f"Trails: Table #{ti}: extracted {len(data)} rows")
-        for row_idx, record in enumerate(data, start=1):
-            if record.get("Name"):
-                parts = record["Name"].split()
-                record["First"] = parts[0]
-                record["Last"] = " ".join(parts[1:]) if len(parts) > 1 else ""
-                # Extract middle initial if present in the name string
-                record["Initial"] = _extract_initial(record["Name"])
-                logging.info(f"Trails: Record #{row_idx} parsed Name -> First: '{record['First']}' Last: '{record['Last']}'")
-            records.append(record)
-    logging.info(f"Trails: Total trial records extracted: {len(records)}")
-    return records
+    Args:
+        rows: List of 17-cell payroll rows
+        last: Officer last name
+        priority_year: Fiscal year accepted immediately
+        fallback_year: Fiscal year used when no priority row matches
+        service_start_dt: Parsed 50-a service start (or None)
 
-# === FIFTYA Enrichment ===
-def enrich_with_50a(page, record, is_rescrape=False):
+    Returns:
+        Chosen cells list, or None
     """
-    Enrich record with data from 50-a.org
-    
+    chosen = None
+    for cells in rows:
+        if len(cells) < 17:
+            continue
+        year = cells[0]
+        if year not in (priority_year, fallback_year):
+            continue
+        if not _match_last_name(last, cells[3]):
+            continue
+        if year == priority_year:
+            return cells
+        delta_days = None
+        if service_start_dt:
+            asd = _parse_mmddyyyy(cells[6])
+            if asd:
+                delta_days = abs((asd - service_start_dt).days)
+        if not chosen:
+            chosen = (cells, delta_days)
+        else:
+            _, current_delta = chosen
+            if delta_days is not None and (current_delta is None or delta_days < current_delta):
+                chosen = (cells, delta_days)
+    return chosen[0] if chosen else None
+
+def _read_payroll_rows(page, limit, label):
+    """
+    Read the explorer's result table into 17-cell payroll rows.
+
     Args:
-        page: Playwright page object
-        record: Officer record dictionary
-        is_rescrape: If True, apply status codes (NOT_FOUND, UNVERIFIED) for missing data
-                     If False (first run), leave fields as NULL
-    
+        page: Playwright page showing payroll search results
+        limit: Maximum number of table rows to scan
+        label: Log label ("attempt 2", "retry")
+
     Returns:
-        List of article dictionaries extracted from officer's news section
+        List of cells lists, in table order (short rows are skipped)
     """
-    # Fields that 50-a enrichment populates
-    FIFTYA_FIELDS = ["race", "gender", "tax_id", "email", "badge", 
-                     "current_assignment", "assignment_start", "previous_assignments",
-                     "precinct_link", "precinct_number", "service_start", "last_earned"]
-    
-    # Check if this is enrich mode with targeted columns
-    enrich_columns = record.get("enrich_columns", [])
-    if enrich_columns:
-        # Only scrape fields that are in the target list
-        FIFTYA_FIELDS = [f for f in FIFTYA_FIELDS if f in enrich_columns]
-        logging.info(f"50-a: ENRICH MODE - targeting {len(FIFTYA_FIELDS)} fields: {FIFTYA_FIELDS}")
+    rows = []
+    for row_idx, row in enumerate(page.query_selector_all("table tbody tr")[:limit], start=1):
+        cells = [c.inner_text().strip() for c in row.query_selector_all("td")]
+        if len(cells) < 17:
+            logging.debug(f"Payroll: skipping row #{row_idx} on {label} (insufficient cells)")
+            continue
+        logging.info(
+            f"Payroll: {label} row#{row_idx} -> year={cells[0]}, first='{cells[4]}', "
+            f"last='{cells[3]}', agency_start='{cells[6]}'"
+        )
+        rows.append(cells)
+    return rows
+
+def open_payroll_cache():
+    """
+    Open the persistent payroll cache shared by standalone, rescrape and enrich runs.
+    """
+    global _payroll_disk_cache
+    try:
+        _payroll_disk_cache = DiskCache(ENRICHMENT_CACHE_FILE, "payroll")
+        logging.info(f"Payroll cache: using {ENRICHMENT_CACHE_FILE} (valid for fiscal year {_payroll_years()[0]})")
+    except Exception as e:
+        logging.warning(f"Payroll cache: failed to open {ENRICHMENT_CACHE_FILE}, using in-process cache only: {e}")
+        _payroll_disk_cache = None
+
+def _payroll_cache_disk_key(cache_key):
+    first, last, service_start = cache_key
+    return f"payroll:{first}|{last}|{service_start or ''}"
+
+def _payroll_cache_get(cache_key):
+    """
+    Look up cached payroll fields: in-process dict first, then the disk cache.
+
+    Disk entries are tagged with the priority fiscal year they were matched
+    against, so they expire when a new fiscal year becomes the priority.
+
+    Returns:
+        Dict of payroll fields, or None
+    """
+    global _payroll_cache_memory_hits
+    if cache_key in _payroll_cache:
+        with _payroll_cache_lock:
+            _payroll_cache_memory_hits += 1
+        return _payroll_cache[cache_key]
+    if _payroll_disk_cache is None:
+        return None
+    try:
+        data = _payroll_disk_cache.get(key=_payroll_cache_disk_key(cache_key), tag=_payroll_years()[0])
+    except Exception as e:
+        logging.warning(f"Payroll cache: disk lookup failed: {e}")
+        return None
+    if data is not None:
+        _payroll_cache[cache_key] = data
+    return data
+
+def _payroll_cache_put(cache_key, payroll_data):
+    """
+    Store payroll fields in the in-process dict and the disk cache.
+    """
+    _payroll_cache[cache_key] = payroll_data.copy()
+    if _payroll_disk_cache is None:
+        return
+    try:
+        _payroll_disk_cache.put(_payroll_cache_disk_key(cache_key), payroll_data, tag=_payroll_years()[0])
+    except Exception as e:
+        logging.warning(f"Payroll cache: disk write failed: {e}")
+
+def _apply_payroll_cells(record, cells, cache_key, is_rescrape=False):
+    """
+    Copy payroll fields from a chosen 17-cell row into the record and cache them.
+
+    Args:
+        record: Officer record dictionary
+        cells: Chosen payroll row
+        cache_key: Payroll cache key (first, last, service_start)
+        is_rescrape: If True, mark missing salary fields UNVERIFIED
+    """
+    payroll_data = {
+        "leave_status_as_of_june_30": cells[9],
+        "base_salary": cells[10],
+        "pay_basis": cells[11],
+        "regular_hours": cells[12],
+        "regular_gross_paid": cells[13],
+        "ot_hours": cells[14],
+        "total_ot_paid": cells[15],
+        "total_other_pay": cells[16],
+    }
+    record.update(payroll_data)
+    record["Last Earned"] = payroll_data["regular_gross_paid"]
+
+    # Cache successful payroll data
+    _payroll_cache_put(cache_key, payroll_data)
+
+    # Mark successful enrichment
+    record["enrichment_status_payroll"] = "FOUND"
+
+    # Set UNVERIFIED status for payroll fields that should have data but are missing
+    # Only during rescrape (Phase 2) - on first run, fields remain NULL
+    if is_rescrape:
+        if not record.get("base_salary"):
+            record["base_salary"] = "UNVERIFIED"
+            logging.info(f"Payroll: base_salary field set to UNVERIFIED (extraction failed)")
+        if not record.get("pay_basis"):
+            record["pay_basis"] = "UNVERIFIED"
+            logging.info(f"Payroll: pay_basis field set to UNVERIFIED (extraction failed)")
+
+def _mark_payroll_not_found(record, query, is_rescrape=False):
+    """
+    Set NOT_FOUND on payroll fields when no payroll data was found.
+
+    Only during rescrape (Phase 2) - on first run, fields remain NULL.
+    """
+    if not record.get("base_salary") and not record.get("pay_basis"):
+        if is_rescrape:
+            logging.info(f"Payroll: rescrape mode - No data found for '{query}', setting NOT_FOUND status for payroll fields")
+            # Dynamically set NOT_FOUND for all payroll fields
+            for field in ["base_salary", "pay_basis", "regular_hours", "regular_gross_paid",
+                         "ot_hours", "total_ot_paid", "total_other_pay"]:
+                if not record.get(field):
+                    record[field] = "NOT_FOUND"
+
+def _payroll_last_name_variants(last):
+    """
+    Last-name spellings to request from the payroll API for one officer.
+
+    Covers suffix-stripped and hyphen/space variants of compound names, since
+    the API filter is an exact (case-insensitive) match.
+    """
+    base = _strip_suffix(last)
+    variants = {last.lower(), base}
+    if "-" in base or " " in base:
+        variants.add(base.replace("-", " "))
+        variants.add(base.replace(" ", "-"))
+        variants.update(split_name_parts(base))
+    return {v for v in variants if v}
+
+def prefetch_payroll_api(records):
+    """
+    Fetch payroll rows for every officer in the batch (the run, or one
+    enrich-mode chunk) with batched SODA queries, put them in an identity
+    blocking index and match every officer name against it in one pass
+    (IdentityIndex.match_all).
+
+    The previous batch's index is dropped first; on failure the index stays
+    None and enrich_with_payroll falls back to scraping the explorer UI.
+
+    Args:
+        records: List of officer record dictionaries
+    """
+    global _payroll_api_index, _payroll_api_matches
+    _payroll_api_index, _payroll_api_matches = None, {}
+    last_names = set()
+    for record in records:
+        if record.get("First") and record.get("Last"):
+            last_names.update(_payroll_last_name_variants(record["Last"]))
+    if not last_names:
+        logging.info("Payroll API: no officer names to prefetch")
+        return
+    try:
+        rows = payroll_api.fetch_payroll_rows(last_names, _payroll_years())
+    except Exception as e:
+        logging.error(f"Payroll API: batched fetch failed ({e}); falling back to explorer UI scraping")
+        return
+    _payroll_api_index = IdentityIndex(rows, payroll_api.row_identity)
+    logging.info(f"Payroll API: indexed {len(rows)} rows")
+    # Block and name-score every officer of the run in one pass; each officer's
+    # candidates are re-scored once 50-a has filled in the service start
+    queries = {}
+    for record in records:
+        if record.get("First") and record.get("Last"):
+            queries[_payroll_name_key(record)] = Identity(record["First"], record["Last"], record.get("Initial", ""))
+    matches = _payroll_api_index.match_all(queries.values())
+    _payroll_api_matches = {key: [cells for cells, _ in found] for key, found in zip(queries, matches)}
+    logging.info(f"Payroll API: {sum(1 for found in matches if found)} of {len(queries)} officer names have candidate rows")
+
+def _payroll_name_key(record):
+    """Prefetch match key: the name fields the payroll rows are scored on."""
+    return _norm(record.get("First", "")), _norm(_strip_suffix(record.get("Last", ""))), (record.get("Initial") or "").upper()
+
+def _officer_identity(record, first, last):
+    """Identity of the officer being enriched, from the trials page and 50-a fields."""
+    return Identity(
+        first=first,
+        last=last,
+        initial=record.get("Initial", ""),
+        badge=record.get("badge"),
+        tax_id=record.get("tax_id"),
+        service_start=_parse_mm01yyyy(record.get("service_start") or ""),
+    )
+
+def _payroll_key(cells):
+    """Snapshot/API index key for a payroll row: normalized (last, first)."""
+    return _norm(_strip_suffix(cells[3])), _norm(cells[4])
+
+def sync_payroll_snapshot():
+    """
+    Download the NYPD payroll slice for the priority/fallback fiscal years
+    into the local snapshot (--payroll-sync).
+
+    Returns:
+        Number of rows stored
+    """
+    years = _payroll_years()
+    logging.info(f"Payroll sync: downloading NYPD payroll rows for fiscal years {years}")
+    rows = payroll_api.fetch_payroll_rows(None, years)
+    snapshot = PayrollSnapshot(PAYROLL_SNAPSHOT_FILE)
+    try:
+        return snapshot.replace_rows(rows, _payroll_key)
+    finally:
+        snapshot.close()
+
+def open_payroll_snapshot():
+    """
+    Open the local payroll snapshot for lookups, if one has been synced.
+    """
+    global _payroll_snapshot
+    _payroll_snapshot = PayrollSnapshot.open_existing(PAYROLL_SNAPSHOT_FILE)
+    if _payroll_snapshot is None:
+        logging.info(f"Payroll snapshot: none found at {PAYROLL_SNAPSHOT_FILE} (run --payroll-sync to create it)")
+        return
+    years = _payroll_snapshot.fiscal_years()
+    logging.info(f"Payroll snapshot: using {PAYROLL_SNAPSHOT_FILE} (synced {_payroll_snapshot.meta('synced_at')}, fiscal years {years})")
+    priority_year, _ = _payroll_years()
+    if priority_year not in years:
+        # Fallback-year rows would be accepted without ever looking for the current year live
+        logging.warning(f"Payroll snapshot: fiscal year {priority_year} missing - not using it, lookups go live (re-run --payroll-sync)")
+        _payroll_snapshot.close()
+        _payroll_snapshot = None
+
+def _rank_payroll_rows(record, first, last, rows):
+    """
+    Payroll rows that are plausibly this officer (last name, first-name gate,
+    initial), best first, so the first priority-year row _select_payroll_row
+    accepts is the best-scoring one.
+
+    Returns:
+        List of 17-cell rows scoring at least identity.MATCH_THRESHOLD
+    """
+    query = _officer_identity(record, first, last)
+    ranked = identity.rank(
+        query, ((cells, payroll_api.row_identity(cells)) for cells in rows), identity.MATCH_THRESHOLD
+    )
+    return [cells for cells, _ in ranked]
+
+def _match_payroll_candidates(record, first, last, cache_key, candidates, source, is_rescrape=False):
+    """
+    Resolve an officer from a set of candidate payroll rows already in memory
+    (SODA prefetch or local snapshot).
+
+    Returns:
+        True if a payroll row was applied
+    """
+    priority_year, fallback_year = _payroll_years()
+    candidates = _rank_payroll_rows(record, first, last, candidates)
+    service_start_dt = _officer_identity(record, first, last).service_start
+    cells = _select_payroll_row(candidates, last, priority_year, fallback_year, service_start_dt)
+    if not cells:
+        logging.info(f"{source}: no match for '{first} {last}' among {len(candidates)} candidate rows")
+        return False
+    if service_start_dt is None:
+        starts = {c[6] for c in candidates if c[0] == cells[0]}
+        if len(starts) > 1:
+            # Without a service start the best-scoring name wins; a same-name officer may have been picked
+            logging.warning(f"{source}: ambiguous pick for '{first} {last}' - {len(starts)} officers in {cells[0]} and no service start to tell them apart")
+    _apply_payroll_cells(record, cells, cache_key, is_rescrape)
+    logging.info(f"{source}: chosen row year={cells[0]} agency_start={cells[6]} status={cells[9]} for '{first} {last}'")
+    return True
+
+def _enrich_payroll_from_api(record, first, last, cache_key, is_rescrape=False):
+    """
+    Resolve an officer from the prefetched SODA rows.
+
+    Returns:
+        True if a payroll row was applied
+    """
+    candidates = _payroll_api_matches.get(_payroll_name_key(record))
+    if candidates is None:  # Not in the prefetched run (e.g. name filled in later)
+        query = _officer_identity(record, first, last)
+        candidates = [cells for cells, _ in _payroll_api_index.search(query)]
+    return _match_payroll_candidates(record, first, last, cache_key, candidates, "Payroll API", is_rescrape)
+
+def _enrich_payroll_from_snapshot(record, first, last, cache_key, is_rescrape=False):
+    """
+    Resolve an officer from the local payroll snapshot index.
+
+    Returns:
+        True if a payroll row was applied
+    """
+    # Hyphen/space variants of a compound name normalize to the same key; look each key up once
+    last_norms = {_norm(variant) for variant in _payroll_last_name_variants(last)}
+    candidates = _payroll_snapshot.lookup(last_norms, _payroll_years())
+    return _match_payroll_candidates(record, first, last, cache_key, candidates, "Payroll snapshot", is_rescrape)
+
+# === NYPDTRIAL Extraction ===
+def extract_from_nypdtrial(page, retries=5, timeout=30000):  # Increased timeout to 30 seconds and retries to 5
+    logging.info(f"Visiting NYPD Trials: {SITES['NYPDTRIAL']}")
+    attempt = 0
+    gc.collect()  # Force garbage collection before starting
+    while attempt < retries:
+        try:
+            logging.info(f"Trails: Attempt {attempt + 1}/{retries} to load NYPD Trials page...")
+            waits.navigate(page, SITES["NYPDTRIAL"], "trials", timeout_ms=timeout)
+            logging.info("Trails: Page loaded successfully")
+            # Add a verification step
+            if page.query_selector("table"):
+                logging.info("Trails: Found table elements on the page")
+                break
+            else:
+                logging.warning("Trails: Page loaded but no tables found, may need to retry")
+                attempt += 1
+        except TimeoutError:
+            attempt += 1
+            logging.warning(f"Trails: NYPD Trials page load timed out after {timeout}ms (attempt {attempt}/{retries})")
+            if attempt < retries:
+                logging.info("50-a: Waiting 5 seconds before retrying...")
+                waits.sleep(page, 5000)  # Wait 5 seconds between attempts
+        except Exception as e:
+            attempt += 1
+            logging.error(f"Trails: Unexpected error loading page: {str(e)}")
+            if attempt >= retries:
+                logging.error(f"Trails: Failed to load NYPD Trials page after {retries} attempts")
+                return []
+            logging.info("Trails: Waiting 5 seconds before retrying...")
+            waits.sleep(page, 5000)  # Wait 5 seconds between attempts
     
-    officer_name = record.get("Name")
-    first = record.get("First")
-    last = record.get("Last")
-    if not officer_name or not first or not last:
-        logging.warning("50-a: Missing Name/First/Last; skipping enrichment")
+    if attempt >= retries:
+        logging.error(f"Trails: Failed to load NYPD Trials page after {retries} attempts")
         return []
 
+    tables = snapshot_tables(page)
+    logging.info(f"Trails: Found {len(tables)} tables on the NYPD Trials page")
+
+    scored_tables = [(table, score_table_by_keywords(table, KEYWORDS)) for table in tables]
+    selected_tables = [t for t, score in scored_tables if score >= THRESHOLD]
+    logging.info(f"Trails: Selected {len(selected_tables)} tables with threshold >= {THRESHOLD}")
+
+    records = []
+    for ti, table in enumerate(selected_tables, start=1):
+        data = extract_table(table)
+        logging.info(f"Trails: Table #{ti}: extracted {len(data)} rows")
+        for row_idx, record in enumerate(data, start=1):
+            if record.get("Name"):
+                parts = record["Name"].split()
+                record["First"] = parts[0]
+                record["Last"] = " ".join(parts[1:]) if len(parts) > 1 else ""
+                # Extract middle initial if present in the name string
+                record["Initial"] = _extract_initial(record["Name"])
+                logging.info(f"Trails: Record #{row_idx} parsed Name -> First: '{record['First']}' Last: '{record['Last']}'")
+            records.append(record)
+    logging.info(f"Trails: Total trial records extracted: {len(records)}")
+    return records
+
+# === FIFTYA Profile Cache ===
+OFFICER_ID_RE = re.compile(r"/officer/([A-Za-z0-9]+)")
+
+def _fiftya_officer_id(profile_url):
+    """
+    Extract the 50-a officer id from a profile URL.
+
+    Example: 'https://www.50-a.org/officer/T8QD' -> 'T8QD'
+    """
+    if not profile_url:
+        return None
+    m = OFFICER_ID_RE.search(profile_url)
+    return m.group(1) if m else None
+
+def _fiftya_name_key(first, last):
+    """Normalized-name alias used to find a cached profile before searching."""
+    return f"name:{_norm(first)}|{_norm(last)}"
+
+def _mark_50a_unverified(record):
+    """
+    Set UNVERIFIED status for fields that should have data but extraction failed.
+    Only applied during rescrape (Phase 2) - on first run, fields remain NULL.
+    """
+    if not record.get("race"):
+        record["race"] = "UNVERIFIED"
+        logging.info(f"50-a: race field set to UNVERIFIED (extraction failed)")
+    if not record.get("gender"):
+        record["gender"] = "UNVERIFIED"
+        logging.info(f"50-a: gender field set to UNVERIFIED (extraction failed)")
+
+def open_fiftya_cache(ttl_days, max_entries):
+    """
+    Open the persistent 50-a profile cache.
+    """
+    global _fiftya_cache
+    try:
+        _fiftya_cache = DiskCache(ENRICHMENT_CACHE_FILE, "fiftya", ttl_seconds=ttl_days * 86400, max_entries=max_entries)
+        logging.info(f"50-a cache: using {ENRICHMENT_CACHE_FILE} (ttl={ttl_days} days, max={max_entries} profiles)")
+    except Exception as e:
+        logging.warning(f"50-a cache: failed to open {ENRICHMENT_CACHE_FILE}, continuing without cache: {e}")
+        _fiftya_cache = None
+
+def _store_50a_cache(record, articles, name_key):
+    """
+    Save a successfully parsed 50-a profile (record fields + articles).
+    """
+    if _fiftya_cache is None:
+        return
+    officer_id = _fiftya_officer_id(record.get("profile_url"))
+    if not officer_id:
+        logging.debug(f"50-a cache: no officer id in profile URL for {name_key}, not caching")
+        return
+    value = {
+        "fields": {f: record.get(f) for f in FIFTYA_CACHE_FIELDS},
+        "articles": [
+            {k: a.get(k) for k in ("title", "source", "date_published", "url")}
+            for a in articles
+        ],
+    }
+    try:
+        _fiftya_cache.put(f"officer:{officer_id}", value, aliases=[name_key])
+    except Exception as e:
+        logging.warning(f"50-a cache: failed to store officer {officer_id}: {e}")
+
+def load_known_profile_urls(csv_dir):
+    """
+    Collect 50-a profile URLs from the Profile URL column of earlier monthly CSVs.
+
+    Later months override earlier ones for the same officer name.
+
+    Args:
+        csv_dir: Directory containing YYMM-copwatchdog.csv files
+
+    Returns:
+        Dict of normalized-name alias -> profile URL
+    """
+    known = {}
+    for path in sorted(Path(csv_dir).glob("*-copwatchdog.csv")):
+        try:
+            with path.open("r", newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    url = (row.get("Profile URL") or "").strip()
+                    if _fiftya_officer_id(url) and row.get("First") and row.get("Last"):
+                        known[_fiftya_name_key(row["First"], row["Last"])] = url
+        except Exception as e:
+            logging.warning(f"50-a: failed to read profile URLs from {path}: {e}")
+    logging.info(f"50-a: {len(known)} known profile URLs loaded from monthly CSVs in {csv_dir}")
+    return known
+
+def _cached_badge_conflicts(record, cached):
+    """
+    True when a cached profile found by name alias carries a different badge
+    than the record (two officers with the same name share one alias).
+    """
+    placeholders = ("", "N/A", "NOT_FOUND", "UNVERIFIED")
+    badge = str(record.get("badge") or "").strip().lstrip("#")
+    cached_badge = str(cached["fields"].get("badge") or "").strip().lstrip("#")
+    return badge not in placeholders and cached_badge not in placeholders and badge != cached_badge
+
+def _apply_cached_50a(record, cached, is_rescrape=False):
+    """
+    Apply a cached 50-a profile to a record.
+
+    Returns:
+        List of article dictionaries linked to this record
+    """
+    record.update(cached["fields"])
+    if is_rescrape:
+        _mark_50a_unverified(record)
+    articles = []
+    for article in cached.get("articles", []):
+        article = dict(article)
+        article["badge"] = record.get("badge", "")
+        article["first_name"] = record.get("First", "")
+        article["last_name"] = record.get("Last", "")
+        articles.append(article)
+    return articles
+
+# === FIFTYA Profile Navigation ===
+def _search_and_open_profile(page, record, officer_name, first, last, is_rescrape=False):
+    """
+    Find an officer through the 50-a search box and click into the profile.
+
+    Args:
+        page: Playwright page object
+        record: Officer record dictionary (NOT_FOUND codes are set on rescrape misses)
+        officer_name: Full name typed into the search box
+        first: First name to match against candidates
+        last: Last name to match against candidates
+        is_rescrape: If True, set NOT_FOUND status when no candidate matches
+
+    Returns:
+        True if the profile page is loaded
+    """
     logging.info(f"50-a: Searching for '{officer_name}' (First='{first}' Last='{last}')")
     try:
-        page.goto(SITES["FIFTYA"], wait_until="networkidle")
+        waits.navigate(page, SITES["FIFTYA"], "fiftya_search")
         logging.info(f"50-a: loaded {page.url}")
         search_input = page.query_selector("#q")
         if not search_input:
             logging.warning("50-a: search input '#q' not found")
-            return
+            return False
         search_input.fill(officer_name)
         search_input.press("Enter")
-        page.wait_for_selector(".officer.active", timeout=7000)
+        waits.wait_ready(page, "fiftya_results")
     except TimeoutError:
         logging.warning(f"50-a: timeout or no search results for '{officer_name}'")
-        return []
+        return False
 
     officers = page.query_selector_all(".officer.active")
     logging.info(f"50-a: {len(officers)} search results for '{officer_name}'")
-    target_officer = None
+    candidates = []
     for officer_idx, o in enumerate(officers, start=1):
         name_el = o.query_selector("a.name")
         if not name_el:
@@ -668,23 +1219,17 @@ def enrich_with_50a(page, record, is_rescrape=False):
         name_text = name_el.inner_text().strip()
         candidate_row_first, candidate_row_last = _split_candidate_name(name_text)
         logging.info(f"50-a: candidate#{officer_idx} '{name_text}' -> First='{candidate_row_first}' Last='{candidate_row_last}'")
-        if _norm(candidate_row_first) == _norm(first) and _norm(candidate_row_last) == _norm(last):
-            target_officer = o
-            logging.info(f"50-a: exact match found on candidate#{officer_idx} '{name_text}'")
-            break
+        candidates.append(((o, name_text), Identity(candidate_row_first, candidate_row_last, _extract_initial(name_text))))
 
-    if not target_officer:
-        logging.warning(f"50-a: no exact name match found for '{officer_name}'. Trying partial-last fallback.")
-        for officer_idx, o in enumerate(officers, start=1):
-            name_el = o.query_selector("a.name")
-            if not name_el:
-                continue
-            name_text = name_el.inner_text().strip()
-            candidate_row_first, candidate_row_last = _split_candidate_name(name_text)
-            if _norm(candidate_row_first) == _norm(first) and _norm(candidate_row_last).endswith(_norm(last)):
-                target_officer = o
-                logging.info(f"50-a: fallback partial match found on candidate#{officer_idx} '{name_text}'")
-                break
+    # Search rows only carry names; badge/tax id are checked on the profile itself
+    query = Identity(first, last, record.get("Initial", ""))
+    target_officer = None
+    match, confidence = identity.best_match(query, candidates, identity.MATCH_THRESHOLD)
+    if match:
+        target_officer, name_text = match
+        logging.info(f"50-a: matched candidate '{name_text}' (confidence {confidence:.2f})")
+    elif candidates:
+        logging.warning(f"50-a: best candidate for '{officer_name}' scored {confidence:.2f}, below {identity.MATCH_THRESHOLD}")
 
     if not target_officer:
         logging.warning(f"50-a: still no match for '{officer_name}'.")
@@ -696,271 +1241,207 @@ def enrich_with_50a(page, record, is_rescrape=False):
             for field in ["race", "gender", "tax_id", "email"]:
                 if not record.get(field):
                     record[field] = "NOT_FOUND"
-        return []
+        return False
 
     try:
         target_officer.query_selector("a.name").click()
-        page.wait_for_selector("div.identity", timeout=7000)
+        waits.wait_ready(page, "fiftya_profile")
         logging.info("50-a: officer profile loaded")
     except TimeoutError:
         logging.warning("50-a: officer profile did not load in time after click")
-        return []
+        return False
+    return True
 
-    identity = page.query_selector("div.identity")
-    if not identity:
-        logging.warning("50-a: 'div.identity' not found on profile")
-        return []
+def _known_profile_url(record, cache_entry=None):
+    """
+    Return a previously seen 50-a profile URL for this officer, if any.
+
+    Sources, in order: the record itself (enrich mode DB), a stale cache
+    entry, and the Profile URL column of earlier monthly CSVs.
+    """
+    if _fiftya_officer_id(record.get("profile_url")):
+        return record["profile_url"]
+    if cache_entry is not None:
+        cached_url = cache_entry.value.get("fields", {}).get("profile_url")
+        if _fiftya_officer_id(cached_url):
+            return cached_url
+    return _known_profile_urls.get(_fiftya_name_key(record.get("First"), record.get("Last")))
+
+def _profile_matches(url, page_text, identity_text, last, badge=None):
+    """
+    Check that a stored profile still belongs to the officer: last name present
+    in the page title or identity block, and badge unchanged when both sides have one.
+    """
+    if _norm(last) not in _norm(page_text):
+        logging.warning(f"50-a: identity mismatch at {url} (expected last name '{last}')")
+        return False
+    if badge and badge not in ("N/A", "NOT_FOUND"):
+        m = BADGE_RE.search(identity_text)
+        if m and m.group(1) != str(badge):
+            logging.warning(f"50-a: identity mismatch at {url} (badge {m.group(1)} != {badge})")
+            return False
+    return True
+
+def _fetch_profile_snapshot_http(url, first, last, badge=None):
+    """
+    Fetch a known profile with plain HTTP and parse it offline (--fiftya-engine http).
+
+    Returns:
+        Snapshot dict, or None if the page is not server-rendered, not found
+        or belongs to someone else (the caller then uses the browser)
+    """
+    try:
+        html = fetch_profile_html(url)
+    except Exception as e:
+        logging.warning(f"50-a: HTTP fetch failed for {url}: {e}")
+        return None
+    snapshot = snapshot_from_html(html, url)
+    if snapshot is None:
+        logging.info(f"50-a: no div.identity in HTTP response for {url} (not server-rendered?), using browser")
+        return None
+    page_text = f"{snapshot.get('title', '')} {snapshot['identity_text']}"
+    if not _profile_matches(url, page_text, snapshot["identity_text"], last, badge):
+        return None
+    logging.info(f"50-a: parsed stored profile over HTTP for '{first} {last}': {url}")
+    return snapshot
 
-    identity_text = identity.inner_text().strip()
+def _open_known_profile(page, url, first, last, badge=None):
+    """
+    Navigate straight to a stored /officer/<id> URL, skipping the search.
 
-    # Extract profile URL (page URL on 50-a.org)
-    profile_url = None
+    The profile is accepted only if it loads (no 404) and still belongs to the
+    officer: last name present in the page title or identity block, and badge
+    unchanged when both sides have one.
+
+    Returns:
+        True if the profile page is loaded and verified
+    """
     try:
-        # Get current page URL after clicking into officer profile
-        current_url = page.url
-        if current_url and '/officer/' in current_url:
-            profile_url = current_url
-            logging.info(f"50-a: Profile URL captured: {profile_url}")
+        response = waits.navigate(page, url, "fiftya_profile")
+        if response is not None and response.status == 404:
+            logging.warning(f"50-a: stored profile URL returned 404: {url}")
+            return False
+        identity = page.query_selector("div.identity")
+        identity_text = identity.inner_text() if identity else ""
+        page_text = f"{page.title()} {identity_text}"
+    except TimeoutError:
+        logging.warning(f"50-a: stored profile URL did not load in time: {url}")
+        return False
     except Exception as e:
-        logging.warning(f"50-a: Failed to capture profile URL: {e}")
-    record["profile_url"] = profile_url
-
-    # Extract officer image URL if available
-    officer_image = None
-    image_link = identity.query_selector("a.is-pulled-right.ml-1.is-hidden-mobile")
-    if image_link:
-        href = image_link.get_attribute("href")
-        if href:
-            # Convert relative URL to absolute URL
-            if href.startswith("http"):
-                officer_image = href
-            else:
-                officer_image = SITES["FIFTYA"].rstrip("/") + href
-            logging.info(f"50-a: Officer image found: {officer_image}")
-    record["officer_image"] = officer_image
-
-    # Extract Race and Gender (e.g., "Badge #4748, White Male")
-    race = None
-    gender = None
-    race_gender_match = re.search(r'Badge\s*#?\d+,\s*([A-Za-z\s]+?)\s+(Male|Female)', identity_text, re.I)
-    if race_gender_match:
-        race = race_gender_match.group(1).strip()
-        gender = race_gender_match.group(2).strip()
-        logging.info(f"50-a: {race} {gender}")
-    record["race"] = race
-    record["gender"] = gender
-
-    # Extract Email
-    email = None
-    email_match = re.search(r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', identity_text)
-    if email_match:
-        email = email_match.group(1)
-        logging.info(f"50-a: Email: {email}")
-    record["email"] = email
-
-    # Extract Tax ID (e.g., "Tax #965911")
-    tax_id = None
-    tax_match = re.search(r'Tax\s*#?\s*(\d+)', identity_text, re.I)
-    if tax_match:
-        tax_id = tax_match.group(1)
-        logging.info(f"50-a: Tax: #{tax_id}")
-    record["tax_id"] = tax_id
-
-    badge = None
-    badge_selectors = ["span.badge", ".badge", "span.badge-number", "div.badge"]
-    for sel in badge_selectors:
-        el = identity.query_selector(sel)
-        if el:
-            txt = el.inner_text().strip()
-            m = re.search(r'(\d+)', txt)
-            if m:
-                badge = m.group(1)
-                logging.info(f"50-a: badge extracted via selector '{sel}': {badge}")
-                break
-    if not badge:
-        m = re.search(r'Badge\s*#?\s*([0-9]+)', identity_text, re.I)
-        if m:
-            badge = m.group(1)
-            logging.info(f"50-a: Badge: #{badge}")
-    else:
-        logging.info(f"50-a: Badge: #{badge}")
-    record["badge"] = badge
+        logging.warning(f"50-a: failed to open stored profile URL {url}: {e}")
+        return False
 
-    # Extract Precinct Description and parse into three fields
-    precinct_desc_raw = None
-    precinct_link = None
-    precinct_number = None
+    if not _profile_matches(url, page_text, identity_text, last, badge):
+        return False
+    logging.info(f"50-a: opened stored profile directly for '{first} {last}': {url}")
+    return True
+
+# === FIFTYA Enrichment ===
+def enrich_with_50a(page, record, is_rescrape=False):
+    """
+    Enrich record with data from 50-a.org
     
-    # Try to get full precinct description from identity text
-    precinct_desc_match = re.search(r'(Police Officer|Detective|Sergeant|Lieutenant|Captain)\s+at\s+(.+?)(?:Service started|$)', identity_text, re.I | re.DOTALL)
-    if precinct_desc_match:
-        precinct_desc_raw = precinct_desc_match.group(2).strip()
-        # Clean up newlines and extra whitespace
-        precinct_desc_raw = re.sub(r'\s+', ' ', precinct_desc_raw).strip()
-        logging.info(f"50-a: Raw precinct desc: {precinct_desc_raw}")
+    Args:
+        page: Playwright page object
+        record: Officer record dictionary
+        is_rescrape: If True, apply status codes (NOT_FOUND, UNVERIFIED) for missing data
+                     If False (first run), leave fields as NULL
     
-    # Parse precinct description into three components
-    current_assignment, assignment_start, previous_assignments = _parse_precinct_desc(precinct_desc_raw)
-    record["current_assignment"] = current_assignment
-    record["assignment_start"] = assignment_start
-    record["previous_assignments"] = previous_assignments
+    Returns:
+        List of article dictionaries extracted from officer's news section
+    """
+    # Fields that 50-a enrichment populates
+    FIFTYA_FIELDS = ["race", "gender", "tax_id", "email", "badge", 
+                     "current_assignment", "assignment_start", "previous_assignments",
+                     "precinct_link", "precinct_number", "service_start", "last_earned"]
     
-    logging.info(f"50-a: Current Assignment: '{current_assignment}' | Start: '{assignment_start}' | Previous: '{previous_assignments}'")
-
+    # Check if this is enrich mode with targeted columns
+    enrich_columns = record.get("enrich_columns", [])
+    if enrich_columns:
+        # Only scrape fields that are in the target list
+        FIFTYA_FIELDS = [f for f in FIFTYA_FIELDS if f in enrich_columns]
+        logging.info(f"50-a: ENRICH MODE - targeting {len(FIFTYA_FIELDS)} fields: {FIFTYA_FIELDS}")
+    
+    officer_name = record.get("Name")
+    first = record.get("First")
+    last = record.get("Last")
+    if not officer_name or not first or not last:
+        logging.warning("50-a: Missing Name/First/Last; skipping enrichment")
+        return []
 
-    anchor_selectors = ["div.command a.command", "a[href*='precinct']", "a[href*='pct']", "a[href*='precincts']", "a"]
-    for sel in anchor_selectors:
-        el = identity.query_selector(sel)
-        if el:
-            href = el.get_attribute("href") if el.get_attribute else None
-            if href:
-                if href.startswith("http"):
-                    precinct_link = href
-                else:
-                    precinct_link = SITES["FIFTYA"].rstrip("/") + "/" + href.lstrip("/")
-                m_num = re.search(r'(\d{1,3})', href)
-                if m_num:
-                    precinct_number = int(m_num.group(1))
-                else:
-                    m_str = re.search(r'/([A-Za-z0-9\-]+)$', href)
-                    if m_str:
-                        precinct_number = m_str.group(1)
-                break
+    name_key = _fiftya_name_key(first, last)
+    cache_entry = None
+    if _fiftya_cache is not None:
+        # The officer id (enrich mode, rescrapes) names the profile exactly; the name alias is a guess
+        officer_id = _fiftya_officer_id(record.get("profile_url"))
+        if officer_id:
+            cache_entry = _fiftya_cache.lookup(key=f"officer:{officer_id}")
+        if cache_entry is None:
+            cache_entry = _fiftya_cache.lookup(alias=name_key)
+            if cache_entry and _cached_badge_conflicts(record, cache_entry.value):
+                logging.info(f"50-a: cached profile for '{officer_name}' ({cache_entry.key}) has badge {cache_entry.value['fields'].get('badge')}, record has {record.get('badge')} - treating as a miss")
+                cache_entry = None
+        # Counted only now, so a rejected alias hit is a miss in the reported hit rate
+        _fiftya_cache.tally(cache_entry)
+        if cache_entry and cache_entry.fresh:
+            logging.info(f"50-a: cache hit for '{officer_name}' ({cache_entry.key}, {cache_entry.age_days:.1f} days old)")
+            return _apply_cached_50a(record, cache_entry.value, is_rescrape)
+        if cache_entry:
+            logging.info(f"50-a: cached profile for '{officer_name}' is stale ({cache_entry.age_days:.1f} days old), refreshing")
+
+    if not _take_budget(record, "50-a"):
+        return []
 
-    if not precinct_link:
-        m = re.search(r'Precinct\s+(\d{1,3})', identity_text, re.I)
-        if m:
-            precinct_number = int(m.group(1))
-            logging.info(f"50-a: precinct number extracted from text: {precinct_number}")
-    record["precinct_link"] = precinct_link
-    record["precinct_number"] = precinct_number
-
-    service_start = None
-    m = re.search(r"Service\s+started\s+([A-Za-z]+)\s+(\d{4})", identity_text, re.I)
-    if m:
-        month_str, year = m.groups()
+    snapshot = None
+    known_url = _known_profile_url(record, cache_entry) if args.direct_profile else None
+    # Only page loads take a throttle slot; cache hits above never wait for one
+    if known_url and args.fiftya_engine == "http":
+        with throttle.slot(SITES["FIFTYA"]):
+            snapshot = _fetch_profile_snapshot_http(known_url, first, last, record.get("badge"))
+
+    if snapshot is None:
+        profile_loaded = False
+        if known_url:
+            with throttle.slot(SITES["FIFTYA"]):
+                profile_loaded = _open_known_profile(page, known_url, first, last, record.get("badge"))
+            if not profile_loaded:
+                logging.info(f"50-a: falling back to search for '{officer_name}'")
+        if not profile_loaded:
+            with throttle.slot(SITES["FIFTYA"]):
+                profile_loaded = _search_and_open_profile(page, record, officer_name, first, last, is_rescrape)
+        if not profile_loaded:
+            return []
+
+        # One round trip: serialize every field we read from the profile, then parse in Python
         try:
-            month = datetime.strptime(month_str[:3], "%b").month
-            service_start = f"{month:02}/01/{year}"
-            logging.info(f"50-a: Started {month_str} {year}")
-        except Exception:
-            service_start = None
-    else:
-        m2 = re.search(r"Started\s+([A-Za-z]+)\s+(\d{4})", identity_text, re.I)
-        if m2:
-            month_str, year = m2.groups()
-            try:
-                month = datetime.strptime(month_str[:3], "%b").month
-                service_start = f"{month:02}/01/{year}"
-                logging.info(f"50-a: Started {month_str} {year}")
-            except Exception:
-                service_start = None
-    record["service_start"] = service_start
-
-    last_earned = None
-    comp_elem = identity.query_selector("span.compensation")
-    if comp_elem:
-        comp_text = comp_elem.inner_text().strip()
-        m = re.search(r'\$[\d,]+(?:\.\d+)?', comp_text)
-        if m:
-            last_earned = m.group(0)
-            logging.info(f"50-a: Made {last_earned} last year")
-        else:
-            last_earned = comp_text
-            logging.info(f"50-a: Made {last_earned} last year")
-    else:
-        m = re.search(r'made\s*\$([\d,]+(?:\.\d+)?)', identity_text, re.I)
-        if m:
-            last_earned = f"${m.group(1)}"
-            logging.info(f"50-a: Made {last_earned} last year")
-    record["last_earned"] = last_earned
-
-    discipline = identity.query_selector("div.discipline")
-    record["has_discipline"] = "Y" if discipline and discipline.query_selector("article.message") else "N"
-    news = identity.query_selector("div.news")
-    record["has_articles"] = "Y" if news and news.query_selector_all("a[href^='http']") else "N"
-
-    # Extract articles from div.news if present
-    articles = []
-    if news:
-        # 50-a.org structure: <a href="url">Title</a>, Source, Date<br>
-        # Extract all anchor tags directly (exclude the header anchor #articles)
-        news_items = news.query_selector_all("a[href^='http']")
-        
-        logging.info(f"50-a: Found {len(news_items)} potential news items for '{officer_name}'")
-        
-        for item in news_items:
-            article_data = _parse_article_html(item)
-            if article_data:
-                # Link article to officer
-                article_data["badge"] = record.get("badge", "")
-                article_data["first_name"] = record.get("First", "")
-                article_data["last_name"] = record.get("Last", "")
-                articles.append(article_data)
-                logging.info(f"50-a: Extracted article '{article_data['title']}' for '{officer_name}'")
-
-    # Log substantiated allegations if present
-    substantiated_div = page.query_selector("div.substantiated")
-    if substantiated_div:
-        allegations = []
-        for item in substantiated_div.query_selector_all("li"):
-            allegations.append(item.inner_text().strip())
-        if allegations:
-            allegations_str = ", ".join(allegations)
-            logging.info(f"50-a: Substantiated Allegations: {allegations_str}")
-
-    logging.info(f"50-a: has_discipline={record['has_discipline']} has_articles={record['has_articles']}")
-
-    summary = page.query_selector("div.container.summary")
-    if summary:
-        mapping = {
-            "Complaints": "num_complaints",
-            "Allegations": "num_allegations",
-            "Substantiated": "num_substantiated",
-            "Substantiated (Charges)": "num_substantiated_charges",
-            "Unsubstantiated": "num_unsubstantiated",
-            "Within NYPD Guidelines": "num_within_guidelines"
-        }
-        for div in summary.query_selector_all("div.column div"):
-            label_elem = div.query_selector("span.name")
-            count_elem = div.query_selector("span.count")
-            if label_elem and count_elem:
-                label = label_elem.inner_text().strip()
-                count_text = count_elem.inner_text().strip()
-                try:
-                    count = int(count_text)
-                except Exception:
-                    continue
-                if label in mapping:
-                    record[mapping[label]] = count
-                    logging.info(f"50-a: summary '{label}' -> {count}")
-
-    lawsuits = page.query_selector("div.lawsuits-details")
-    if lawsuits:
-        text = lawsuits.inner_text()
-        m = re.search(r"Named in (\d+) known lawsuits", text)
-        record["num_lawsuits"] = int(m.group(1)) if m else 0
-        m2 = re.search(r"\$(\d[\d,]*) total settlements", text)
-        if m2:
-            settlement_value = int(m2.group(1).replace(",", ""))
-            record["total_settlements"] = f"${settlement_value:,}"
-        else:
-            record["total_settlements"] = 0
-        logging.info(f"50-a: lawsuits={record.get('num_lawsuits')} settlements={record.get('total_settlements')}")
+            snapshot = page.evaluate(PROFILE_SNAPSHOT_JS, SNAPSHOT_ARGS)
+        except Exception as e:
+            logging.warning(f"50-a: profile snapshot failed for '{officer_name}': {e}")
+            return []
+        if not snapshot:
+            logging.warning("50-a: 'div.identity' not found on profile")
+            return []
+
+    fields, articles = parse_profile_snapshot(snapshot, SITES["FIFTYA"])
+    record.update(fields)
+    for article_data in articles:
+        # Link article to officer
+        article_data["badge"] = record.get("badge", "")
+        article_data["first_name"] = record.get("First", "")
+        article_data["last_name"] = record.get("Last", "")
+        logging.info(f"50-a: Extracted article '{article_data['title']}' for '{officer_name}'")
 
     # Mark successful enrichment
     record["enrichment_status_50a"] = "FOUND"
-    
+
+    # Cache the parsed profile before any rescrape status codes are applied
+    _store_50a_cache(record, articles, name_key)
+
     # Set UNVERIFIED status for fields that should have data but extraction failed
     # Only apply during rescrape (Phase 2) - on first run, fields remain NULL
     if is_rescrape:
-        if not record.get("race"):
-            record["race"] = "UNVERIFIED"
-            logging.info(f"50-a: race field set to UNVERIFIED (extraction failed)")
-        if not record.get("gender"):
-            record["gender"] = "UNVERIFIED"
-            logging.info(f"50-a: gender field set to UNVERIFIED (extraction failed)")
-    
+        _mark_50a_unverified(record)
+
     logging.info(f"50-a: enrichment complete for '{officer_name}' (badge={record.get('badge')}, pct={record.get('precinct_number')}, started={record.get('service_start')}, last_earned={record.get('last_earned')})")
     return articles
 
@@ -999,12 +1480,26 @@ def enrich_with_payroll(page, record, is_rescrape=False):
 
     # Check cache first - reuse successful payroll data for duplicate officers
     cache_key = (first.lower(), last.lower(), record.get("service_start", ""))
-    if cache_key in _payroll_cache:
-        cached_data = _payroll_cache[cache_key]
+    cached_data = _payroll_cache_get(cache_key)
+    if cached_data is not None:
         record.update(cached_data)
         logging.info(f"Payroll: reused cached data for '{first} {last}' (service_start={record.get('service_start')})")
         return
 
+    # Local snapshot first; live lookup only when it has no match
+    if _payroll_snapshot is not None:
+        if _enrich_payroll_from_snapshot(record, first, last, cache_key, is_rescrape):
+            return
+        logging.info(f"Payroll: no snapshot match for '{first} {last}', falling back to live lookup")
+
+    if _payroll_api_index is not None:
+        if not _enrich_payroll_from_api(record, first, last, cache_key, is_rescrape):
+            _mark_payroll_not_found(record, f"{first} {last}", is_rescrape)
+        return
+
+    if not _take_budget(record, "payroll"):
+        return
+
     # Include middle initial in the payroll query when available to improve matching
     initial = record.get("Initial", "")
     if initial:
@@ -1018,9 +1513,7 @@ def enrich_with_payroll(page, record, is_rescrape=False):
     max_attempts = 3
     attempt = 0
     chosen = None
-    current_year = datetime.now().year
-    priority_year = str(current_year - 1)
-    fallback_year = str(current_year - 2)
+    priority_year, fallback_year = _payroll_years()
     logging.info(f"Payroll: targeting {priority_year} first, then {fallback_year}")
 
     service_start_dt = _parse_mm01yyyy(record.get("service_start", ""))
@@ -1037,126 +1530,75 @@ def enrich_with_payroll(page, record, is_rescrape=False):
         if attempt > 1:
             wait_time = int(2000 * (1.5 ** (attempt - 2)))
             logging.info(f"Payroll: waiting {wait_time}ms before attempt {attempt} for '{query}'")
-            page.wait_for_timeout(wait_time)
+            waits.sleep(page, wait_time)
         
         logging.info(f"Payroll: attempt {attempt}/{max_attempts} for '{query}'")
         try:
             # Do a full re-entry each attempt: navigate to the payroll site and submit the search
-            try:
-                page.goto(SITES["PAYROLL"], wait_until="networkidle")
-                logging.info(f"Payroll: navigated to payroll site for attempt {attempt} for '{query}'")
-                # find the search input and run the query
-                search_input = page.query_selector("input#search-view")
-                if not search_input:
-                    logging.warning(f"Payroll: search input not found on attempt {attempt} for '{query}' - will retry")
-                    # small wait before next attempt to avoid tight loop
-                    page.wait_for_timeout(500)
-                    continue
-                search_input.fill(query)
-                search_input.press("Enter")
-                page.wait_for_selector("table tbody tr", timeout=7000)
-                logging.info(f"Payroll: search submitted on attempt {attempt} for '{query}'")
-
-                # Quick verification: ensure the search input took and results are relevant.
+            # (only the live page load holds a throttle slot; snapshot/API/cache lookups above do not)
+            with throttle.slot(SITES["PAYROLL"]):
                 try:
-                    applied_val = ""
+                    waits.navigate(page, SITES["PAYROLL"], "payroll_search")
+                    logging.info(f"Payroll: navigated to payroll site for attempt {attempt} for '{query}'")
+                    # find the search input and run the query
+                    search_input = page.query_selector("input#search-view")
+                    if not search_input:
+                        logging.warning(f"Payroll: search input not found on attempt {attempt} for '{query}' - will retry")
+                        # small wait before next attempt to avoid tight loop
+                        waits.sleep(page, 500)
+                        continue
+                    search_input.fill(query)
+                    search_input.press("Enter")
+                    waits.wait_ready(page, "payroll_results")
+                    logging.info(f"Payroll: search submitted on attempt {attempt} for '{query}'")
+
+                    # Quick verification: ensure the search input took and results are relevant.
                     try:
-                        applied_val = search_input.input_value()
-                    except Exception:
-                        applied_val = search_input.get_attribute("value") if hasattr(search_input, 'get_attribute') else ""
-
-                    norm_applied = _norm(applied_val or "")
-                    norm_last = _norm(last)
-                    norm_first = _norm(first)
-
-                    # Check the first few rows for the target name; if none match and the input value
-                    # doesn't contain the name, treat as a failed search and retry.
-                    preliminary_rows = page.query_selector_all("table tbody tr")[:5]
-                    found_in_rows = False
-                    for pr in preliminary_rows:
+                        applied_val = ""
                         try:
-                            row_text = " ".join([c.inner_text().strip() for c in pr.query_selector_all("td")])
+                            applied_val = search_input.input_value()
                         except Exception:
-                            row_text = pr.inner_text().strip()
-                        if (norm_last and norm_last in _norm(row_text)) or (norm_first and norm_first in _norm(row_text)):
-                            found_in_rows = True
-                            break
-
-                    if not found_in_rows and norm_last and norm_last not in norm_applied and norm_first and norm_first not in norm_applied:
-                        logging.warning(f"Payroll: search input did not apply for '{query}' on attempt {attempt} (input='{applied_val}'); will retry")
-                        page.wait_for_timeout(500)
-                        continue
+                            applied_val = search_input.get_attribute("value") if hasattr(search_input, 'get_attribute') else ""
+
+                        norm_applied = _norm(applied_val or "")
+                        norm_last = _norm(last)
+                        norm_first = _norm(first)
+
+                        # Check the first few rows for the target name; if none match and the input value
+                        # doesn't contain the name, treat as a failed search and retry.
+                        preliminary_rows = page.query_selector_all("table tbody tr")[:5]
+                        found_in_rows = False
+                        for pr in preliminary_rows:
+                            try:
+                                row_text = " ".join([c.inner_text().strip() for c in pr.query_selector_all("td")])
+                            except Exception:
+                                row_text = pr.inner_text().strip()
+                            if (norm_last and norm_last in _norm(row_text)) or (norm_first and norm_first in _norm(row_text)):
+                                found_in_rows = True
+                                break
+
+                        if not found_in_rows and norm_last and norm_last not in norm_applied and norm_first and norm_first not in norm_applied:
+                            logging.warning(f"Payroll: search input did not apply for '{query}' on attempt {attempt} (input='{applied_val}'); will retry")
+                            waits.sleep(page, 500)
+                            continue
+                    except Exception as e:
+                        logging.debug(f"Payroll: verification check failed on attempt {attempt} for '{query}': {e}")
+                except TimeoutError:
+                    logging.warning(f"Payroll: navigation/search timed out on attempt {attempt} for '{query}'")
+                    continue
                 except Exception as e:
-                    logging.debug(f"Payroll: verification check failed on attempt {attempt} for '{query}': {e}")
-            except TimeoutError:
-                logging.warning(f"Payroll: navigation/search timed out on attempt {attempt} for '{query}'")
-                continue
-            except Exception as e:
-                logging.info(f"Payroll: navigation/search encountered error on attempt {attempt} for '{query}': {e}")
-                continue
+                    logging.info(f"Payroll: navigation/search encountered error on attempt {attempt} for '{query}': {e}")
+                    continue
 
             # Re-query rows from the DOM each attempt
-            rows = page.query_selector_all("table tbody tr")
-            logging.info(f"Payroll: found {len(rows)} table rows for '{query}' on attempt {attempt}")
+            rows = _read_payroll_rows(page, max_rows_per_attempt, f"attempt {attempt}")
+            logging.info(f"Payroll: found {len(rows)} payroll rows for '{query}' on attempt {attempt}")
             if not rows:
                 logging.warning(f"Payroll: no rows returned for '{query}' on attempt {attempt}")
                 continue
-
-            for row_idx, row in enumerate(rows, start=1):
-                if row_idx > max_rows_per_attempt:
-                    logging.info(f"Payroll: reached {max_rows_per_attempt} rows on attempt {attempt}, stopping scan for this attempt")
-                    break
-
-                cells = [c.inner_text().strip() for c in row.query_selector_all("td")]
-                if not cells or len(cells) < 17:
-                    logging.debug(f"Payroll: skipping row #{row_idx} on attempt {attempt} (insufficient cells)")
-                    continue
-
-                year = cells[0]
-                last_name = cells[3]
-                first_name = cells[4]
-                agency_start_date = cells[6]
-
-                logging.info(
-                    f"Payroll: attempt {attempt} row#{row_idx} -> year={year}, first='{first_name}', "
-                    f"last='{last_name}', agency_start='{agency_start_date}'"
-                )
-
-                # Only consider priority and fallback years
-                if year not in (priority_year, fallback_year):
-                    continue
-
-                if not _match_last_name(last, last_name):
-                    logging.debug(f"Payroll: attempt {attempt} row#{row_idx} last-name mismatch (candidate '{first_name} {last_name}')")
-                    continue
-
-                # Immediate accept for priority year
-                if year == priority_year:
-                    chosen = (cells, None)
-                    logging.info(f"Payroll: attempt {attempt} row#{row_idx} is {year}, chosen immediately")
-                    break
-
-                # Fallback year: use tie-breaker by service_start delta
-                if year == fallback_year:
-                    delta_days = None
-                    if service_start_dt:
-                        asd = _parse_mmddyyyy(agency_start_date)
-                        if asd:
-                            delta_days = abs((asd - service_start_dt).days)
-                            logging.info(f"Payroll: attempt {attempt} row#{row_idx} matched {fallback_year}; agency_start delta_days={delta_days}")
-
-                    if not chosen:
-                        chosen = (cells, delta_days)
-                        logging.info(f"Payroll: attempt {attempt} row#{row_idx} tentatively chosen as fallback")
-                    else:
-                        _, current_delta = chosen
-                        if delta_days is not None and (current_delta is None or delta_days < current_delta):
-                            chosen = (cells, delta_days)
-                            logging.info(
-                                f"Payroll: attempt {attempt} row#{row_idx} replaces previous fallback (smaller delta {delta_days} < {current_delta})"
-                            )
-
-            # end for rows
+            # Same first-name gate and ranking as the snapshot/API paths
+            chosen = _select_payroll_row(_rank_payroll_rows(record, first, last, rows), last,
+                                         priority_year, fallback_year, service_start_dt)
         except TimeoutError:
             logging.warning(f"Payroll: attempt {attempt} timed out for '{query}'")
         except Exception as e:
@@ -1164,263 +1606,651 @@ def enrich_with_payroll(page, record, is_rescrape=False):
 
     # end while attempts
 
+    if not chosen:
+        logging.warning(f"Payroll: no suitable payroll match found for '{query}' — will attempt one refresh-and-retry")
+        # Try one safe refresh and retry in case the site returned inconsistent results
+        try:
+            # The reload, fallback navigation and re-submit are live page loads: hold a slot
+            with throttle.slot(SITES["PAYROLL"]):
+                waits.reload(page, "payroll_search")
+                logging.info(f"Payroll: page reloaded for retry for '{query}'")
+                # Re-run the search input fill/press sequence
+                search_input = page.query_selector("input#search-view")
+                if not search_input:
+                    logging.info(f"Payroll: search input not found after reload for '{query}' — will navigate and attempt full submit")
+                    try:
+                        waits.navigate(page, SITES["PAYROLL"], "payroll_search")
+                        logging.info(f"Payroll: navigated to payroll site for final retry for '{query}'")
+                        search_input = page.query_selector("input#search-view")
+                    except Exception as e:
+                        logging.warning(f"Payroll: navigation failed during final retry for '{query}': {e}")
+
+                if search_input:
+                    logging.info(f"Payroll: re-submitting search on final retry for '{query}'")
+                    try:
+                        search_input.fill(query)
+                        search_input.press("Enter")
+                        waits.wait_ready(page, "payroll_results")
+                    except TimeoutError:
+                        logging.warning(f"Payroll: final retry search timed out for '{query}'")
+            # collect rows after attempting to re-submit (or just reading what's on the page)
+            rows = _read_payroll_rows(page, 25, "retry")
+            logging.info(f"Payroll: retry found {len(rows)} payroll rows for '{query}'")
+            # Same selection as the attempts above
+            chosen = _select_payroll_row(_rank_payroll_rows(record, first, last, rows), last,
+                                         priority_year, fallback_year, service_start_dt)
+        except TimeoutError:
+            logging.warning(f"Payroll: retry timed out for '{query}'")
+        except Exception as e:
+            logging.warning(f"Payroll: retry encountered error for '{query}': {e}")
+
     if chosen:
-        cells, _ = chosen
         try:
-            payroll_data = {
-                "leave_status_as_of_june_30": cells[9],
-                "base_salary": cells[10],
-                "pay_basis": cells[11],
-                "regular_hours": cells[12],
-                "regular_gross_paid": cells[13],
-                "ot_hours": cells[14],
-                "total_ot_paid": cells[15],
-                "total_other_pay": cells[16],
-            }
-            record.update(payroll_data)
-            record["Last Earned"] = payroll_data["regular_gross_paid"]
-            
-            # Cache successful payroll data
-            _payroll_cache[cache_key] = payroll_data.copy()
-            
-            # Mark successful enrichment
-            record["enrichment_status_payroll"] = "FOUND"
-            
-            # Set UNVERIFIED status for payroll fields that should have data but are missing
-            # Only during rescrape (Phase 2) - on first run, fields remain NULL
-            if is_rescrape:
-                if not record.get("base_salary"):
-                    record["base_salary"] = "UNVERIFIED"
-                    logging.info(f"Payroll: base_salary field set to UNVERIFIED (extraction failed)")
-                if not record.get("pay_basis"):
-                    record["pay_basis"] = "UNVERIFIED"
-                    logging.info(f"Payroll: pay_basis field set to UNVERIFIED (extraction failed)")
-            
+            _apply_payroll_cells(record, chosen, cache_key, is_rescrape)
             logging.info(
-                f"Payroll: chosen row year={cells[0]} agency_start={cells[6]} status={cells[9]} "
+                f"Payroll: chosen row year={chosen[0]} agency_start={chosen[6]} status={chosen[9]} "
                 f"- payroll fields updated and cached"
             )
         except Exception as e:
             logging.warning(f"Payroll: failed to parse chosen row for '{query}': {e}")
-    else:
-        logging.warning(f"Payroll: no suitable payroll match found for '{query}' — will attempt one refresh-and-retry")
-        # Try one safe refresh and retry in case the site returned inconsistent results
-        try:
-            page.reload(wait_until="networkidle")
-            logging.info(f"Payroll: page reloaded for retry for '{query}'")
-            # Small wait to allow dynamic content to settle
-            page.wait_for_timeout(1000)
-            # Re-run the search input fill/press sequence
-            search_input = page.query_selector("input#search-view")
-            if not search_input:
-                logging.info(f"Payroll: search input not found after reload for '{query}' — will navigate and attempt full submit")
-                try:
-                    page.goto(SITES["PAYROLL"], wait_until="networkidle")
-                    logging.info(f"Payroll: navigated to payroll site for final retry for '{query}'")
-                    page.wait_for_timeout(500)
-                    search_input = page.query_selector("input#search-view")
-                except Exception as e:
-                    logging.warning(f"Payroll: navigation failed during final retry for '{query}': {e}")
 
-            if search_input:
-                logging.info(f"Payroll: re-submitting search on final retry for '{query}'")
-                try:
-                    search_input.fill(query)
-                    search_input.press("Enter")
-                    page.wait_for_selector("table tbody tr", timeout=7000)
-                except TimeoutError:
-                    logging.warning(f"Payroll: final retry search timed out for '{query}'")
-            # collect rows after attempting to re-submit (or just reading what's on the page)
-            rows = page.query_selector_all("table tbody tr")
-            logging.info(f"Payroll: retry found {len(rows)} rows for '{query}'")
-            # Only attempt to find a match using the exact same logic as above
-            for row_idx, row in enumerate(rows, start=1):
-                if row_idx > 25:
+    # If payroll data still not found, set status codes for payroll fields
+    _mark_payroll_not_found(record, query, is_rescrape)
+
+
+# === Worker Pool ===
+def _new_browser_context(browser):
+    """
+    Create a browser context for a scraping page with the run's resource
+    policy (--resource-policy) installed.
+
+    Args:
+        browser: Playwright browser instance
+
+    Returns:
+        New browser context
+    """
+    context = browser.new_context()
+    resource_policy.install(context, browser_policy, resource_stats)
+    return context
+
+def _run_enrich_task(page, idx, record, enrich_fn, label, kwargs):
+    """
+    Run one enrichment call (the enrichment functions take a throttle slot
+    around each page load themselves).
+
+    Completed calls are journaled; an officer already in the journal (an
+    earlier run being resumed, or a repeat officer in this run) gets the
+    journaled fields instead of a new lookup. Phases the officer registry
+    served, and enrich-mode sources the officer's columns do not need, are
+    skipped. The enrichment functions charge --budget only right before a
+    live lookup (_take_budget); once it is spent the lookup is deferred, the
+    label is added to record['enrich_deferred'] (not journaled) and its
+    columns go to the leftover delta file.
+
+    Returns:
+        Whatever enrich_fn returned, or None if it raised
+    """
+    key = _record_key(record)
+    if _journal is not None:
+        entry = _journal.completed(label, key)
+        if entry is not None:
+            logging.info(f"Main: {label} record #{idx + 1} - {record.get('Name')} restored from checkpoint")
+            record.update(entry["fields"])
+            return entry["result"]
+
+    if _enrich_plan is not None and not _enrich_plan.needs(record, label):
+        logging.debug(f"Main: {label} record #{idx + 1} - {record.get('Name')} needs no {label} columns, skipped")
+        return None
+
+    if label in _registry_served.get(key, ()):
+        # Fields were applied before enrichment; articles are already in articles.csv
+        logging.info(f"Main: {label} record #{idx + 1} - {record.get('Name')} served from the officer registry")
+        return []
+
+    logging.info(f"Main: {label} enrich record #{idx + 1} - {record.get('Name')}")
+    before = dict(record)
+    try:
+        result = enrich_fn(page, record, **kwargs)
+    except Exception as e:
+        logging.error(f"Main: {label} enrichment failed for record #{idx + 1} ({record.get('Name')}): {e}")
+        return None
+    if _journal is not None and label not in record.get('enrich_deferred', ()):
+        fields = {k: v for k, v in record.items() if k not in before or before[k] != v}
+        _journal.record(label, key, fields, result)
+    return result
+
+def _take_budget(record, label):
+    """
+    Charge one live lookup to --budget, right before it goes to the network.
+
+    Returns:
+        False once the budget is spent; the record's label is then deferred
+    """
+    if _budget is None or _budget.take():
+        return True
+    record.setdefault('enrich_deferred', []).append(label)
+    logging.debug(f"Main: {label} for {record.get('Name')} deferred ({_budget.exhausted})")
+    return False
+
+def _enrich_paced(page, idx, record, enrich_fn, label, kwargs, pause):
+    """
+    _run_enrich_task, then (with pause) the single-page loop's random jitter
+    if the officer needed a page load; cache, journal and registry hits go on
+    without waiting.
+    """
+    loads = throttle.page_loads
+    result = _run_enrich_task(page, idx, record, enrich_fn, label, kwargs)
+    if pause and throttle.page_loads > loads:
+        throttle.pause()
+    return result
+
+def _pool_worker(worker_id, jobs, results, enrich_fn, label, kwargs, pause=False, on_done=None):
+    """
+    Worker thread body: owns its own Playwright instance, browser and page
+    (the sync API cannot share pages across threads) and drains the job queue
+    until it receives a None sentinel.
+
+    pause adds the per-officer jitter (for a stage with a single worker);
+    on_done(idx, record) is called after each record, which is how one stage
+    hands records to the next in a pipeline.
+    """
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            context = _new_browser_context(browser)
+            page = context.new_page()
+            logging.info(f"Main: {label} worker {worker_id} started")
+            while True:
+                item = jobs.get()
+                if item is None:
                     break
-                cells = [c.inner_text().strip() for c in row.query_selector_all("td")]
-                if not cells or len(cells) < 17:
-                    continue
-                year = cells[0]
-                last_name = cells[3]
-                first_name = cells[4]
-                agency_start_date = cells[6]
-                if year not in (priority_year, fallback_year):
-                    continue
-                if not _match_last_name(last, last_name):
+                idx, record = item
+                results[idx] = _enrich_paced(page, idx, record, enrich_fn, label, kwargs, pause)
+                if on_done:
+                    on_done(idx, record)
+            browser.close()
+            logging.info(f"Main: {label} worker {worker_id} finished")
+    except Exception as e:
+        logging.error(f"Main: {label} worker {worker_id} crashed: {e}")
+
+def _start_workers(count, jobs, results, enrich_fn, label, kwargs, pause=False, on_done=None):
+    """
+    Start count worker threads draining jobs.
+
+    Returns:
+        List of started threads
+    """
+    if count > throttle.per_host_limit:
+        logging.warning(f"Main: {label} using {count} workers but per-host limit is {throttle.per_host_limit}; extra workers will wait")
+    threads = [
+        threading.Thread(
+            target=_pool_worker,
+            args=(worker_id, jobs, results, enrich_fn, label, kwargs, pause, on_done),
+            name=f"{label}-worker-{worker_id}",
+            daemon=True,
+        )
+        for worker_id in range(1, count + 1)
+    ]
+    for t in threads:
+        t.start()
+    return threads
+
+def run_enrichment_pool(page, records, enrich_fn, workers=1, label="50-a", pause=False, on_done=None, **kwargs):
+    """
+    Apply enrich_fn(page, record, **kwargs) to every record, optionally across
+    several browser pages at once.
+
+    With workers <= 1 the records are processed in order on the given page,
+    pausing for a random 150-600 ms after each officer that needed a page load
+    when pause is set. Otherwise each worker thread opens its own browser page
+    and the shared throttle spaces their requests; records are enriched in
+    place so the output order is unchanged, and return values are collected
+    by record index.
+
+    Args:
+        page: Playwright page used for the single-worker path
+        records: List of officer record dictionaries
+        enrich_fn: Enrichment function (enrich_with_50a, enrich_with_payroll)
+        workers: Number of concurrent browser pages
+        label: Log label for this pass
+        pause: Jitter between officers on the single-worker path
+        on_done: Optional callback(idx, record) after each record is enriched
+        **kwargs: Extra keyword arguments passed to enrich_fn
+
+    Returns:
+        List of enrich_fn results, aligned with records
+    """
+    results = [None] * len(records)
+    workers = max(1, min(workers, len(records)))
+
+    if workers == 1:
+        for idx, record in enumerate(records):
+            results[idx] = _enrich_paced(page, idx, record, enrich_fn, label, kwargs, pause)
+            if on_done:
+                on_done(idx, record)
+        return results
+
+    jobs = queue.Queue()
+    for idx, record in enumerate(records):
+        jobs.put((idx, record))
+    for _ in range(workers):
+        jobs.put(None)
+
+    logging.info(f"Main: {label} pass using {workers} concurrent workers for {len(records)} records")
+    for t in _start_workers(workers, jobs, results, enrich_fn, label, kwargs, on_done=on_done):
+        t.join()
+    return results
+
+def run_enrichment_pipeline(records, fiftya_workers=1, payroll_workers=1, is_rescrape=False, on_done=None):
+    """
+    Run the 50-a and payroll passes concurrently on separate pages.
+
+    Each officer is queued for payroll as soon as its 50-a lookup finishes, so
+    the payroll lookup can use the service_start tie-breaker while the 50-a
+    stage moves on to the next officer. Wall-clock time is roughly that of the
+    slower pass instead of the sum of both.
+
+    Args:
+        records: List of officer record dictionaries (enriched in place)
+        fiftya_workers: Number of browser pages for the 50-a stage
+        payroll_workers: Number of browser pages for the payroll stage
+        is_rescrape: Passed through to both enrichment functions
+        on_done: Optional callback(idx, record) once a record has finished both stages
+
+    Returns:
+        List of enrich_with_50a results (articles), aligned with records
+    """
+    fiftya_results = [None] * len(records)
+    payroll_results = [None] * len(records)
+    if not records:
+        return fiftya_results
+    fiftya_workers = max(1, min(fiftya_workers, len(records)))
+    payroll_workers = max(1, min(payroll_workers, len(records)))
+    kwargs = {"is_rescrape": is_rescrape}
+
+    fiftya_jobs = queue.Queue()
+    payroll_jobs = queue.Queue()
+    for idx, record in enumerate(records):
+        fiftya_jobs.put((idx, record))
+    for _ in range(fiftya_workers):
+        fiftya_jobs.put(None)
+
+    def hand_off(idx, record):
+        payroll_jobs.put((idx, record))
+
+    logging.info(f"Main: pipelined enrichment with {fiftya_workers} 50-a and {payroll_workers} payroll workers for {len(records)} records")
+    fiftya_threads = _start_workers(fiftya_workers, fiftya_jobs, fiftya_results, enrich_with_50a,
+                                    "50-a", kwargs, pause=fiftya_workers == 1, on_done=hand_off)
+    payroll_threads = _start_workers(payroll_workers, payroll_jobs, payroll_results, enrich_with_payroll,
+                                     "payroll", kwargs, on_done=on_done)
+
+    for t in fiftya_threads:
+        t.join()
+    # 50-a stage is drained; tell payroll workers no more records are coming
+    for _ in range(payroll_workers):
+        payroll_jobs.put(None)
+    for t in payroll_threads:
+        t.join()
+
+    logging.info("Main: pipelined enrichment complete")
+    return fiftya_results
+
+
+def _database():
+    """The run's connection pool (opened on first use from the PG*/DB_* environment)."""
+    global _db
+    if _db is None:
+        _db = Database(minconn=1, maxconn=2)
+        atexit.register(_db.close)
+    return _db
+
+def _enrich_record_chunks(source_ids, size=DEFAULT_ITERSIZE):
+    """
+    Build enrich-mode records from the database as it streams them.
+
+    Officers come back in source_ids order (high priority first); ids the
+    database does not know are skipped. A database error ends the run: the
+    officer names cannot come from anywhere else, and completed lookups are
+    already in the checkpoint journal for --resume.
+
+    Args:
+        source_ids: Delta source_ids in lookup order
+        size: Records per chunk (one server-side cursor round trip)
+
+    Yields:
+        Lists of up to size records
+    """
+    chunk = []
+    try:
+        with closing(_database().stream_officers(source_ids, itersize=size)) as officers:
+            for officer in officers:
+                source_id = officer['source_id']
+                if not officer['found']:
+                    logging.warning(f"ENRICH MODE: source_id {source_id} not found in database, skipping")
                     continue
-                # prefer priority year on retry as well
-                if year == priority_year:
-                    chosen = (cells, None)
-                    logging.info(f"Payroll(retry): row#{row_idx} is {year}, chosen immediately")
-                    break
-                if year == fallback_year and not chosen:
-                    chosen = (cells, None)
-                    logging.info(f"Payroll(retry): row#{row_idx} chosen as fallback")
-            if chosen:
-                cells, _ = chosen
-                try:
-                    payroll_data = {
-                        "leave_status_as_of_june_30": cells[9],
-                        "base_salary": cells[10],
-                        "pay_basis": cells[11],
-                        "regular_hours": cells[12],
-                        "regular_gross_paid": cells[13],
-                        "ot_hours": cells[14],
-                        "total_ot_paid": cells[15],
-                        "total_other_pay": cells[16],
-                    }
-                    record.update(payroll_data)
-                    record["Last Earned"] = payroll_data["regular_gross_paid"]
-                    
-                    # Cache successful retry data
-                    _payroll_cache[cache_key] = payroll_data.copy()
-                    
-                    logging.info(f"Payroll(retry): payroll fields updated from retry for '{query}' and cached")
-                except Exception as e:
-                    logging.warning(f"Payroll(retry): failed to parse chosen row for '{query}': {e}")
-        except TimeoutError:
-            logging.warning(f"Payroll: retry timed out for '{query}'")
-        except Exception as e:
-            logging.warning(f"Payroll: retry encountered error for '{query}': {e}")
-    
-    # If payroll data still not found, set status codes for payroll fields
-    # Only during rescrape (Phase 2) - on first run, fields remain NULL
-    if not record.get("base_salary") and not record.get("pay_basis"):
-        if is_rescrape:
-            logging.info(f"Payroll: rescrape mode - No data found for '{query}', setting NOT_FOUND status for payroll fields")
-            # Dynamically set NOT_FOUND for all payroll fields
-            for field in ["base_salary", "pay_basis", "regular_hours", "regular_gross_paid", 
-                         "ot_hours", "total_ot_paid", "total_other_pay"]:
-                if not record.get(field):
-                    record[field] = "NOT_FOUND"
+
+                target_info = enrich_targets[source_id]
+                chunk.append({
+                    'Name': f"{officer['first_name']} {officer['last_name']}",
+                    'First': officer['first_name'],
+                    'Last': officer['last_name'],
+                    'badge': officer['badge'] or target_info['badge'],
+                    'profile_url': officer['profile_url'],
+                    # Stored start date tells same-name payroll rows apart (a requested column is re-fetched)
+                    'service_start': '' if 'service_start' in target_info['columns'] else (officer['service_start'] or ''),
+                    'source_id': source_id,
+                    'version_tag': target_info['version_tag'],
+                    'enrich_columns': target_info['columns'],
+                    'enrich_delta_rows': target_info['delta_rows'],
+                    'priority': target_info['priority'],
+                    'Date': '',
+                    'Time': '',
+                    'Rank': '',
+                    'Trial Room': '',
+                    'Case Type': 'Enrichment'
+                })
+                if len(chunk) == size:
+                    yield chunk
+                    chunk = []
+    except Exception as e:
+        logging.error(f"ENRICH MODE: Database connection failed: {e}")
+        logging.error("Cannot proceed without officer names - exiting")
+        sys.exit(1)
+    if chunk:
+        yield chunk
+
+def _log_enrich_summary(records):
+    """Log what an enrich run covers: officers per priority, fields and the EnrichPlan."""
+    logging.info(f"ENRICH MODE: Built {len(records)} officer records for enrichment")
+    priority_counts = {}
+    for record in records:
+        priority_counts[record['priority']] = priority_counts.get(record['priority'], 0) + 1
+    logging.info("ENRICH MODE: Priority order: " + ", ".join(f"{p} {n}" for p, n in priority_counts.items()))
+    logging.info(f"ENRICH MODE: Total fields to enrich: {sum(len(r.get('enrich_columns', [])) for r in records)}")
+    _enrich_plan.log_summary("API" if args.payroll_backend == "api" else "explorer UI")
+
+def _record_key(record):
+    """Officer identity for sharding and checkpoints: source_id when known, else the normalized name."""
+    return record.get("source_id") or f"{_norm(record.get('First', ''))}|{_norm(record.get('Last', ''))}"
+
+def _run_stem(records):
+    """Base name shared by a run's shard files and checkpoint journal (the output CSV name without .csv)."""
+    if enrich_mode:
+        return f"enrichment_{override_version_tag or 'output'}"
+    return Path(_generate_csv_filename(records, override_version_tag)).stem
+
+def open_officer_registry(ttl_days):
+    """
+    Open the cross-month officer registry and import monthly CSVs it has not seen.
+    """
+    global _registry
+    try:
+        _registry = OfficerRegistry(OFFICER_REGISTRY_FILE, ttl_days=ttl_days)
+        _registry.sync(CSV_DIR)
+        logging.info(f"Registry: using {OFFICER_REGISTRY_FILE} (ttl={ttl_days} days)")
+    except Exception as e:
+        logging.warning(f"Registry: failed to open {OFFICER_REGISTRY_FILE}, continuing without it: {e}")
+        _registry = None
+
+def apply_officer_registry(records):
+    """
+    Join records against the registry and apply every phase whose fields are all fresh.
+
+    Returns:
+        Number of records with at least one phase served
+    """
+    joined = 0
+    for record in records:
+        fresh = _registry.fresh_fields(record)
+        if not fresh:
+            continue
+        for phase, values in fresh.items():
+            record.update(values)
+            _registry_served.setdefault(_record_key(record), set()).add(phase)
+            _registry.served[phase] += 1
+        joined += 1
+    logging.info(f"Registry: {joined} of {len(records)} records joined; {_registry.stats()}")
+    return joined
+
+def record_officer_registry(records):
+    """Store the phases each record actually fetched this run (found officers only)."""
+    for record in records:
+        served = _registry_served.get(_record_key(record), ())
+        phases = [
+            phase for phase in PHASE_FIELDS
+            if phase not in served and record.get(PHASE_KEY_FIELD[phase]) not in (None, "", "NOT_FOUND", "UNVERIFIED")
+        ]
+        _registry.record_verified(record, phases)
+
+def log_run_stats():
+    """Log wait, resource, checkpoint and cache statistics for the run."""
+    waits.log_summary()
+    if _journal is not None and _journal.skipped:
+        logging.info(f"Checkpoint: {_journal.skipped} enrichment phases restored from the journal")
+    if browser_policy.active:
+        resource_stats.log_summary(browser_policy.name)
+    if _fiftya_cache is not None:
+        logging.info(f"50-a cache: {_fiftya_cache.stats()}")
+    if _registry is not None:
+        logging.info(f"Registry: {_registry.stats()}")
+    if _budget is not None:
+        logging.info(f"Budget: {_budget.stats()}")
+    if _payroll_disk_cache is not None:
+        logging.info(f"Payroll cache: {_payroll_cache_memory_hits} in-run hits; disk: {_payroll_disk_cache.stats()}")
+    else:
+        logging.info(f"Payroll cache: {_payroll_cache_memory_hits} in-run hits")
 
 
 # === Main Script ===
+if args.payroll_sync:
+    try:
+        stored = sync_payroll_snapshot()
+    except Exception as e:
+        logging.error(f"Payroll sync: failed: {e}")
+        sys.exit(1)
+    logging.info(f"=== THOTH PAYROLL SYNC Complete: {stored} rows ===")
+    sys.exit(0)
+
+if not args.no_payroll_snapshot:
+    open_payroll_snapshot()
+if not args.no_fiftya_cache:
+    open_fiftya_cache(args.fiftya_cache_ttl, args.fiftya_cache_size)
+if not args.no_payroll_cache:
+    open_payroll_cache()
+if args.direct_profile:
+    _known_profile_urls = load_known_profile_urls(CSV_DIR)
+# Registry joins only unsharded full scrapes (rescrape/enrich runs exist to re-fetch)
+if not (args.no_registry or rescrape_mode or enrich_mode or shard or args.merge_shards):
+    open_officer_registry(args.registry_ttl)
+
 all_records = []
 all_articles = []  # Collect articles during enrichment
+csv_stream = None  # Streaming writer for the monthly CSV (full scrapes only)
 
-with sync_playwright() as p:
-    logging.info("Launching headless Chromium")
-    browser = p.chromium.launch(headless=True)
-    context = browser.new_context()
-    page = context.new_page()
-
-    # Extract NYPDTRIAL or build from rescrape/enrich list
+if args.merge_shards:
+    # === Merge Shards ===
+    try:
+        shard_stem, shard_paths = shards.find_shard_set(CSV_DIR / "shards", args.merge_shards, args.version_tag)
+        shard_manifest, all_records, all_articles = shards.load_shards(shard_paths)
+    except (OSError, ValueError) as e:
+        logging.error(f"Shards: merge failed: {e}")
+        sys.exit(1)
+    # Output below follows the mode the shards were scraped in
+    rescrape_mode = shard_manifest["mode"] == "rescrape"
+    enrich_mode = shard_manifest["mode"] == "enrich"
+    override_version_tag = shard_manifest["version_tag"]
+    logging.info(f"Shards: merged {len(all_records)} records and {len(all_articles)} articles from {shard_stem} ({shard_manifest['mode']} mode)")
+else:
     if enrich_mode:
         logging.info("ENRICH MODE: Building officer list from delta enrichment CSV")
-        
-        # Connect to database to fetch officer names
-        try:
-            conn = psycopg2.connect(
-                host=os.getenv('PGHOST', 'localhost'),
-                port=os.getenv('PGPORT', '5433'),
-                database=os.getenv('DB_NAME', 'copwatch'),
-                user=os.getenv('DB_USER', 'postgres'),
-                password=os.getenv('DB_PASS', '')
-            )
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
-            
-            # Fetch officer names for all source_ids in one query
-            source_ids = list(enrich_targets.keys())
-            cursor.execute(
-                "SELECT source_id, first_name, last_name, badge FROM cwd_raw.officers_raw WHERE source_id = ANY(%s)",
-                (source_ids,)
-            )
-            officer_data = {row['source_id']: row for row in cursor.fetchall()}
-            cursor.close()
-            conn.close()
-            
-            logging.info(f"ENRICH MODE: Fetched names for {len(officer_data)} officers from database")
-            
-        except Exception as e:
-            logging.error(f"ENRICH MODE: Database connection failed: {e}")
-            logging.error("Cannot proceed without officer names - exiting")
-            sys.exit(1)
-        
-        # Build records with names from database
-        for source_id, target_info in enrich_targets.items():
-            if source_id not in officer_data:
-                logging.warning(f"ENRICH MODE: source_id {source_id} not found in database, skipping")
-                continue
-            
-            officer = officer_data[source_id]
-            record = {
-                'Name': f"{officer['first_name']} {officer['last_name']}",
-                'First': officer['first_name'],
-                'Last': officer['last_name'],
-                'badge': officer['badge'] or target_info['badge'],
-                'source_id': source_id,
-                'version_tag': target_info['version_tag'],
-                'enrich_columns': target_info['columns'],
-                'priority': target_info['priority'],
-                'Date': '',
-                'Time': '',
-                'Rank': '',
-                'Trial Room': '',
-                'Case Type': 'Enrichment'
-            }
-            all_records.append(record)
-        
-        logging.info(f"ENRICH MODE: Built {len(all_records)} officer records for enrichment")
-        logging.info(f"ENRICH MODE: Total fields to enrich: {sum(len(r.get('enrich_columns', [])) for r in all_records)}")
-    elif rescrape_mode:
-        logging.info("RESCRAPE MODE: Building officer list from target CSV (skipping NYPD Trials page)")
-        # Build minimal records from target list - enrichment will fill in the rest
-        for target in rescrape_targets:
-            record = {
-                'Name': f"{target['first_name']} {target['last_name']}",  # Required by enrich_with_50a
-                'First': target['first_name'],
-                'Last': target['last_name'],
-                'badge': target['badge'],
-                'source_id': target['source_id'],
-                'Date': '',  # Not needed for rescrape
-                'Time': '',
-                'Rank': '',  # Will be filled by 50-a enrichment
-                'Trial Room': '',
-                'Case Type': 'Re-scrape'
-            }
-            all_records.append(record)
-        logging.info(f"RESCRAPE MODE: Built {len(all_records)} officer records from target list")
-    else:
-        # Full scrape mode - extract from NYPD Trials page
-        all_records = extract_from_nypdtrial(page, retries=3, timeout=5000)
-        logging.info(f"Main: extracted {len(all_records)} records from NYPDTRIAL")
-
-    # Enrich with FIFTYA
-    logging.info("Main: beginning 50-a enrichment pass")
-    for idx, record in enumerate(all_records, start=1):
-        logging.info(f"Main: 50-a enrich record #{idx} - {record.get('Name')}")
-        articles = enrich_with_50a(page, record, is_rescrape=rescrape_mode)
-        all_articles.extend(articles)  # Collect articles from this officer
-        # Random jitter between 50-a queries to reduce server-side throttling
-        jitter = int(random.uniform(150, 600))
-        page.wait_for_timeout(jitter)
-
-    # Enrich with PAYROLL
-    logging.info("Main: beginning payroll enrichment pass")
-    page = context.new_page()
-    for idx, record in enumerate(all_records, start=1):
-        logging.info(f"Main: payroll enrich record #{idx} - First='{record.get('First')}' Last='{record.get('Last')}'")
-        enrich_with_payroll(page, record, is_rescrape=rescrape_mode)
-        # Random jitter between payroll queries to reduce server-side throttling
-        jitter = int(random.uniform(150, 600))
-        page.wait_for_timeout(jitter)
-
-    browser.close()
-    logging.info("Browser closed, Dogs returned")
-
-    # === Apply N/A status for non-applicable fields ===
-    # Only during rescrape (Phase 2) - on first run, fields remain NULL
-    if rescrape_mode:
-        logging.info("Main: rescrape mode - applying N/A status for rank-based field exclusions")
-        for idx, record in enumerate(all_records, start=1):
-            rank = record.get("Rank", "").lower()
-            is_lieutenant_or_higher = any(r in rank for r in ["lieutenant", "captain", "deputy", "chief", "inspector"])
+
+        # Officer names are streamed from the database (server-side cursor), high-priority
+        # officers first so a --budget cut leaves the low-priority work. Each chunk is
+        # planned and enriched as it arrives instead of reading the whole delta first.
+        lookup_order = sorted(enrich_targets, key=lambda sid: priority_rank(enrich_targets[sid]['priority']))
+        _enrich_plan = EnrichPlan()
+        if args.plan_only:
+            # Show the plan without any browser work; each source is visited only for officers that need it
+            for chunk in _enrich_record_chunks(lookup_order):
+                _enrich_plan.add(chunk)
+                all_records.extend(chunk)
+            logging.getLogger().addHandler(logging.StreamHandler(sys.stdout))
+            _log_enrich_summary(all_records)
+            logging.info("=== THOTH ENRICH PLAN Complete (--plan-only) ===")
+            sys.exit(0)
+
+    with sync_playwright() as p:
+        logging.info("Launching headless Chromium")
+        browser = p.chromium.launch(headless=True)
+        context = _new_browser_context(browser)
+        page = context.new_page()
+
+        # Extract NYPDTRIAL or build from rescrape/enrich list
+        if enrich_mode:
+            logging.info(f"ENRICH MODE: enriching officer records in chunks of {DEFAULT_ITERSIZE} as the database streams them")
+            batches = _enrich_record_chunks(lookup_order)
+        elif rescrape_mode:
+            logging.info("RESCRAPE MODE: Building officer list from target CSV (skipping NYPD Trials page)")
+            # Build minimal records from target list - enrichment will fill in the rest
+            for target in rescrape_targets:
+                record = {
+                    'Name': f"{target['first_name']} {target['last_name']}",  # Required by enrich_with_50a
+                    'First': target['first_name'],
+                    'Last': target['last_name'],
+                    'badge': target['badge'],
+                    'source_id': target['source_id'],
+                    'Date': '',  # Not needed for rescrape
+                    'Time': '',
+                    'Rank': '',  # Will be filled by 50-a enrichment
+                    'Trial Room': '',
+                    'Case Type': 'Re-scrape'
+                }
+                all_records.append(record)
+            logging.info(f"RESCRAPE MODE: Built {len(all_records)} officer records from target list")
+        else:
+            # Full scrape mode - extract from NYPD Trials page
+            all_records = extract_from_nypdtrial(page, retries=3, timeout=5000)
+            logging.info(f"Main: extracted {len(all_records)} records from NYPDTRIAL")
+        if not enrich_mode:
+            batches = [all_records]
+
+        run_mode = "enrich" if enrich_mode else ("rescrape" if rescrape_mode else "full")
+        run_stem = _run_stem(all_records)
+
+        # Journal every completed phase so a crash can be picked up with --resume
+        journal_name = f"{run_stem}.{run_mode}" + (f".shard-{shard[0]}-of-{shard[1]}" if shard else "")
+        _journal = CheckpointJournal(os.path.join(CHECKPOINT_DIR, f"{journal_name}.jsonl"), resume=args.resume)
+
+        # Full scrapes write each officer's row to <csv>.partial as soon as payroll finishes
+        # (a full scrape is one batch, so the passes' indexes are its row numbers);
+        # rescrape and enrich output depends on the whole run, so it is written at the end
+        if run_mode == "full" and not shard:
+            csv_stream = StreamingCSVWriter(CSV_DIR / f"{run_stem}.csv", fieldnames, _csv_row)
+        record_done = csv_stream.submit if csv_stream else None
+
+        if _budget is not None:
+            _budget.start()
+            if budget_forces_pipeline:
+                logging.info("Budget: pipelining 50-a and payroll so each officer's lookups run in priority order")
+
+        # Enrich runs get one batch per streamed chunk; full and rescrape runs are a single batch
+        all_records = []
+        fiftya_results = []
+        shard_total = 0
+        shard_rows = []
+        payroll_page = None
+        for batch in batches:
+            # Keep only this shard's officers; their positions in the full list drive the merge order
+            offset, shard_total = shard_total, shard_total + len(batch)
+            if shard:
+                selected = shards.partition(batch, shard[0], shard[1], _record_key)
+                shard_rows.extend(offset + row for row, _ in selected)
+                batch = [record for _, record in selected]
+            all_records.extend(batch)
+            if enrich_mode:
+                _enrich_plan.add(batch)
+                logging.info(f"ENRICH MODE: chunk of {len(batch)} officer records ({_enrich_plan.count('50-a')} need 50-a, {_enrich_plan.count('payroll')} need payroll so far)")
+
+            # Repeat officers with fresh registry fields skip those lookups
+            if _registry is not None:
+                apply_officer_registry(batch)
+
+            # One batched SODA query replaces per-officer explorer searches
+            if args.payroll_backend == "api":
+                prefetch_payroll_api([r for r in batch if _enrich_plan is None or _enrich_plan.needs(r, "payroll")])
+
+            # The shared throttle spaces concurrent requests per host; a single 50-a page
+            # still pauses 150-600 ms after each officer it looked up, as before
+            if args.pipeline:
+                logging.info("Main: beginning pipelined 50-a + payroll enrichment")
+                fiftya_results.extend(run_enrichment_pipeline(
+                    batch, fiftya_workers=args.fiftya_workers,
+                    payroll_workers=args.payroll_workers, is_rescrape=rescrape_mode,
+                    on_done=record_done
+                ))
+            else:
+                # Enrich with FIFTYA
+                logging.info("Main: beginning 50-a enrichment pass")
+                fiftya_results.extend(run_enrichment_pool(
+                    page, batch, enrich_with_50a,
+                    workers=args.fiftya_workers, label="50-a", pause=True, is_rescrape=rescrape_mode
+                ))
+
+                # Enrich with PAYROLL
+                logging.info("Main: beginning payroll enrichment pass")
+                if payroll_page is None:
+                    payroll_page = context.new_page()
+                run_enrichment_pool(
+                    payroll_page, batch, enrich_with_payroll,
+                    workers=args.payroll_workers, label="payroll", on_done=record_done,
+                    is_rescrape=rescrape_mode
+                )
+        if shard:
+            logging.info(f"SHARD MODE: shard {shard[0]}/{shard[1]} had {len(all_records)} of {shard_total} records")
+        if enrich_mode:
+            _log_enrich_summary(all_records)
+        for articles in fiftya_results:
+            all_articles.extend(articles or [])  # Collect articles in original record order
+        if _registry is not None:
+            record_officer_registry(all_records)
+
+        browser.close()
+        logging.info("Browser closed, Dogs returned")
+
+        # === Apply N/A status for non-applicable fields ===
+        # Only during rescrape (Phase 2) - on first run, fields remain NULL
+        if rescrape_mode:
+            logging.info("Main: rescrape mode - applying N/A status for rank-based field exclusions")
+            for idx, record in enumerate(all_records, start=1):
+                rank = record.get("Rank", "").lower()
+                is_lieutenant_or_higher = any(r in rank for r in ["lieutenant", "captain", "deputy", "chief", "inspector"])
             
-            # Lieutenants and higher ranks don't have badge numbers
-            if is_lieutenant_or_higher and not record.get("badge"):
-                record["badge"] = "N/A"
-                logging.info(f"Main: record #{idx} ({record.get('Name')}) - set badge=N/A (rank: {record.get('Rank')})")
+                # Lieutenants and higher ranks don't have badge numbers
+                if is_lieutenant_or_higher and not record.get("badge"):
+                    record["badge"] = "N/A"
+                    logging.info(f"Main: record #{idx} ({record.get('Name')}) - set badge=N/A (rank: {record.get('Rank')})")
+
+# === Shard Output ===
+# A shard stops here; --merge-shards writes the CSVs once every shard is done
+if shard:
+    shard_manifest = {
+        "mode": run_mode,
+        "version_tag": override_version_tag,
+        "index": shard[0],
+        "count": shard[1],
+        "total_records": shard_total,
+    }
+    shards.write_shard(
+        shards.shard_path(CSV_DIR / "shards", run_stem, shard[0], shard[1]),
+        shard_manifest,
+        zip(shard_rows, all_records, fiftya_results),
+    )
+    _journal.finish()
+    log_run_stats()
+    logging.info(f"=== THOTH SHARD {shard[0]}/{shard[1]} Complete: {len(all_records)} records ===")
+    logging.info(f"Run --merge-shards {shard[1]} once all shards have finished")
+    sys.exit(0)
 
 # === Save CSV ===
 # Generate CSV filename based on actual trial dates
@@ -1432,151 +2262,38 @@ csv_path = CSV_DIR / CSV_FILE
 local_csv_path = Path(LOCAL_CSV_FILE)
 
 # === Merge with existing CSV if in rescrape mode ===
-if rescrape_mode and csv_path.exists():
-    logging.info(f"RESCRAPE MODE: Merging with existing CSV at {csv_path}")
-    try:
-        existing_records = []
-        with csv_path.open("r", newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            existing_records = list(reader)
-        
-        logging.info(f"Loaded {len(existing_records)} existing records from {csv_path}")
-        
-        # Create a map of rescraped officers by (First, Last) for quick lookup
-        rescrape_map = {}
-        for record in all_records:
-            first = record.get("First", "").strip().lower()
-            last = record.get("Last", "").strip().lower()
-            key = (first, last)
-            rescrape_map[key] = record
-        
-        logging.info(f"Rescraped {len(rescrape_map)} unique officers")
-        
-        # Merge: Update existing records with rescraped data, keep non-rescraped records as-is
-        merged_records = []
-        updated_count = 0
-        for existing in existing_records:
-            first = existing.get("First", "").strip().lower()
-            last = existing.get("Last", "").strip().lower()
-            key = (first, last)
-            
-            if key in rescrape_map:
-                # This officer was rescraped - fill in ALL enrichment fields
-                # Keep trial data (Date, Time, Room, Case Type, Rank) from existing
-                rescraped = rescrape_map[key]
-                
-                # Fill in enrichment fields from rescraped data (internal field names)
-                existing["Badge"] = rescraped.get("badge", existing.get("Badge", ""))
-                existing["PCT"] = rescraped.get("precinct_number", existing.get("PCT", ""))
-                existing["PCT URL"] = rescraped.get("precinct_link", existing.get("PCT URL", ""))
-                existing["Race"] = rescraped.get("race", existing.get("Race", ""))
-                existing["Gender"] = rescraped.get("gender", existing.get("Gender", ""))
-                existing["Tax ID"] = rescraped.get("tax_id", existing.get("Tax ID", ""))
-                existing["Email"] = rescraped.get("email", existing.get("Email", ""))
-                existing["Current Assignment"] = rescraped.get("current_assignment", existing.get("Current Assignment", ""))
-                existing["Assignment Start"] = rescraped.get("assignment_start", existing.get("Assignment Start", ""))
-                existing["Previous Assignments"] = rescraped.get("previous_assignments", existing.get("Previous Assignments", ""))
-                existing["Officer Image"] = rescraped.get("officer_image", existing.get("Officer Image", ""))
-                existing["Profile URL"] = rescraped.get("profile_url", existing.get("Profile URL", ""))
-                existing["Started"] = rescraped.get("service_start", existing.get("Started", ""))
-                existing["Last Earned"] = rescraped.get("last_earned", existing.get("Last Earned", ""))
-                existing["Disciplined"] = rescraped.get("has_discipline", existing.get("Disciplined", ""))
-                existing["Articles"] = rescraped.get("has_articles", existing.get("Articles", ""))
-                existing["# Complaints"] = rescraped.get("num_complaints", existing.get("# Complaints", ""))
-                existing["# Allegations"] = rescraped.get("num_allegations", existing.get("# Allegations", ""))
-                existing["# Substantiated"] = rescraped.get("num_substantiated", existing.get("# Substantiated", ""))
-                existing["# Charges"] = rescraped.get("num_substantiated_charges", existing.get("# Charges", ""))
-                existing["# Unsubstantiated"] = rescraped.get("num_unsubstantiated", existing.get("# Unsubstantiated", ""))
-                existing["# Guidelined"] = rescraped.get("num_within_guidelines", existing.get("# Guidelined", ""))
-                existing["# Lawsuits"] = rescraped.get("num_lawsuits", existing.get("# Lawsuits", ""))
-                existing["Total Settlements"] = rescraped.get("total_settlements", existing.get("Total Settlements", ""))
-                existing["Status"] = rescraped.get("leave_status_as_of_june_30", existing.get("Status", ""))
-                existing["Base Salary"] = rescraped.get("base_salary", existing.get("Base Salary", ""))
-                existing["Pay Basis"] = rescraped.get("pay_basis", existing.get("Pay Basis", ""))
-                existing["Regular Hours"] = rescraped.get("regular_hours", existing.get("Regular Hours", ""))
-                existing["Regular Gross Paid"] = rescraped.get("regular_gross_paid", existing.get("Regular Gross Paid", ""))
-                existing["OT Hours"] = rescraped.get("ot_hours", existing.get("OT Hours", ""))
-                existing["Total OT Paid"] = rescraped.get("total_ot_paid", existing.get("Total OT Paid", ""))
-                existing["Total Other Pay"] = rescraped.get("total_other_pay", existing.get("Total Other Pay", ""))
-                
-                merged_records.append(existing)
-                updated_count += 1
-                logging.info(f"Merged enrichment for {first.title()} {last.title()}")
-            else:
-                # This officer was not rescraped - keep existing data unchanged
-                merged_records.append(existing)
-        
-        # Replace all_records with merged data
-        all_records = merged_records
-        logging.info(f"Merge complete: {updated_count} records updated, {len(merged_records)} total records")
-        
-    except Exception as e:
-        logging.error(f"Failed to merge with existing CSV: {e}")
-        logging.info("Proceeding with rescraped records only")
-
-fieldnames = [
-    "Date","Time","Rank","First","Last","Room","Case Type",
-    "Badge","PCT","PCT URL","Race","Gender","Tax ID","Email",
-    "Current Assignment","Assignment Start","Previous Assignments",
-    "Officer Image","Profile URL","Started","Last Earned",
-    "Disciplined","Articles",
-    "# Complaints","# Allegations","# Substantiated","# Charges",
-    "# Unsubstantiated","# Guidelined",
-    "# Lawsuits","Total Settlements",
-    "Status","Base Salary","Pay Basis","Regular Hours","Regular Gross Paid","OT Hours","Total OT Paid","Total Other Pay"
-]
-
-# Function to write CSV with the same content
-def write_csv_file(filepath, records):
-    logging.info(f"Writing CSV to {filepath}")
-    with filepath.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        written = 0
-        for r in records:
-            writer.writerow({
-                "Date":                 r.get("Date", ""),
-                "Time":                 r.get("Time", ""),
-                "Rank":                 r.get("Rank", ""),
-                "First":                r.get("First", ""),
-                "Last":                 r.get("Last", ""),
-                "Room":                 r.get("Room", r.get("Trial Room", "")),
-                "Case Type":            r.get("Case Type", ""),
-                "Badge":                r.get("Badge", r.get("badge", "")),
-                "PCT":                  r.get("PCT", r.get("precinct_number", "")),
-                "PCT URL":              r.get("PCT URL", r.get("precinct_link", "")),
-                "Race":                 r.get("Race", r.get("race", "")),
-                "Gender":               r.get("Gender", r.get("gender", "")),
-                "Tax ID":               r.get("Tax ID", r.get("tax_id", "")),
-                "Email":                r.get("Email", r.get("email", "")),
-                "Current Assignment":   r.get("Current Assignment", r.get("current_assignment", "")),
-                "Assignment Start":     r.get("Assignment Start", r.get("assignment_start", "")),
-                "Previous Assignments": r.get("Previous Assignments", r.get("previous_assignments", "")),
-                "Officer Image":        r.get("Officer Image", r.get("officer_image", "")),
-                "Profile URL":          r.get("Profile URL", r.get("profile_url", "")),
-                "Started":              r.get("Started", r.get("service_start", "")),
-                "Last Earned":          r.get("Last Earned", r.get("last_earned", "")),
-                "Disciplined":          r.get("Disciplined", r.get("has_discipline", "N")),
-                "Articles":             r.get("Articles", r.get("has_articles", "N")),
-                "# Complaints":         r.get("# Complaints", r.get("num_complaints", 0)),
-                "# Allegations":        r.get("# Allegations", r.get("num_allegations", 0)),
-                "# Substantiated":      r.get("# Substantiated", r.get("num_substantiated", 0)),
-                "# Charges":            r.get("# Charges", r.get("num_substantiated_charges", 0)),
-                "# Unsubstantiated":    r.get("# Unsubstantiated", r.get("num_unsubstantiated", 0)),
-                "# Guidelined":         r.get("# Guidelined", r.get("num_within_guidelines", 0)),
-                "# Lawsuits":           r.get("# Lawsuits", r.get("num_lawsuits", 0)),
-                "Total Settlements":    r.get("Total Settlements", r.get("total_settlements", "")),
-                "Status":               r.get("Status", r.get("leave_status_as_of_june_30", "")),
-                "Base Salary":          r.get("Base Salary", r.get("base_salary", "")),
-                "Pay Basis":            r.get("Pay Basis", r.get("pay_basis", "")),
-                "Regular Hours":        r.get("Regular Hours", r.get("regular_hours", "")),
-                "Regular Gross Paid":   r.get("Regular Gross Paid", r.get("regular_gross_paid", "")),
-                "OT Hours":             r.get("OT Hours", r.get("ot_hours", "")),
-                "Total OT Paid":        r.get("Total OT Paid", r.get("total_ot_paid", "")),
-                "Total Other Pay":      r.get("Total Other Pay", r.get("total_other_pay", "")),
-            })
-            written += 1
-        return written
+# Each rescraped officer is patched into the monthly CSV its source_id points at
+# (one read and one write per file); the run's own monthly file becomes all_records
+if rescrape_mode:
+    merge_groups = rescrape_merge.group_by_monthly_file(all_records, csv_path, CSV_DIR)
+    for merge_path, merge_records in merge_groups.items():
+        if not merge_records and merge_path != csv_path:
+            continue
+        if not merge_path.exists():
+            logging.info(f"RESCRAPE MODE: {merge_path} does not exist; writing rescraped records only")
+            continue
+        logging.info(f"RESCRAPE MODE: Merging {len(merge_records)} officers into {merge_path}")
+        try:
+            existing_records = rescrape_merge.load_monthly_csv(merge_path)
+            merge_stats = rescrape_merge.merge_rescraped(
+                existing_records, merge_records, month=rescrape_merge.month_of_csv(merge_path)
+            )
+        except Exception as e:
+            logging.error(f"Failed to merge with existing CSV {merge_path}: {e}")
+            if merge_path == csv_path:
+                logging.info("Proceeding with rescraped records only")
+            continue
+        logging.info(
+            f"Merge complete for {merge_path}: {merge_stats['rows_updated']} rows updated "
+            f"({merge_stats['fields_changed']} fields), {merge_stats['matched']} officers matched, "
+            f"{merge_stats['unmatched']} unmatched, {merge_stats['ambiguous']} ambiguous, {len(existing_records)} total records"
+        )
+        if merge_path == csv_path:
+            # Written below, together with the local copy
+            all_records = existing_records
+        else:
+            written = write_csv_file(merge_path, existing_records)
+            logging.info(f"RESCRAPE MODE: Patched {merge_path}: {written} rows")
 
 # Conditional output based on operation mode
 if enrich_mode:
@@ -1608,11 +2325,19 @@ if enrich_mode:
         enrichment_writer.writerow(["source_id", "column_name", "new_value"])
         
         enrichment_count = 0
+        enrichment_rows = []  # Same rows, for --db-sink
+        leftover_rows = []  # Columns whose source the --budget deferred
         for record in all_records:
             source_id = record.get('source_id')
             target_columns = record.get('enrich_columns', [])
+            deferred = record.get('enrich_deferred', [])
             
             for column in target_columns:
+                if column in COLUMN_SOURCES and COLUMN_SOURCES[column][0] in deferred:
+                    current_value, priority = record.get('enrich_delta_rows', {}).get(column, ('', record.get('priority', 'low')))
+                    leftover_rows.append((source_id, column, current_value, priority))
+                    continue
+
                 # Find the internal field name that maps to this column
                 internal_field = None
                 for field, col in FIELD_TO_COLUMN.items():
@@ -1630,21 +2355,38 @@ if enrich_mode:
                 # Only write if we found a value (not empty or NOT_FOUND)
                 if new_value and new_value not in ['', 'NOT_FOUND', 'N/A']:
                     enrichment_writer.writerow([source_id, column, new_value])
+                    enrichment_rows.append((source_id, column, new_value))
                     enrichment_count += 1
                     logging.info(f"ENRICH MODE: {source_id}.{column} = {new_value}")
                 else:
                     # Mark as not found
                     enrichment_writer.writerow([source_id, column, 'NOT_FOUND'])
+                    enrichment_rows.append((source_id, column, 'NOT_FOUND'))
                     logging.info(f"ENRICH MODE: {source_id}.{column} = NOT_FOUND")
     
     logging.info(f"=== THOTH ENRICH MODE Complete ===")
     logging.info(f"Enrichment CSV file ({enrichment_path}): {enrichment_count} fields enriched")
+
+    # Work the budget cut off goes back out as a delta for the next run
+    if leftover_rows:
+        leftover_path = CSV_DIR / f"delta_enrich_{override_version_tag or 'output'}_leftover.csv"
+        leftover_count = write_delta(leftover_path, leftover_rows)
+        leftover_officers = len({row[0] for row in leftover_rows})
+        logging.warning(f"ENRICH MODE: budget reached - {leftover_count} fields for {leftover_officers} officers written to {leftover_path}")
     
 else:
     # === NORMAL MODE: Output standard copwatchdog CSV ===
-    # Write to both locations
-    monthly_written = write_csv_file(csv_path, all_records)
-    local_written = write_csv_file(local_csv_path, all_records)
+    # Finish the streamed file (or write it in one pass), then link the local copy to it
+    if csv_stream is not None:
+        monthly_written = csv_stream.commit(all_records)
+    else:
+        monthly_written = write_csv_file(csv_path, all_records)
+    if _registry is not None:
+        # This run's verifications are already recorded; importing the file would re-date served fields
+        _registry.mark_source(csv_path)
+    local_method = link_or_copy(csv_path, local_csv_path)
+    local_written = monthly_written
+    logging.info(f"Local CSV {local_csv_path} is a {local_method} of {csv_path}")
 
 # === Save Articles CSV ===
 # Skip articles in enrich mode (not needed for targeted enrichment)
@@ -1652,41 +2394,41 @@ if not enrich_mode:
     articles_csv_path = CSV_DIR / "articles.csv"
     logging.info(f"Articles: Processing {len(all_articles)} articles scraped from 50-a.org")
 
-# Load existing articles and get next article_id
-existing_articles, existing_url_badge_pairs, next_article_id = load_existing_articles(articles_csv_path)
-
-# Filter out duplicate articles (by URL+badge combination) and assign article_id
-new_articles = []
-duplicate_count = 0
-for article in all_articles:
-    url = article.get("url", "")
-    badge = article.get("badge", "")
-    url_badge_pair = (url, badge)
-    
-    # Only skip if this exact URL+badge combination already exists
-    # This allows the same article to be linked to multiple officers
-    if url and badge and url_badge_pair not in existing_url_badge_pairs:
-        article["article_id"] = next_article_id
-        next_article_id += 1
-        new_articles.append(article)
-        existing_url_badge_pairs.add(url_badge_pair)  # Track for this batch
-    else:
-        duplicate_count += 1
-        logging.debug(f"Articles: Skipping duplicate article: {url} for badge {badge}")
-
-    logging.info(f"Articles: {len(new_articles)} new articles, {duplicate_count} duplicates skipped")
+    # Append only new (url, badge) pairs; existing rows are never re-read or rewritten
+    new_articles = []
+    try:
+        article_store = ArticleStore(articles_csv_path)
+        new_articles, duplicate_count, unkeyed_count = article_store.append(all_articles)
+        logging.info(f"Articles: {len(new_articles)} new articles, {duplicate_count} duplicates skipped")
+        if unkeyed_count:
+            logging.warning(f"Articles: {unkeyed_count} articles without a url or badge skipped")
+        if new_articles:
+            logging.info(f"Articles CSV file ({articles_csv_path}): appended {len(new_articles)} rows, {article_store.rows} indexed")
+        else:
+            logging.info("Articles: No articles to write")
+    except Exception as e:
+        logging.error(f"Articles: Failed to write articles.csv: {e}")
 
-    # Combine existing + new articles
-    combined_articles = existing_articles + new_articles
+# === Load Staging Tables ===
+# --db-sink: the same output, straight into Postgres (CSVs above are still written)
+if args.db_sink:
+    try:
+        with _database().connection() as db_conn:
+            sink = pg_sink.PostgresSink(db_conn, fieldnames, schema=args.db_sink_schema)
+            if enrich_mode:
+                sink.write_enrichment(enrichment_rows)
+            else:
+                sink.write_records(all_records, rescrape_merge.month_of_csv(csv_path), _csv_row)
+                sink.write_articles(new_articles)
+    except Exception as e:
+        logging.error(f"DB sink: load into {args.db_sink_schema} failed: {e}")
 
-    # Write articles.csv
-    if combined_articles:
-        articles_written = save_articles_csv(articles_csv_path, combined_articles)
-        logging.info(f"Articles CSV file ({articles_csv_path}): {articles_written} rows")
-    else:
-        logging.info("Articles: No articles to write")
+# Outputs are on disk; the checkpoint journal is no longer needed
+if _journal is not None:
+    _journal.finish()
 
 # === Final Summary ===
+log_run_stats()
 if enrich_mode:
     logging.info(f"=== THOTH ENRICH MODE Complete ===")
     logging.info("Enrichment CSV ready for HERMES enrich_from_deltas.sh")
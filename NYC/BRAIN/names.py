@@ -0,0 +1,109 @@
+"""
+Officer name normalization shared by 50-a and payroll matching.
+
+These helpers run inside candidate loops (every search result row on 50-a,
+every payroll row for an officer), usually on the same few strings over and
+over, so each one is memoized with an LRU cache and uses precompiled
+patterns. All of them are pure functions of their string argument.
+"""
+import re
+from functools import lru_cache
+
+SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+
+CACHE_SIZE = 16384
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]")
+_DOTTED_INITIAL_RE = re.compile(r"\b([A-Za-z])\.\b")
+_TRAILING_INITIAL_RE = re.compile(r"\b([A-Za-z])\b(?=[^A-Za-z]*$)")
+_NAME_SEPARATOR_RE = re.compile(r"[\s\-]+")
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def norm(s: str) -> str:
+    """
+    Normalize a string by converting to lowercase and removing all non-alphanumeric characters.
+
+    Args:
+        s: The string to normalize
+
+    Returns:
+        Normalized string (lowercase with only alphanumeric chars)
+    """
+    return _NON_ALNUM_RE.sub("", s.lower()) if s else ""
+
+@lru_cache(maxsize=CACHE_SIZE)
+def strip_suffix(name: str) -> str:
+    """
+    Remove common name suffixes (Jr, Sr, II, etc.) from a name.
+
+    Args:
+        name: A name that might contain a suffix
+
+    Returns:
+        The name (lowercased) without the suffix, if a suffix was found
+    """
+    if not name:
+        return ""
+    parts = name.lower().split()
+    if parts and parts[-1] in SUFFIXES:
+        parts = parts[:-1]
+    return " ".join(parts)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def split_candidate_name(name_text: str):
+    """
+    Parse a name string into first and last name components.
+
+    Handles both "Last, First" and "First Last" formats.
+
+    Args:
+        name_text: A string containing a person's name
+
+    Returns:
+        Tuple of (first_name, last_name)
+    """
+    if not name_text:
+        return "", ""
+    name_text = name_text.strip()
+    if "," in name_text:
+        # Handle "Last, First" format
+        last, rest = [p.strip() for p in name_text.split(",", 1)]
+        first = rest.split()[0] if rest else ""
+        return first, last
+    parts = name_text.split()
+    if len(parts) == 1:
+        # Only one name part provided
+        return parts[0], ""
+    # Assume "First Last" format
+    return parts[0], " ".join(parts[1:])
+
+def extract_initial(name_text: str) -> str:
+    """
+    Extract a single-letter middle initial from a name string, if present.
+
+    Examples:
+      'Harrison, Lenita I.' -> 'I'
+      'Lenita I. Harrison' -> 'I'
+
+    Returns uppercase initial or empty string when not found.
+    """
+    if not name_text:
+        return ""
+    # Look for a single letter followed by a period (common form)
+    m = _DOTTED_INITIAL_RE.search(name_text)
+    if m:
+        return m.group(1).upper()
+    # Fallback: single letter at the end or between names without a dot
+    m2 = _TRAILING_INITIAL_RE.search(name_text)
+    if m2 and len(m2.group(1)) == 1:
+        return m2.group(1).upper()
+    return ""
+
+def split_name_parts(name: str):
+    """Split a compound name on spaces and hyphens ('de la cruz-ortiz' -> ['de', 'la', 'cruz', 'ortiz'])."""
+    return _NAME_SEPARATOR_RE.split(name)
+
+def cache_info():
+    """LRU hit/miss counters for the memoized helpers (for run stats and benchmarks)."""
+    return {fn.__name__: fn.cache_info() for fn in (norm, strip_suffix, split_candidate_name)}
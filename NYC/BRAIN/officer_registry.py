@@ -0,0 +1,313 @@
+"""
+Cross-month officer registry.
+
+The same officers come back month after month in the trials calendar. The
+registry keeps one entry per officer, keyed by badge, tax id and 50-a profile
+id (with the normalized name as an alias), and stores every enriched field
+with the time it was last verified. Before a full scrape is enriched, its
+records are joined against the registry by name. An enrichment phase (50-a
+or payroll) whose fields were all verified within the TTL is served from the
+registry, so only new officers and officers with stale fields hit the network.
+
+The registry is built incrementally:
+
+    - sync(): imports monthly CSVs and articles.csv that it has not seen yet
+      (or that changed since), using the file's modification time as the
+      verification time. A changed file is usually a rescrape merge that
+      patched a few officers and rewrote the rest unchanged, so a re-imported
+      value that matches the stored one keeps its original verification time
+    - record_verified(): stores fields a run actually fetched, with the
+      current time, and mark_source() then stops that run's own CSV from
+      being imported again (its registry-served values were not re-verified)
+"""
+import csv
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from names import norm
+from rescrape_merge import PLACEHOLDER_BADGES, RESCRAPE_FIELD_MAP
+
+FIELD_FOR_COLUMN = dict(RESCRAPE_FIELD_MAP)
+
+# Record fields each enrichment phase sets, and the field proving the phase found the officer
+PHASE_FIELDS = {
+    "50-a": (
+        "badge", "precinct_number", "precinct_link", "race", "gender", "tax_id", "email",
+        "current_assignment", "assignment_start", "previous_assignments", "officer_image",
+        "profile_url", "service_start", "last_earned", "has_discipline", "has_articles",
+        "num_complaints", "num_allegations", "num_substantiated", "num_substantiated_charges",
+        "num_unsubstantiated", "num_within_guidelines", "num_lawsuits", "total_settlements",
+    ),
+    "payroll": (
+        "leave_status_as_of_june_30", "base_salary", "pay_basis", "regular_hours",
+        "regular_gross_paid", "ot_hours", "total_ot_paid", "total_other_pay",
+    ),
+}
+PHASE_KEY_FIELD = {"50-a": "profile_url", "payroll": "base_salary"}
+
+# Values that mean a lookup failed rather than verified a value
+UNVERIFIED_VALUES = {"NOT_FOUND", "UNVERIFIED"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS officers (
+    officer_id INTEGER PRIMARY KEY,
+    first      TEXT,
+    last       TEXT
+);
+CREATE TABLE IF NOT EXISTS officer_keys (
+    key        TEXT PRIMARY KEY,
+    officer_id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS officer_names (
+    name_key   TEXT NOT NULL,
+    officer_id INTEGER NOT NULL,
+    PRIMARY KEY (name_key, officer_id)
+);
+CREATE TABLE IF NOT EXISTS fields (
+    officer_id  INTEGER NOT NULL,
+    field       TEXT NOT NULL,
+    value       TEXT,
+    verified_at REAL NOT NULL,
+    PRIMARY KEY (officer_id, field)
+);
+CREATE TABLE IF NOT EXISTS sources (
+    path  TEXT PRIMARY KEY,
+    size  INTEGER NOT NULL,
+    mtime REAL NOT NULL
+);
+"""
+
+
+def name_key(first, last):
+    return f"{norm(first or '')}|{norm(last or '')}"
+
+def _identifier(value):
+    value = str(value or "").strip().lstrip("#")
+    return None if value.upper() in PLACEHOLDER_BADGES else value
+
+
+class OfficerRegistry:
+    """
+    SQLite registry of officers and their last-verified field values.
+
+    Args:
+        path: Path to the SQLite file
+        ttl_days: Age after which a verified field is stale
+    """
+
+    def __init__(self, path, ttl_days=30):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_days * 86400
+        self.served = {phase: 0 for phase in PHASE_FIELDS}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def _keys(self, fields):
+        keys = []
+        badge = _identifier(fields.get("badge"))
+        if badge:
+            keys.append(f"badge:{badge}")
+        tax_id = _identifier(fields.get("tax_id"))
+        if tax_id:
+            keys.append(f"tax:{tax_id}")
+        url = (fields.get("profile_url") or "").rstrip("/")
+        if "/officer/" in url:
+            keys.append(f"profile:{url.rsplit('/', 1)[-1]}")
+        return keys
+
+    def _find(self, keys, first, last):
+        for key in keys:
+            row = self._conn.execute("SELECT officer_id FROM officer_keys WHERE key = ?", (key,)).fetchone()
+            if row:
+                return row[0]
+        # Name alias only for an unambiguous name whose officer has no conflicting identifier
+        ids = [r[0] for r in self._conn.execute(
+            "SELECT officer_id FROM officer_names WHERE name_key = ?", (name_key(first, last),)
+        )]
+        if len(ids) == 1 and not keys:
+            return ids[0]
+        if len(ids) == 1:
+            known = {r[0].split(":", 1)[0] for r in self._conn.execute(
+                "SELECT key FROM officer_keys WHERE officer_id = ?", (ids[0],)
+            )}
+            if not known & {key.split(":", 1)[0] for key in keys}:
+                return ids[0]
+        return None
+
+    def _upsert(self, first, last, fields, verified_at, phases, keep_unchanged=False):
+        """
+        Store one observation of an officer (caller holds the lock and a transaction).
+
+        Args:
+            keep_unchanged: Leave verified_at alone for values equal to the stored
+                ones (file imports: the file's mtime does not re-verify them)
+        """
+        keys = self._keys(fields)
+        officer_id = self._find(keys, first, last)
+        if officer_id is None:
+            officer_id = self._conn.execute(
+                "INSERT INTO officers (first, last) VALUES (?, ?)", (first, last)
+            ).lastrowid
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO officer_keys (key, officer_id) VALUES (?, ?)",
+            [(key, officer_id) for key in keys],
+        )
+        self._conn.execute(
+            "INSERT OR IGNORE INTO officer_names (name_key, officer_id) VALUES (?, ?)",
+            (name_key(first, last), officer_id),
+        )
+        rows = []
+        for phase in phases:
+            for field in PHASE_FIELDS[phase]:
+                value = fields.get(field)
+                value = "" if value is None else str(value)
+                if value in UNVERIFIED_VALUES:
+                    continue
+                rows.append((officer_id, field, value, verified_at))
+        # A newer observation wins; an older file imported later does not overwrite it
+        condition = "excluded.verified_at >= fields.verified_at"
+        if keep_unchanged:
+            condition += " AND excluded.value IS NOT fields.value"
+        self._conn.executemany(
+            "INSERT INTO fields (officer_id, field, value, verified_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (officer_id, field) DO UPDATE SET value = excluded.value, verified_at = excluded.verified_at "
+            f"WHERE {condition}",
+            rows,
+        )
+        return officer_id
+
+    def _source_changed(self, path):
+        stat = path.stat()
+        row = self._conn.execute("SELECT size, mtime FROM sources WHERE path = ?", (str(path.resolve()),)).fetchone()
+        return row is None or row[0] != stat.st_size or row[1] != stat.st_mtime
+
+    def _mark(self, path):
+        stat = path.stat()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sources (path, size, mtime) VALUES (?, ?, ?)",
+            (str(path.resolve()), stat.st_size, stat.st_mtime),
+        )
+
+    def sync(self, csv_dir):
+        """
+        Import monthly CSVs and articles.csv that are new or changed since the last sync.
+
+        Returns:
+            Number of rows imported
+        """
+        csv_dir = Path(csv_dir)
+        imported = 0
+        for path in sorted(csv_dir.glob("*-copwatchdog.csv")):
+            with self._lock:
+                if not self._source_changed(path):
+                    continue
+            try:
+                imported += self._import_monthly(path)
+            except Exception as e:
+                logging.warning(f"Registry: failed to import {path}: {e}")
+        articles_path = csv_dir / "articles.csv"
+        if articles_path.exists():
+            with self._lock:
+                changed = self._source_changed(articles_path)
+            if changed:
+                try:
+                    imported += self._import_articles(articles_path)
+                except Exception as e:
+                    logging.warning(f"Registry: failed to import {articles_path}: {e}")
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM officers").fetchone()[0]
+        logging.info(f"Registry: imported {imported} rows from {csv_dir}; {count} officers known")
+        return imported
+
+    def _import_monthly(self, path):
+        verified_at = path.stat().st_mtime
+        rows = 0
+        with path.open("r", newline="", encoding="utf-8") as f, self._lock, self._conn:
+            for row in csv.DictReader(f):
+                fields = {FIELD_FOR_COLUMN[c]: v for c, v in row.items() if c in FIELD_FOR_COLUMN}
+                phases = [phase for phase, key in PHASE_KEY_FIELD.items() if (fields.get(key) or "") not in ("", *UNVERIFIED_VALUES)]
+                if not phases and not self._keys(fields):
+                    continue
+                self._upsert(row.get("First", ""), row.get("Last", ""), fields, verified_at, phases, keep_unchanged=True)
+                rows += 1
+            self._mark(path)
+        logging.info(f"Registry: imported {rows} officers from {path}")
+        return rows
+
+    def _import_articles(self, path):
+        # An officer with stored articles has has_articles = Y as of the file's last write
+        verified_at = path.stat().st_mtime
+        rows = 0
+        with path.open("r", newline="", encoding="utf-8") as f, self._lock, self._conn:
+            seen = set()
+            for row in csv.DictReader(f):
+                badge = _identifier(row.get("badge"))
+                if not badge or badge in seen:
+                    continue
+                seen.add(badge)
+                found = self._conn.execute("SELECT officer_id FROM officer_keys WHERE key = ?", (f"badge:{badge}",)).fetchone()
+                if found:
+                    self._conn.execute(
+                        "UPDATE fields SET value = 'Y' WHERE officer_id = ? AND field = 'has_articles' AND verified_at <= ?",
+                        (found[0], verified_at),
+                    )
+                    rows += 1
+            self._mark(path)
+        return rows
+
+    def record_verified(self, record, phases):
+        """Store the fields of phases a run actually fetched for record, verified now."""
+        if not phases:
+            return
+        with self._lock, self._conn:
+            self._upsert(record.get("First", ""), record.get("Last", ""), record, time.time(), phases)
+
+    def mark_source(self, path):
+        """Do not import path on the next sync (it was written by a run that recorded its own verifications)."""
+        with self._lock, self._conn:
+            self._mark(Path(path))
+
+    def fresh_fields(self, record):
+        """
+        Join a trials record against the registry by (unambiguous) name.
+
+        Returns:
+            Dict of phase -> {field: value} for every phase whose officer was found
+            and whose fields were all verified within the TTL
+        """
+        with self._lock:
+            ids = [r[0] for r in self._conn.execute(
+                "SELECT officer_id FROM officer_names WHERE name_key = ?",
+                (name_key(record.get("First"), record.get("Last")),),
+            )]
+            if len(ids) != 1:
+                return {}
+            stored = {
+                field: (value, verified_at)
+                for field, value, verified_at in self._conn.execute(
+                    "SELECT field, value, verified_at FROM fields WHERE officer_id = ?", (ids[0],)
+                )
+            }
+        cutoff = time.time() - self.ttl_seconds
+        fresh = {}
+        for phase, phase_fields in PHASE_FIELDS.items():
+            key_value = stored.get(PHASE_KEY_FIELD[phase])
+            if not key_value or not key_value[0]:
+                continue
+            if all(field in stored and stored[field][1] >= cutoff for field in phase_fields):
+                fresh[phase] = {field: stored[field][0] for field in phase_fields}
+        return fresh
+
+    def stats(self):
+        return ", ".join(f"{phase} served for {count} records" for phase, count in self.served.items())
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
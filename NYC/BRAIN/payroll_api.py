@@ -0,0 +1,174 @@
+"""
+NYC Citywide Payroll (dataset k397-673e) access through the Socrata SODA API.
+
+Instead of driving the Open Data explorer once per officer, THOTH sends one
+batched SoQL query for every last name in the run and matches rows in memory.
+Rows are converted to the same 17-cell layout the explorer table shows, so the
+existing payroll matching and field mapping work unchanged.
+"""
+import json
+import logging
+import os
+from datetime import datetime
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+from identity import Identity
+
+SODA_ENDPOINT = os.getenv("THOTH_SODA_ENDPOINT", "https://data.cityofnewyork.us/resource/k397-673e.json")
+
+# Column order of the explorer table (cells[0] .. cells[16])
+PAYROLL_COLUMNS = [
+    "fiscal_year", "payroll_number", "agency_name", "last_name", "first_name",
+    "mid_init", "agency_start_date", "work_location_borough", "title_description",
+    "leave_status_as_of_june_30", "base_salary", "pay_basis", "regular_hours",
+    "regular_gross_paid", "ot_hours", "total_ot_paid", "total_other_pay",
+]
+MONEY_COLUMNS = {"base_salary", "regular_gross_paid", "total_ot_paid", "total_other_pay"}
+HOURS_COLUMNS = {"regular_hours", "ot_hours"}
+
+
+def _soql_quote(value):
+    """Quote a string literal for SoQL."""
+    return "'" + value.replace("'", "''") + "'"
+
+def build_where(last_names, fiscal_years):
+    """
+    Build the SoQL $where clause for a batch of officers.
+
+    Args:
+        last_names: Iterable of last names (any case), or None for the whole NYPD slice
+        fiscal_years: Iterable of fiscal years to include
+
+    Returns:
+        SoQL where clause string
+    """
+    years = sorted({int(y) for y in fiscal_years}, reverse=True)
+    where = (
+        "upper(agency_name) = 'POLICE DEPARTMENT'"
+        f" AND fiscal_year in ({', '.join(str(y) for y in years)})"
+    )
+    if last_names is not None:
+        names = sorted({n.upper() for n in last_names if n})
+        where += f" AND upper(last_name) in ({', '.join(_soql_quote(n) for n in names)})"
+    return where
+
+def _format_number(value, money=False):
+    """
+    Format a raw SODA number the way the explorer table displays it.
+
+    Examples:
+        '58041', money=True -> '$58,041.00'
+        '2080' -> '2,080'
+        '537.37' -> '537.37'
+    """
+    if value in (None, ""):
+        return ""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return str(value)
+    if money:
+        return f"${number:,.2f}"
+    if number.is_integer():
+        return f"{int(number):,}"
+    return f"{number:,.2f}".rstrip("0").rstrip(".")
+
+def _format_date(value):
+    """Convert a SODA floating timestamp ('2011-07-01T00:00:00.000') to MM/DD/YYYY."""
+    if not value:
+        return ""
+    try:
+        return datetime.strptime(value[:10], "%Y-%m-%d").strftime("%m/%d/%Y")
+    except ValueError:
+        return value
+
+def row_to_cells(row):
+    """
+    Convert a SODA JSON row to the explorer table's 17-cell layout.
+
+    Args:
+        row: Dict from the SODA JSON response
+
+    Returns:
+        List of 17 display strings
+    """
+    cells = []
+    for col in PAYROLL_COLUMNS:
+        value = row.get(col, "")
+        if col in MONEY_COLUMNS:
+            cells.append(_format_number(value, money=True))
+        elif col in HOURS_COLUMNS:
+            cells.append(_format_number(value))
+        elif col == "agency_start_date":
+            cells.append(_format_date(value))
+        else:
+            cells.append(str(value).strip() if value is not None else "")
+    return cells
+
+def row_identity(cells):
+    """Identity of a 17-cell payroll row (first, last, middle initial, agency start)."""
+    try:
+        agency_start = datetime.strptime(cells[6], "%m/%d/%Y")
+    except ValueError:
+        agency_start = None
+    return Identity(first=cells[4], last=cells[3], initial=cells[5], service_start=agency_start)
+
+def _get_json(params, endpoint, app_token, timeout):
+    url = f"{endpoint}?{urlencode(params)}"
+    headers = {"Accept": "application/json"}
+    if app_token:
+        headers["X-App-Token"] = app_token
+    with urlopen(Request(url, headers=headers), timeout=timeout) as resp:
+        return json.loads(resp.read().decode("utf-8"))
+
+def fetch_payroll_rows(last_names, fiscal_years, endpoint=SODA_ENDPOINT, app_token=None,
+                       batch_size=100, page_limit=50000, timeout=60):
+    """
+    Fetch NYPD payroll rows for a set of last names with batched SoQL queries.
+
+    Names are sent in batches of batch_size to keep URLs short; each batch is
+    paged with $offset until the server returns fewer than page_limit rows.
+
+    Args:
+        last_names: Iterable of last names to query, or None to download every
+                    NYPD row for the given fiscal years
+        fiscal_years: Iterable of fiscal years to include
+        endpoint: SODA resource URL (overridable for local testing)
+        app_token: Optional Socrata app token (raises the API rate limit)
+        batch_size: Last names per query
+        page_limit: Rows per page ($limit)
+        timeout: HTTP timeout in seconds
+
+    Returns:
+        List of rows in 17-cell explorer layout
+    """
+    app_token = app_token or os.getenv("SODA_APP_TOKEN")
+    if last_names is None:
+        names = None
+        batches = [None]
+    else:
+        names = sorted({n.upper() for n in last_names if n})
+        batches = [names[i:i + batch_size] for i in range(0, len(names), batch_size)]
+    cells_rows = []
+    for batch_num, batch in enumerate(batches, start=1):
+        offset = 0
+        while True:
+            params = {
+                "$select": ", ".join(PAYROLL_COLUMNS),
+                "$where": build_where(batch, fiscal_years),
+                "$order": ":id",  # stable ordering for $offset paging
+                "$limit": page_limit,
+                "$offset": offset,
+            }
+            rows = _get_json(params, endpoint, app_token, timeout)
+            cells_rows.extend(row_to_cells(r) for r in rows)
+            logging.info(f"Payroll API: batch {batch_num} offset {offset} returned {len(rows)} rows")
+            if len(rows) < page_limit:
+                break
+            offset += page_limit
+    if names is None:
+        logging.info(f"Payroll API: fetched {len(cells_rows)} NYPD rows")
+    else:
+        logging.info(f"Payroll API: fetched {len(cells_rows)} rows for {len(names)} last names")
+    return cells_rows
@@ -0,0 +1,143 @@
+"""
+Local SQLite snapshot of the NYPD slice of NYC Citywide Payroll.
+
+The payroll dataset changes once a year, so `main.py --payroll-sync` downloads
+the NYPD rows for the priority/fallback fiscal years once and stores them with
+an index on normalized (last, first, fiscal_year). Officer lookups then hit
+the local index instead of the Open Data explorer.
+"""
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS payroll (
+    fiscal_year TEXT NOT NULL,
+    last_norm   TEXT NOT NULL,
+    first_norm  TEXT NOT NULL,
+    cells       TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_payroll_name_year ON payroll (last_norm, first_norm, fiscal_year);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class PayrollSnapshot:
+    """
+    Read/write access to the payroll snapshot database.
+
+    Keys are normalized by the caller (main.py owns name normalization), so
+    this class only stores and retrieves 17-cell explorer rows.
+
+    Args:
+        path: Path to the SQLite file
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Shared by enrichment worker threads; sqlite3 serializes through our lock
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.executescript(SCHEMA)
+
+    @classmethod
+    def open_existing(cls, path):
+        """
+        Open a snapshot only if it has been synced before.
+
+        Returns:
+            PayrollSnapshot, or None if the file does not exist or is empty
+        """
+        if not Path(path).exists():
+            return None
+        snapshot = cls(path)
+        if not snapshot.row_count():
+            snapshot.close()
+            return None
+        return snapshot
+
+    def replace_rows(self, rows, key_fn):
+        """
+        Replace the snapshot contents in one transaction.
+
+        Args:
+            rows: Iterable of 17-cell payroll rows
+            key_fn: Function mapping a row to (last_norm, first_norm)
+
+        Returns:
+            Number of rows stored
+        """
+        records = []
+        years = set()
+        for cells in rows:
+            last_norm, first_norm = key_fn(cells)
+            records.append((cells[0], last_norm, first_norm, json.dumps(cells)))
+            years.add(cells[0])
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM payroll")
+            self._conn.executemany(
+                "INSERT INTO payroll (fiscal_year, last_norm, first_norm, cells) VALUES (?, ?, ?, ?)",
+                records,
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('synced_at', ?)",
+                (datetime.now().isoformat(timespec="seconds"),),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('fiscal_years', ?)",
+                (",".join(sorted(years, reverse=True)),),
+            )
+        logging.info(f"Payroll snapshot: stored {len(records)} rows for fiscal years {sorted(years, reverse=True)} in {self.path}")
+        return len(records)
+
+    def lookup(self, last_norms, fiscal_years):
+        """
+        Return all rows for any of the normalized last names in the given fiscal years.
+
+        Each stored row is returned once, however many of the names match it.
+
+        Args:
+            last_norms: Iterable of normalized last names (variants of one officer's name)
+            fiscal_years: Iterable of fiscal years (strings)
+
+        Returns:
+            List of 17-cell payroll rows, in snapshot order
+        """
+        names = sorted(set(last_norms))
+        years = list(fiscal_years)
+        if not names or not years:
+            return []
+        with self._lock:
+            cur = self._conn.execute(
+                f"SELECT cells FROM payroll WHERE last_norm IN ({', '.join('?' for _ in names)}) "
+                f"AND fiscal_year IN ({', '.join('?' for _ in years)}) ORDER BY rowid",
+                [*names, *years],
+            )
+            return [json.loads(row[0]) for row in cur.fetchall()]
+
+    def fiscal_years(self):
+        """Return the fiscal years present in the snapshot (newest first)."""
+        value = self.meta("fiscal_years")
+        return value.split(",") if value else []
+
+    def meta(self, key):
+        """Return a metadata value, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def row_count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM payroll").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,179 @@
+"""
+PostgreSQL output sink (--db-sink).
+
+Writes a run's officer rows, articles and enrichment values straight into
+staging tables, so HERMES does not have to parse the CSVs back in. Each
+batch is streamed into a temporary table with COPY FROM STDIN and then
+upserted into the staging table on its key:
+
+    <schema>.officers_scraped    - one row per source_id, monthly CSV columns
+    <schema>.articles_scraped    - one row per article_id
+    <schema>.enrichment_scraped  - one row per (source_id, column_name)
+
+All staging columns are text, exactly as they would appear in the CSVs;
+typing and validation stay in the ETL. The tables are created on first use.
+"""
+import csv
+import io
+import logging
+import re
+
+from psycopg2 import sql
+
+from rescrape_merge import PLACEHOLDER_BADGES
+
+DEFAULT_SCHEMA = "cwd_staging"
+DEFAULT_BATCH_SIZE = 500
+
+ARTICLE_COLUMNS = ["article_id", "badge", "first_name", "last_name", "title", "source", "date_published", "url"]
+ENRICHMENT_COLUMNS = ["source_id", "column_name", "new_value"]
+
+
+def column_name(header):
+    """Staging column for a CSV header ('# Complaints' -> 'num_complaints', 'PCT URL' -> 'pct_url')."""
+    name = header.strip().lower().replace("#", "num ")
+    return re.sub(r"[^a-z0-9]+", "_", name).strip("_")
+
+def record_source_id(record, version_tag):
+    """
+    source_id of an output row: the record's own, else '<version_tag>-<badge>'.
+
+    Returns:
+        source_id string, or None when the officer has no usable badge
+    """
+    if record.get("source_id"):
+        return record["source_id"]
+    badge = str(record.get("Badge", record.get("badge", "")) or "").strip()
+    if not version_tag or badge.upper() in PLACEHOLDER_BADGES:
+        return None
+    return f"{version_tag}-{badge}"
+
+
+class PostgresSink:
+    """
+    Batched COPY + upsert writer for the staging tables.
+
+    Args:
+        conn: Open psycopg2 connection (the sink commits once per batch)
+        csv_fieldnames: Monthly CSV header, in order
+        schema: Staging schema
+        batch_size: Rows per COPY
+    """
+
+    def __init__(self, conn, csv_fieldnames, schema=DEFAULT_SCHEMA, batch_size=DEFAULT_BATCH_SIZE):
+        self.conn = conn
+        self.schema = schema
+        self.batch_size = max(1, int(batch_size))
+        self.csv_fieldnames = list(csv_fieldnames)
+        self.officer_columns = ["source_id", "version_tag"] + [column_name(h) for h in self.csv_fieldnames]
+        self._ensure_tables()
+
+    def _table(self, name):
+        return sql.Identifier(self.schema, name)
+
+    def _ensure_tables(self):
+        def text_columns(columns, skip=()):
+            return sql.SQL(", ").join(
+                sql.SQL("{} text").format(sql.Identifier(c)) for c in columns if c not in skip
+            )
+
+        with self.conn.cursor() as cursor:
+            cursor.execute(sql.SQL("CREATE SCHEMA IF NOT EXISTS {}").format(sql.Identifier(self.schema)))
+            cursor.execute(sql.SQL(
+                "CREATE TABLE IF NOT EXISTS {} (source_id text PRIMARY KEY, {}, loaded_at timestamptz NOT NULL DEFAULT now())"
+            ).format(self._table("officers_scraped"), text_columns(self.officer_columns, skip=("source_id",))))
+            cursor.execute(sql.SQL(
+                "CREATE TABLE IF NOT EXISTS {} (article_id integer PRIMARY KEY, {}, loaded_at timestamptz NOT NULL DEFAULT now())"
+            ).format(self._table("articles_scraped"), text_columns(ARTICLE_COLUMNS, skip=("article_id",))))
+            cursor.execute(sql.SQL(
+                "CREATE TABLE IF NOT EXISTS {} (source_id text, column_name text, new_value text, "
+                "loaded_at timestamptz NOT NULL DEFAULT now(), PRIMARY KEY (source_id, column_name))"
+            ).format(self._table("enrichment_scraped")))
+        self.conn.commit()
+
+    def _copy_upsert(self, table, columns, keys, rows):
+        """
+        COPY rows into a temporary copy of table, then upsert them on keys.
+
+        Rows repeating a key keep the last occurrence (an officer tried twice in
+        one month is one staging row, as in the monthly CSV's later row).
+
+        Returns:
+            Number of rows upserted
+        """
+        unique = {}
+        for row in rows:
+            unique[tuple(row[columns.index(k)] for k in keys)] = row
+        rows = list(unique.values())
+        if not rows:
+            return 0
+
+        target = self._table(table)
+        temp = sql.Identifier(f"_thoth_{table}")
+        column_list = sql.SQL(", ").join(map(sql.Identifier, columns))
+        updates = [
+            sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(c)) for c in columns if c not in keys
+        ] + [sql.SQL("loaded_at = now()")]
+        upsert = sql.SQL(
+            "INSERT INTO {target} ({columns}) SELECT {columns} FROM {temp} "
+            "ON CONFLICT ({keys}) DO UPDATE SET {updates}"
+        ).format(
+            target=target, temp=temp, columns=column_list,
+            keys=sql.SQL(", ").join(map(sql.Identifier, keys)), updates=sql.SQL(", ").join(updates),
+        )
+        copy = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv)").format(temp, column_list)
+
+        written = 0
+        try:
+            with self.conn.cursor() as cursor:
+                cursor.execute(sql.SQL(
+                    "CREATE TEMP TABLE IF NOT EXISTS {} (LIKE {} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+                ).format(temp, target))
+                for start in range(0, len(rows), self.batch_size):
+                    batch = rows[start:start + self.batch_size]
+                    buffer = io.StringIO()
+                    csv.writer(buffer).writerows(batch)
+                    buffer.seek(0)
+                    cursor.copy_expert(copy.as_string(self.conn), buffer)
+                    cursor.execute(upsert)
+                    self.conn.commit()
+                    written += len(batch)
+        except Exception:
+            self.conn.rollback()
+            raise
+        logging.info(f"DB sink: upserted {written} rows into {self.schema}.{table}")
+        return written
+
+    def write_records(self, records, version_tag, row_fn):
+        """
+        Upsert officer rows on source_id.
+
+        Args:
+            records: Output records (as written to the monthly CSV)
+            version_tag: Month of the run, for records without a source_id
+            row_fn: Function mapping a record to its CSV row dict
+
+        Returns:
+            Tuple of (rows upserted, records skipped for lack of a source_id)
+        """
+        rows = []
+        skipped = 0
+        for record in records:
+            source_id = record_source_id(record, version_tag)
+            if source_id is None:
+                skipped += 1
+                continue
+            csv_row = row_fn(record)
+            rows.append([source_id, version_tag] + [csv_row.get(h, "") for h in self.csv_fieldnames])
+        if skipped:
+            logging.info(f"DB sink: {skipped} officers without a badge have no source_id and were not loaded")
+        return self._copy_upsert("officers_scraped", self.officer_columns, ("source_id",), rows), skipped
+
+    def write_articles(self, articles):
+        """Upsert articles (with article_id assigned) on article_id."""
+        rows = [[article.get(c, "") for c in ARTICLE_COLUMNS] for article in articles]
+        return self._copy_upsert("articles_scraped", ARTICLE_COLUMNS, ("article_id",), rows)
+
+    def write_enrichment(self, rows):
+        """Upsert (source_id, column_name, new_value) rows on (source_id, column_name)."""
+        return self._copy_upsert("enrichment_scraped", ENRICHMENT_COLUMNS, ("source_id", "column_name"), [list(r) for r in rows])
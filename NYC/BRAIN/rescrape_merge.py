@@ -0,0 +1,211 @@
+"""
+Rescrape merge: patch re-enriched officers into existing monthly CSVs.
+
+Rows are matched through indexes instead of (First, Last) alone, which
+collides for same-name officers:
+
+    1. source_id badge  - '2510-12345' -> Badge 12345 (when the month matches the file)
+    2. current badge    - the record's badge after enrichment
+    3. name fallback    - same first/last name, only if it is not ambiguous
+                          (the candidate rows do not carry different badges)
+
+Only the columns in RESCRAPE_FIELD_MAP are touched, and only when the
+rescraped record has a value for them that differs from the row. Records are
+grouped by the monthly file their source_id points at, so a multi-month
+rescrape reads and writes each file once.
+"""
+import csv
+import logging
+import re
+from pathlib import Path
+
+# Monthly CSV column -> rescraped record field. Trial columns (Date, Time,
+# Rank, Room, Case Type) always keep the existing values.
+RESCRAPE_FIELD_MAP = (
+    ("Badge", "badge"),
+    ("PCT", "precinct_number"),
+    ("PCT URL", "precinct_link"),
+    ("Race", "race"),
+    ("Gender", "gender"),
+    ("Tax ID", "tax_id"),
+    ("Email", "email"),
+    ("Current Assignment", "current_assignment"),
+    ("Assignment Start", "assignment_start"),
+    ("Previous Assignments", "previous_assignments"),
+    ("Officer Image", "officer_image"),
+    ("Profile URL", "profile_url"),
+    ("Started", "service_start"),
+    ("Last Earned", "last_earned"),
+    ("Disciplined", "has_discipline"),
+    ("Articles", "has_articles"),
+    ("# Complaints", "num_complaints"),
+    ("# Allegations", "num_allegations"),
+    ("# Substantiated", "num_substantiated"),
+    ("# Charges", "num_substantiated_charges"),
+    ("# Unsubstantiated", "num_unsubstantiated"),
+    ("# Guidelined", "num_within_guidelines"),
+    ("# Lawsuits", "num_lawsuits"),
+    ("Total Settlements", "total_settlements"),
+    ("Status", "leave_status_as_of_june_30"),
+    ("Base Salary", "base_salary"),
+    ("Pay Basis", "pay_basis"),
+    ("Regular Hours", "regular_hours"),
+    ("Regular Gross Paid", "regular_gross_paid"),
+    ("OT Hours", "ot_hours"),
+    ("Total OT Paid", "total_ot_paid"),
+    ("Total Other Pay", "total_other_pay"),
+)
+
+# Badge values that do not identify an officer
+PLACEHOLDER_BADGES = {"", "N/A", "NOT_FOUND", "UNVERIFIED"}
+
+SOURCE_ID_RE = re.compile(r"^(?P<month>\d{4})-(?P<badge>.+)$")
+MONTHLY_CSV_RE = re.compile(r"^(?P<month>\d{4})-copwatchdog\.csv$")
+
+
+def _badge_key(value):
+    value = str(value or "").strip()
+    return None if value.upper() in PLACEHOLDER_BADGES else value
+
+def _name_key(first, last):
+    return ((first or "").strip().lower(), (last or "").strip().lower())
+
+def split_source_id(source_id):
+    """
+    Split a 'YYMM-badge' source_id.
+
+    Returns:
+        Tuple of (month, badge), or (None, None) if it is not in that format
+    """
+    m = SOURCE_ID_RE.match(source_id or "")
+    return (m.group("month"), m.group("badge")) if m else (None, None)
+
+def month_of_csv(path):
+    """Version tag of a monthly CSV ('2510-copwatchdog.csv' -> '2510'), or None."""
+    m = MONTHLY_CSV_RE.match(Path(path).name)
+    return m.group("month") if m else None
+
+def group_by_monthly_file(records, default_path, csv_dir):
+    """
+    Assign each rescraped record to the monthly CSV it belongs to.
+
+    A record goes to <month>-copwatchdog.csv when its source_id names a month
+    whose file exists, otherwise to default_path (the run's monthly CSV).
+
+    Returns:
+        Dict of Path -> list of records, default_path first
+    """
+    groups = {Path(default_path): []}
+    for record in records:
+        month, _ = split_source_id(record.get("source_id"))
+        path = Path(csv_dir) / f"{month}-copwatchdog.csv" if month else None
+        if path is None or not path.exists():
+            path = Path(default_path)
+        groups.setdefault(path, []).append(record)
+    return groups
+
+def load_monthly_csv(path):
+    """
+    Read a monthly CSV once.
+
+    Returns:
+        List of row dicts
+    """
+    with Path(path).open("r", newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+class RowIndex:
+    """Badge and name indexes over a monthly CSV's rows (row positions per key)."""
+
+    def __init__(self, rows):
+        self.by_badge = {}
+        self.by_name = {}
+        for pos, row in enumerate(rows):
+            badge = _badge_key(row.get("Badge"))
+            if badge:
+                self.by_badge.setdefault(badge, []).append(pos)
+            self.by_name.setdefault(_name_key(row.get("First"), row.get("Last")), []).append(pos)
+
+    def match(self, rows, record, month=None):
+        """
+        Find the rows belonging to a rescraped record.
+
+        Args:
+            rows: The indexed rows
+            record: Rescraped record (source_id, badge, First, Last)
+            month: Version tag of the file, used to trust source_id badges
+
+        Returns:
+            Tuple of (row positions, how) where how is 'source_id', 'badge',
+            'name', 'ambiguous' or None when nothing matched
+        """
+        sid_month, sid_badge = split_source_id(record.get("source_id"))
+        sid_badge = _badge_key(sid_badge)
+        if sid_badge and (month is None or sid_month == month) and sid_badge in self.by_badge:
+            return self.by_badge[sid_badge], "source_id"
+
+        badge = _badge_key(record.get("badge"))
+        if badge and badge in self.by_badge:
+            return self.by_badge[badge], "badge"
+
+        candidates = self.by_name.get(_name_key(record.get("First"), record.get("Last")), [])
+        if not candidates:
+            return [], None
+        known = badge or sid_badge
+        badges = {_badge_key(rows[pos].get("Badge")) for pos in candidates} - {None}
+        if known:
+            # Rows without a badge, or with this officer's badge, are the same officer
+            positions = [pos for pos in candidates if _badge_key(rows[pos].get("Badge")) in (None, known)]
+            return (positions, "name") if positions else ([], None)
+        if len(badges) > 1:
+            return [], "ambiguous"
+        return candidates, "name"
+
+
+def merge_rescraped(rows, records, month=None, field_map=RESCRAPE_FIELD_MAP):
+    """
+    Patch rescraped records into monthly CSV rows in place.
+
+    Args:
+        rows: Rows from load_monthly_csv()
+        records: Rescraped records for this file
+        month: Version tag of the file (see RowIndex.match)
+        field_map: (column, record field) pairs to copy
+
+    Returns:
+        Dict with counts: rows_updated, fields_changed, matched, unmatched, ambiguous
+    """
+    index = RowIndex(rows)
+    stats = {"rows_updated": 0, "fields_changed": 0, "matched": 0, "unmatched": 0, "ambiguous": 0}
+    touched = set()
+    for record in records:
+        positions, how = index.match(rows, record, month)
+        name = f"{record.get('First', '')} {record.get('Last', '')}".strip()
+        if how == "ambiguous":
+            stats["ambiguous"] += 1
+            logging.warning(f"Rescrape merge: '{name}' matches several officers by name and has no badge; skipped")
+            continue
+        if not positions:
+            stats["unmatched"] += 1
+            logging.warning(f"Rescrape merge: no row for '{name}' (source_id={record.get('source_id')}, badge={record.get('badge')})")
+            continue
+        stats["matched"] += 1
+        for pos in positions:
+            row = rows[pos]
+            changed = 0
+            for column, field in field_map:
+                value = record.get(field)
+                # A field the rescrape did not fill must not clear the existing cell
+                if value is None or value == "":
+                    continue
+                # CSV cells are strings; compare as written so 0 vs '0' is not a change
+                if row.get(column, "") != str(value):
+                    row[column] = value
+                    changed += 1
+            if changed:
+                touched.add(pos)
+                stats["fields_changed"] += changed
+        logging.info(f"Rescrape merge: {name} matched {len(positions)} row(s) by {how}")
+    stats["rows_updated"] = len(touched)
+    return stats
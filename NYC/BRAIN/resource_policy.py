@@ -0,0 +1,234 @@
+"""
+Request interception for THOTH browser contexts.
+
+THOTH only reads text from the trials page, 50-a.org and the payroll explorer,
+but every page load also pulls images, fonts, media and third-party analytics.
+A ResourcePolicy aborts those requests at the browser-context level, and
+ResourceStats counts what each rule blocked so the savings show up in the log.
+Aborted requests are never downloaded, so to measure bytes saved every
+SAMPLE_EVERY-th request a rule would block is let through and its
+Content-Length recorded; a rule's bytes saved are its blocked count times the
+mean size of its sampled requests. Rules with no sized sample report requests
+only.
+
+Policies:
+    off    - no interception (the default)
+    light  - block images, media, fonts and analytics/ad domains
+    strict - light, plus stylesheets, plus scripts on 50-a profile pages
+             (profiles are server-rendered; search still runs with JS)
+"""
+import logging
+import re
+import threading
+from urllib.parse import urlparse
+
+# Domains that only serve analytics, ads, tag managers or web fonts
+TRACKER_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "hotjar.com",
+    "nr-data.net",
+    "newrelic.com",
+    "segment.io",
+    "siteimproveanalytics.com",
+    "siteimproveanalytics.io",
+    "fonts.googleapis.com",
+    "fonts.gstatic.com",
+)
+
+# One in this many requests a rule matches is loaded and measured instead of aborted
+SAMPLE_EVERY = 25
+
+
+class ResourcePolicy:
+    """
+    Which requests a browser context should abort.
+
+    Args:
+        name: Policy name (for logging)
+        blocked_types: Playwright resource types to abort (image, font, ...)
+        blocked_domains: Domains (and their subdomains) to abort
+        no_js_pages: Regexes for document URLs whose script requests are aborted
+    """
+
+    def __init__(self, name, blocked_types=(), blocked_domains=(), no_js_pages=()):
+        self.name = name
+        self.blocked_types = frozenset(blocked_types)
+        self.blocked_domains = tuple(blocked_domains)
+        self.no_js_pages = [re.compile(p) for p in no_js_pages]
+
+    @property
+    def active(self):
+        return bool(self.blocked_types or self.blocked_domains or self.no_js_pages)
+
+    def block_reason(self, resource_type, url, page_url=None):
+        """
+        Decide whether a request is blocked.
+
+        Args:
+            resource_type: Playwright request.resource_type
+            url: Request URL
+            page_url: URL of the document that issued the request, if known
+
+        Returns:
+            Rule label (e.g. 'type:image', 'domain:doubleclick.net', 'no-js'), or None to allow
+        """
+        if resource_type == "document":
+            return None
+        if resource_type in self.blocked_types:
+            return f"type:{resource_type}"
+        host = (urlparse(url).hostname or "").lower()
+        for domain in self.blocked_domains:
+            if host == domain or host.endswith("." + domain):
+                return f"domain:{domain}"
+        if resource_type == "script" and page_url:
+            for pattern in self.no_js_pages:
+                if pattern.search(page_url):
+                    return "no-js"
+        return None
+
+
+POLICIES = {
+    "off": ResourcePolicy("off"),
+    "light": ResourcePolicy(
+        "light",
+        blocked_types=("image", "media", "font"),
+        blocked_domains=TRACKER_DOMAINS,
+    ),
+    "strict": ResourcePolicy(
+        "strict",
+        blocked_types=("image", "media", "font", "stylesheet"),
+        blocked_domains=TRACKER_DOMAINS,
+        no_js_pages=(r"50-a\.org/officer/",),
+    ),
+}
+
+
+class ResourceStats:
+    """
+    Per-run request counters shared by every context (and worker thread).
+
+    blocked: requests aborted per rule
+    sampled: per rule, [requests let through to be measured, of those with a size, their bytes]
+    loaded: requests that went through; bytes counted from Content-Length when present
+
+    Args:
+        sample_every: Let one in this many matched requests through per rule (0 = never)
+    """
+
+    def __init__(self, sample_every=SAMPLE_EVERY):
+        self._lock = threading.Lock()
+        self.sample_every = sample_every
+        self.blocked = {}
+        self.matched = {}
+        self.sampled = {}
+        self.loaded_requests = 0
+        self.loaded_bytes = 0
+
+    def take_sample(self, rule):
+        """
+        Count a request the rule matched and decide whether it is loaded as a size sample.
+
+        Returns:
+            True if the request should go through (it is then not counted as blocked)
+        """
+        with self._lock:
+            seen = self.matched.get(rule, 0)
+            self.matched[rule] = seen + 1
+            if self.sample_every and seen % self.sample_every == self.sample_every - 1:
+                self.sampled.setdefault(rule, [0, 0, 0])[0] += 1
+                return True
+            return False
+
+    def record_blocked(self, rule):
+        with self._lock:
+            self.blocked[rule] = self.blocked.get(rule, 0) + 1
+
+    def record_sample(self, rule, content_length):
+        with self._lock:
+            if content_length:
+                sample = self.sampled.setdefault(rule, [0, 0, 0])
+                sample[1] += 1
+                sample[2] += content_length
+
+    def record_loaded(self, content_length):
+        with self._lock:
+            self.loaded_requests += 1
+            if content_length:
+                self.loaded_bytes += content_length
+
+    def bytes_saved(self, rule):
+        """Blocked count times the mean sampled size, or None if no sample had a size."""
+        _, sized, total = self.sampled.get(rule, (0, 0, 0))
+        return self.blocked.get(rule, 0) * total / sized if sized else None
+
+    def log_summary(self, policy_name):
+        """Log requests and measured bytes saved per rule, plus the requests and bytes still loaded."""
+        with self._lock:
+            total_requests = sum(self.blocked.values())
+            saved = {rule: self.bytes_saved(rule) for rule in self.blocked}
+            measured = [b for b in saved.values() if b is not None]
+            logging.info(
+                f"Resources: policy '{policy_name}' blocked {total_requests} requests, saving about "
+                f"{sum(measured) / 1_000_000:.1f} MB ({len(measured)} of {len(saved)} rules sized from samples); "
+                f"loaded {self.loaded_requests} requests ({self.loaded_bytes / 1_000_000:.1f} MB with known size)"
+            )
+            for rule in sorted(self.blocked, key=self.blocked.get, reverse=True):
+                sampled, sized, _ = self.sampled.get(rule, (0, 0, 0))
+                size = f"~{saved[rule] / 1_000_000:.1f} MB saved" if saved[rule] is not None else "bytes not measured"
+                logging.info(f"Resources:   {rule}: {self.blocked[rule]} requests, {size} ({sized} of {sampled} samples sized)")
+
+
+def _page_url(request):
+    """URL of the frame that issued a request (None for service workers and detached frames)."""
+    try:
+        return request.frame.url
+    except Exception:
+        return None
+
+def install(context, policy, stats):
+    """
+    Attach a policy to a Playwright browser context.
+
+    Routing every request disables Playwright's HTTP cache for the context, so
+    nothing is installed for an inactive ('off') policy.
+
+    Args:
+        context: Playwright BrowserContext
+        policy: ResourcePolicy to enforce
+        stats: ResourceStats to record into
+    """
+    if not policy.active:
+        return
+
+    samples = {}  # Sampled request -> rule it would have been blocked by
+
+    def handle(route, request):
+        rule = policy.block_reason(request.resource_type, request.url, _page_url(request))
+        if rule:
+            if stats.take_sample(rule):
+                samples[request] = rule
+                route.continue_()
+                return
+            stats.record_blocked(rule)
+            route.abort("blockedbyclient")
+        else:
+            route.continue_()
+
+    def on_response(response):
+        try:
+            length = int(response.headers.get("content-length") or 0)
+        except ValueError:
+            length = 0
+        rule = samples.pop(response.request, None)
+        if rule:
+            stats.record_sample(rule, length)
+        else:
+            stats.record_loaded(length)
+
+    context.route("**/*", handle)
+    context.on("response", on_response)
+    context.on("requestfailed", lambda request: samples.pop(request, None))
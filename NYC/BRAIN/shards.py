@@ -0,0 +1,158 @@
+"""
+Sharded runs for large backfills (--shard i/N and --merge-shards N).
+
+Each shard process scrapes only the officers whose identity hashes to its
+shard, so N processes (or machines sharing NYC/CSV) split one record list
+without coordinating. A shard writes its enriched records and their 50-a
+articles, tagged with their position in the full record list, to
+CSV/shards/<stem>.shard-<i>-of-<N>.jsonl instead of the final CSVs.
+
+--merge-shards N loads a complete set of shard files, restores the original
+record order and hands the records back to main.py's normal output path, so
+the monthly CSV, enrichment CSV and articles.csv (with article_id assigned
+after the existing maximum) come out as an unsharded run would write them.
+"""
+import json
+import logging
+import re
+import zlib
+from pathlib import Path
+
+SHARD_FILE_RE = re.compile(r"^(?P<stem>.+)\.shard-(?P<index>\d+)-of-(?P<count>\d+)\.jsonl$")
+
+
+def parse_shard_spec(spec):
+    """
+    Parse a shard spec 'i/N' (1-based).
+
+    Returns:
+        Tuple of (index, count)
+
+    Raises:
+        ValueError: If the spec is malformed or out of range
+    """
+    m = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", spec or "")
+    if not m:
+        raise ValueError(f"shard must look like i/N (e.g. 2/4), got '{spec}'")
+    index, count = int(m.group(1)), int(m.group(2))
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"shard index must be between 1 and {count}, got '{spec}'")
+    return index, count
+
+def shard_of(key, count):
+    """Deterministic 1-based shard for a key (CRC32, stable across processes and machines)."""
+    return zlib.crc32(key.encode("utf-8")) % count + 1
+
+def partition(records, index, count, key_fn):
+    """
+    Select this shard's records.
+
+    The same officer always lands in the same shard, whatever its position
+    in the list, so repeated trials of one officer are enriched once per shard.
+
+    Args:
+        records: Full record list
+        index: This shard (1-based)
+        count: Number of shards
+        key_fn: Function mapping a record to its identity string
+
+    Returns:
+        List of (row, record) where row is the record's position in records
+    """
+    return [(row, record) for row, record in enumerate(records) if shard_of(key_fn(record), count) == index]
+
+def shard_path(shard_dir, stem, index, count):
+    return Path(shard_dir) / f"{stem}.shard-{index}-of-{count}.jsonl"
+
+def write_shard(path, manifest, rows):
+    """
+    Write one shard's output.
+
+    Args:
+        path: Output .jsonl path
+        manifest: Dict describing the run (mode, version_tag, index, count, total_records)
+        rows: Iterable of (row, record, articles)
+
+    Returns:
+        Number of records written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".jsonl.tmp")
+    written = 0
+    with tmp_path.open("w", encoding="utf-8") as f:
+        f.write(json.dumps({"manifest": manifest}) + "\n")
+        for row, record, articles in rows:
+            f.write(json.dumps({"row": row, "record": record, "articles": articles or []}, default=str) + "\n")
+            written += 1
+    # A shard file only appears once complete, so merge never reads a half-written shard
+    tmp_path.replace(path)
+    logging.info(f"Shards: wrote {written} records for shard {manifest['index']}/{manifest['count']} to {path}")
+    return written
+
+def _read_shard(path):
+    with Path(path).open("r", encoding="utf-8") as f:
+        manifest = json.loads(f.readline())["manifest"]
+        rows = [json.loads(line) for line in f if line.strip()]
+    return manifest, rows
+
+def find_shard_set(shard_dir, count, stem_prefix=None):
+    """
+    Locate the shard files of one run.
+
+    Args:
+        shard_dir: Directory holding shard files
+        count: Expected number of shards
+        stem_prefix: Optional prefix (e.g. a version tag) to choose between runs
+
+    Returns:
+        Tuple of (stem, [path for shard 1..count])
+
+    Raises:
+        ValueError: If no complete set (or more than one) matches
+    """
+    found = {}
+    for path in Path(shard_dir).glob(f"*.shard-*-of-{count}.jsonl"):
+        m = SHARD_FILE_RE.match(path.name)
+        if not m or (stem_prefix and not m.group("stem").startswith(stem_prefix)):
+            continue
+        found.setdefault(m.group("stem"), {})[int(m.group("index"))] = path
+    complete = {stem: paths for stem, paths in found.items() if set(paths) == set(range(1, count + 1))}
+    if not complete:
+        partial = {stem: sorted(paths) for stem, paths in found.items()}
+        raise ValueError(f"no complete set of {count} shards in {shard_dir} (found: {partial or 'none'})")
+    if len(complete) > 1:
+        raise ValueError(f"several shard sets in {shard_dir}: {sorted(complete)}; pass --version-tag to choose")
+    stem, paths = complete.popitem()
+    return stem, [paths[i] for i in range(1, count + 1)]
+
+def load_shards(paths):
+    """
+    Merge shard files back into one run.
+
+    Returns:
+        Tuple of (manifest, records, articles) with records in their original
+        order and articles in record order
+
+    Raises:
+        ValueError: If the shards disagree about the run or rows are missing/duplicated
+    """
+    manifest = None
+    rows = []
+    for path in paths:
+        shard_manifest, shard_rows = _read_shard(path)
+        if manifest is None:
+            manifest = shard_manifest
+        for key in ("mode", "version_tag", "count", "total_records"):
+            if shard_manifest.get(key) != manifest.get(key):
+                raise ValueError(f"{path} has {key}={shard_manifest.get(key)!r}, expected {manifest.get(key)!r}")
+        rows.extend(shard_rows)
+        logging.info(f"Shards: loaded {len(shard_rows)} records from {path}")
+
+    rows.sort(key=lambda r: r["row"])
+    positions = [r["row"] for r in rows]
+    if positions != list(range(manifest["total_records"])):
+        raise ValueError(f"shards cover {len(positions)} of {manifest['total_records']} records (missing or duplicate rows)")
+    records = [r["record"] for r in rows]
+    articles = [article for r in rows for article in r["articles"]]
+    return manifest, records, articles
@@ -0,0 +1,70 @@
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# THOTH modules import each other as top-level siblings of main.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def _start_cluster(pgdata):
+    """
+    Start a throwaway Postgres cluster in pgdata, listening on a socket only.
+
+    Uses pgserver's bundled binaries when it is installed, otherwise initdb and
+    pg_ctl from PATH.
+
+    Returns:
+        Tuple of (libpq connection string, stop callable), or None if neither is available
+    """
+    try:
+        import pgserver
+    except ImportError:
+        pgserver = None
+    if pgserver is not None:
+        server = pgserver.get_server(pgdata, cleanup_mode="delete")
+        return server.get_uri(), server.cleanup
+
+    initdb, pg_ctl = shutil.which("initdb"), shutil.which("pg_ctl")
+    if not (initdb and pg_ctl):
+        return None
+    subprocess.run([initdb, "-D", str(pgdata), "-U", "postgres", "-A", "trust"], check=True, capture_output=True)
+    subprocess.run(
+        [pg_ctl, "-D", str(pgdata), "-w", "-l", str(pgdata / "server.log"),
+         "-o", f"-k {pgdata} -c listen_addresses=''", "start"],
+        check=True, capture_output=True,
+    )
+
+    def stop():
+        subprocess.run([pg_ctl, "-D", str(pgdata), "-m", "fast", "stop"], capture_output=True)
+
+    return f"host={pgdata} user=postgres dbname=postgres", stop
+
+
+@pytest.fixture(scope="session")
+def pg_dsn(tmp_path_factory):
+    """
+    Connection string of a Postgres server only the tests use.
+
+    THOTH_TEST_DSN names one explicitly; otherwise a throwaway cluster is
+    started for the session. The --db-sink settings (PGHOST, DB_USER, ...)
+    are never used, so the tests cannot write to a real database.
+    """
+    dsn = os.getenv("THOTH_TEST_DSN")
+    if dsn:
+        yield dsn
+        return
+    try:
+        started = _start_cluster(tmp_path_factory.mktemp("pg") / "data")
+    except (OSError, subprocess.CalledProcessError) as e:
+        pytest.skip(f"could not start a throwaway Postgres cluster: {e}")
+    if started is None:
+        pytest.skip("no Postgres for tests: set THOTH_TEST_DSN or install pgserver or initdb/pg_ctl")
+    dsn, stop = started
+    try:
+        yield dsn
+    finally:
+        stop()
@@ -0,0 +1,67 @@
+"""
+ArticleStore: (url, badge) dedupe, the persistent article_id counter and index repair.
+"""
+import csv
+
+from article_store import ArticleStore
+
+
+def _article(n, badge="4748"):
+    return {"badge": badge, "first_name": "Lenita", "last_name": "Harrison",
+            "title": f"Story {n}", "source": "News", "date_published": "2025-10-01",
+            "url": f"https://news.example.com/{n}"}
+
+
+def _rows(path):
+    with path.open(newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_dedupe_and_unkeyed_articles_are_counted_apart(tmp_path):
+    store = ArticleStore(tmp_path / "articles.csv")
+    store.append([_article(1)])
+
+    new, duplicates, unkeyed = store.append([
+        _article(1),                  # Already stored
+        _article(1, badge="1207"),    # Same story, another officer
+        _article(2, badge=""),        # Officer not identified
+        dict(_article(3), url=""),
+    ])
+
+    assert [(a["url"], a["badge"]) for a in new] == [("https://news.example.com/1", "1207")]
+    assert (duplicates, unkeyed) == (1, 2)
+
+
+def test_counter_persists_across_opens(tmp_path):
+    path = tmp_path / "articles.csv"
+    ArticleStore(path).append([_article(1), _article(2)])
+
+    reopened = ArticleStore(path)
+    assert (reopened.rows, reopened.next_article_id) == (2, 3)
+    new, duplicates, _ = reopened.append([_article(2), _article(3)])
+    assert [a["article_id"] for a in new] == [3]
+    assert duplicates == 1
+    assert [row["article_id"] for row in _rows(path)] == ["1", "2", "3"]
+
+
+def test_out_of_band_edit_rebuilds_the_index(tmp_path):
+    path = tmp_path / "articles.csv"
+    ArticleStore(path).append([_article(1)])
+    # A row added by hand: the CSV size no longer matches the meta file
+    with path.open("a", newline="", encoding="utf-8") as f:
+        f.write("41,1207,Jane,Doe,Hand edit,News,2025-10-02,https://news.example.com/hand\r\n")
+
+    store = ArticleStore(path)
+    assert (store.rows, store.next_article_id) == (2, 42)
+    new, duplicates, _ = store.append([_article(1), dict(_article(9), url="https://news.example.com/hand", badge="1207")])
+    assert new == [] and duplicates == 2
+
+
+def test_missing_trailing_newline_is_repaired(tmp_path):
+    path = tmp_path / "articles.csv"
+    ArticleStore(path).append([_article(1)])
+    path.write_bytes(path.read_bytes().rstrip(b"\r\n"))  # Saved by an editor without the final newline
+
+    ArticleStore(path).append([_article(2)])
+
+    assert [(row["article_id"], row["title"]) for row in _rows(path)] == [("1", "Story 1"), ("2", "Story 2")]
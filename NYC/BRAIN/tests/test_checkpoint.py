@@ -0,0 +1,74 @@
+"""
+CheckpointJournal: journaling completed phases and replaying them on --resume.
+"""
+import json
+
+from checkpoint import CheckpointJournal
+
+ARTICLES = [{"title": "Story", "url": "https://news.example.com/1"}]
+
+
+def _lines(path):
+    return path.read_text(encoding="utf-8").splitlines()
+
+
+def test_resume_replays_completed_phases(tmp_path):
+    path = tmp_path / "checkpoints" / "2505-copwatchdog.full.jsonl"
+    journal = CheckpointJournal(path)
+    journal.record("50-a", "2505-1", {"badge": "4748", "race": "Black"}, ARTICLES)
+    journal.record("payroll", "2505-1", {"base_salary": "92073"})
+    journal.record("50-a", "2505-2", {"badge": "1207"}, [])
+    # Dropped without finish(), as a crash would
+
+    resumed = CheckpointJournal(path, resume=True)
+
+    assert resumed.completed("50-a", "2505-1") == {
+        "phase": "50-a", "key": "2505-1", "fields": {"badge": "4748", "race": "Black"}, "result": ARTICLES,
+    }
+    assert resumed.completed("payroll", "2505-1")["fields"] == {"base_salary": "92073"}
+    assert resumed.completed("payroll", "2505-2") is None
+    assert resumed.skipped == 2
+
+
+def test_crash_truncated_line_is_ignored_and_terminated(tmp_path):
+    path = tmp_path / "run.jsonl"
+    journal = CheckpointJournal(path)
+    journal.record("50-a", "2505-1", {"badge": "4748"}, [])
+    journal._file.close()
+    with path.open("a", encoding="utf-8") as f:
+        f.write('{"phase": "payroll", "key": "2505-1", "fie')  # Cut short mid-write
+
+    resumed = CheckpointJournal(path, resume=True)
+    assert resumed.completed("payroll", "2505-1") is None
+    resumed.record("payroll", "2505-1", {"base_salary": "92073"})
+    resumed._file.close()
+
+    # The new entry starts on its own line, so a second resume reads it
+    assert json.loads(_lines(path)[-1])["fields"] == {"base_salary": "92073"}
+    again = CheckpointJournal(path, resume=True)
+    assert again.completed("50-a", "2505-1") is not None
+    assert again.completed("payroll", "2505-1")["fields"] == {"base_salary": "92073"}
+
+
+def test_later_entry_for_the_same_phase_wins(tmp_path):
+    path = tmp_path / "run.jsonl"
+    journal = CheckpointJournal(path)
+    journal.record("50-a", "lenita|harrison", {"badge": ""}, [])
+    journal.record("50-a", "lenita|harrison", {"badge": "4748"}, ARTICLES)
+    assert journal.completed("50-a", "lenita|harrison")["result"] == ARTICLES
+
+    resumed = CheckpointJournal(path, resume=True)
+    assert resumed.completed("50-a", "lenita|harrison")["fields"] == {"badge": "4748"}
+
+
+def test_fresh_run_discards_old_journal_and_finish_removes_it(tmp_path):
+    path = tmp_path / "run.jsonl"
+    CheckpointJournal(path).record("50-a", "2505-1", {"badge": "4748"}, [])
+
+    fresh = CheckpointJournal(path)
+    assert fresh.completed("50-a", "2505-1") is None
+    fresh.record("payroll", "2505-1", {"base_salary": "92073"})
+    assert len(_lines(path)) == 1
+
+    fresh.finish()
+    assert not path.exists()
@@ -0,0 +1,73 @@
+"""
+StreamingCSVWriter: in-order streaming of finished records and the atomic commit.
+"""
+import csv
+import io
+
+from csv_stream import StreamingCSVWriter, link_or_copy, partial_path
+
+FIELDS = ["Name", "Badge"]
+
+
+def _row(record):
+    return {"Name": record["Name"], "Badge": record.get("badge", "")}
+
+
+def _records(count=5):
+    return [{"Name": f"Officer {i}", "badge": str(1000 + i)} for i in range(count)]
+
+
+def _names(path):
+    with path.open(newline="", encoding="utf-8") as f:
+        return [row["Name"] for row in csv.DictReader(f)]
+
+
+def _batch_csv(records):
+    out = io.StringIO(newline="")
+    writer = csv.DictWriter(out, fieldnames=FIELDS)
+    writer.writeheader()
+    writer.writerows(_row(r) for r in records)
+    return out.getvalue()
+
+
+def test_out_of_order_submits_are_written_in_record_order(tmp_path):
+    path = tmp_path / "2505-copwatchdog.csv"
+    records = _records()
+    stream = StreamingCSVWriter(path, FIELDS, _row)
+
+    stream.submit(2, records[2])
+    stream.submit(1, records[1])
+    assert _names(partial_path(path)) == []  # Record 0 has not finished yet
+
+    stream.submit(0, records[0])
+    assert _names(partial_path(path)) == ["Officer 0", "Officer 1", "Officer 2"]
+    assert not path.exists()
+
+    stream.submit(1, records[1])  # Already written: ignored
+    assert stream.written == 3
+
+
+def test_commit_writes_the_rest_and_matches_a_batch_write(tmp_path):
+    path = tmp_path / "2505-copwatchdog.csv"
+    records = _records()
+    stream = StreamingCSVWriter(path, FIELDS, _row)
+    stream.submit(0, records[0])
+    stream.submit(3, records[3])
+    # Enrichment changed a record after it was submitted but before its turn: the row is built at write time
+    records[3]["badge"] = "9999"
+
+    assert stream.commit(records) == 5
+    assert not partial_path(path).exists()
+    with path.open(newline="", encoding="utf-8") as f:
+        assert f.read() == _batch_csv(records)
+
+
+def test_link_or_copy_replaces_the_destination(tmp_path):
+    src = tmp_path / "2505-copwatchdog.csv"
+    dst = tmp_path / "copwatchdog.csv"
+    src.write_text("new\n", encoding="utf-8")
+    dst.write_text("old\n", encoding="utf-8")
+
+    assert link_or_copy(src, dst) in ("hardlink", "copy")
+    assert dst.read_text(encoding="utf-8") == "new\n"
+    assert not partial_path(dst).exists()
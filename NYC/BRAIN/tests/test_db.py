@@ -0,0 +1,80 @@
+"""
+Database.stream_officers against a live Postgres server: the COPY into a temp
+table, the named-cursor read back in request order, and returning the pooled
+connection when the iterator is abandoned.
+"""
+from contextlib import closing
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+from db import Database
+
+OFFICERS = [
+    ("2505-4748", "Lenita", "Harrison", "4748"),
+    ("2505-1207", "Sean", "O'Brien", "1207"),
+    ("2505-1207", "Sean", "O'Brien", "1207"),  # officers_raw repeats an id
+    ("2505-2211", "Maria", "Garcia", None),
+]
+
+
+@pytest.fixture
+def db(pg_dsn):
+    try:
+        conn = psycopg2.connect(pg_dsn, connect_timeout=3)
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"no Postgres server: {e}")
+    with conn, conn.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM information_schema.schemata WHERE schema_name = 'cwd_raw'")
+        if cursor.fetchone():
+            conn.close()
+            pytest.skip("cwd_raw already exists on the THOTH_TEST_DSN server")
+        cursor.execute("CREATE SCHEMA cwd_raw")
+        cursor.execute("CREATE TABLE cwd_raw.officers_raw (source_id text, first_name text, last_name text, badge text)")
+        cursor.executemany("INSERT INTO cwd_raw.officers_raw VALUES (%s, %s, %s, %s)", OFFICERS)
+    database = Database(minconn=1, maxconn=1, dsn=pg_dsn)
+    yield database, conn
+    database.close()
+    with conn, conn.cursor() as cursor:
+        cursor.execute("DROP SCHEMA cwd_raw CASCADE")
+    conn.close()
+
+
+def test_rows_stream_back_in_request_order(db):
+    database, _ = db
+    requested = ["2505-2211", "2505-9999", "2505-4748", "2505-1207"]
+
+    rows = list(database.stream_officers(requested, itersize=2))
+
+    assert [(r["source_id"], r["found"], r["first_name"], r["badge"]) for r in rows] == [
+        ("2505-2211", True, "Maria", None),
+        ("2505-9999", False, None, None),
+        ("2505-4748", True, "Lenita", "4748"),
+        ("2505-1207", True, "Sean", "1207"),
+    ]
+    # Optional columns the table does not have come back as NULL
+    assert {(r["profile_url"], r["service_start"]) for r in rows} == {(None, None)}
+
+
+def test_optional_columns_are_read_when_present(db):
+    database, conn = db
+    with conn, conn.cursor() as cursor:
+        cursor.execute("ALTER TABLE cwd_raw.officers_raw ADD COLUMN profile_url text")
+        cursor.execute("UPDATE cwd_raw.officers_raw SET profile_url = 'https://50-a.org/officer/T8QD' WHERE badge = '4748'")
+
+    rows = list(database.stream_officers(["2505-4748", "2505-1207"]))
+
+    assert [r["profile_url"] for r in rows] == ["https://50-a.org/officer/T8QD", None]
+
+
+def test_abandoned_stream_returns_its_connection(db):
+    database, _ = db
+    with closing(database.stream_officers([sid for sid, *_ in OFFICERS], itersize=1)) as officers:
+        assert next(officers)["source_id"] == "2505-4748"
+
+    # The pool's only connection is back, out of the stream's transaction (the temp table is gone)
+    with database.connection() as conn, conn.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('pg_temp._thoth_source_ids')")
+        assert cursor.fetchone() == (None,)
+    assert [r["source_id"] for r in database.stream_officers(["2505-1207"])] == ["2505-1207"]
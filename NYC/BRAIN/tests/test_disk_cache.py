@@ -0,0 +1,104 @@
+"""
+DiskCache: TTL expiry, LRU eviction, tag (fiscal year) invalidation and hit accounting.
+"""
+import pytest
+
+import disk_cache
+from disk_cache import DiskCache
+
+DAY = 86400
+
+
+class _Clock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(disk_cache.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    return tmp_path / "enrichment_cache.sqlite"
+
+
+def test_ttl_expiry(cache_file, clock):
+    cache = DiskCache(cache_file, "fiftya", ttl_seconds=30 * DAY)
+    try:
+        cache.put("officer:T8QD", {"badge": "4748"}, aliases=["name:lenita|harrison"])
+        clock.now += 29 * DAY
+        assert cache.lookup(alias="name:lenita|harrison").fresh
+
+        clock.now += 2 * DAY
+        entry = cache.lookup(key="officer:T8QD")
+        assert entry.value == {"badge": "4748"}  # Stale entries are still returned (their URL is reused)
+        assert not entry.fresh
+        assert cache.get(key="officer:T8QD") is None
+    finally:
+        cache.close()
+
+
+def test_lru_eviction_keeps_recently_used(cache_file, clock):
+    cache = DiskCache(cache_file, "fiftya", max_entries=2)
+    try:
+        cache.put("officer:A", 1, aliases=["name:a"])
+        clock.now += 1
+        cache.put("officer:B", 2, aliases=["name:b"])
+        clock.now += 1
+        cache.lookup(key="officer:A")  # A is now more recently used than B
+        clock.now += 1
+        cache.put("officer:C", 3)
+
+        assert cache.get(key="officer:A") == 1
+        assert cache.get(key="officer:C") == 3
+        assert cache.lookup(key="officer:B") is None
+        assert cache.lookup(alias="name:b") is None  # The evicted entry's aliases go with it
+    finally:
+        cache.close()
+
+
+def test_tag_mismatch_is_stale(cache_file, clock):
+    cache = DiskCache(cache_file, "payroll")
+    try:
+        cache.put("payroll:lenita|harrison|", {"base_salary": "92073"}, tag="2025")
+        assert cache.get(key="payroll:lenita|harrison|", tag="2025") == {"base_salary": "92073"}
+
+        # A new priority fiscal year invalidates every entry matched against the old one
+        assert cache.get(key="payroll:lenita|harrison|", tag="2026") is None
+        assert (cache.hits, cache.stale, cache.misses) == (1, 1, 0)
+    finally:
+        cache.close()
+
+
+def test_namespaces_share_a_file(cache_file, clock):
+    fiftya = DiskCache(cache_file, "fiftya")
+    payroll = DiskCache(cache_file, "payroll")
+    try:
+        fiftya.put("k", "profile")
+        payroll.put("k", "salary")
+        assert (fiftya.get(key="k"), payroll.get(key="k")) == ("profile", "salary")
+    finally:
+        fiftya.close()
+        payroll.close()
+
+
+def test_lookup_counts_only_what_the_caller_tallies(cache_file, clock):
+    cache = DiskCache(cache_file, "fiftya")
+    try:
+        cache.put("officer:T8QD", {"badge": "4748"}, aliases=["name:lenita|harrison"])
+        entry = cache.lookup(alias="name:lenita|harrison")
+        assert (cache.hits, cache.misses) == (0, 0)
+
+        cache.tally(None)  # Rejected, e.g. the alias belongs to a same-name officer with another badge
+        assert (cache.hits, cache.stale, cache.misses) == (0, 0, 1)
+        cache.tally(entry)
+        assert cache.stats() == "1 hits, 0 stale, 1 misses (50% hit rate)"
+    finally:
+        cache.close()
@@ -0,0 +1,44 @@
+"""
+--budget parsing and RunBudget accounting.
+"""
+import time
+
+import pytest
+
+from enrich_budget import RunBudget, parse_budget
+
+
+@pytest.mark.parametrize("spec, expected", [
+    ("90s", (90, None)),
+    ("30m", (1800, None)),
+    ("2h", (7200, None)),
+    ("45", (2700, None)),
+    ("500r", (None, 500)),
+])
+def test_parse_budget(spec, expected):
+    assert parse_budget(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["", "0m", "soon", "5d"])
+def test_parse_budget_rejects(spec):
+    with pytest.raises(ValueError):
+        parse_budget(spec)
+
+
+def test_clock_starts_with_enrichment():
+    budget = RunBudget(seconds=0.05)
+    time.sleep(0.1)  # Startup work before enrichment is not charged
+
+    budget.start()
+    assert budget.take()
+    time.sleep(0.1)
+    assert not budget.take()
+
+
+def test_lookup_budget_is_permanent_once_spent():
+    budget = RunBudget(requests=2)
+    budget.start()
+
+    assert [budget.take() for _ in range(4)] == [True, True, False, False]
+    assert (budget.used, budget.deferred) == (2, 2)
+    assert "lookup budget" in budget.exhausted
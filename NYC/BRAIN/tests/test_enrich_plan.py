@@ -0,0 +1,51 @@
+"""
+EnrichPlan source selection for enrich-mode records.
+"""
+from enrich_plan import EnrichPlan
+
+
+def _record(source_id, columns, **fields):
+    return dict({"source_id": source_id, "enrich_columns": columns}, **fields)
+
+
+def test_sources_follow_requested_columns():
+    records = [
+        _record("2505-1", ["race", "badge"]),
+        _record("2505-2", ["base_salary"], service_start="03/01/2012"),
+        _record("2505-3", ["profile_url"], profile_url="https://50-a.org/officer/T8QD"),
+    ]
+    plan = EnrichPlan(records)
+
+    assert (plan.needs(records[0], "50-a"), plan.needs(records[0], "payroll")) == (True, False)
+    assert (plan.needs(records[1], "50-a"), plan.needs(records[1], "payroll")) == (False, True)
+    assert (plan.needs(records[2], "50-a"), plan.needs(records[2], "payroll")) == (False, False)
+    assert plan.payroll_dependencies == 0
+
+
+def test_payroll_without_service_start_also_visits_50a():
+    records = [
+        _record("2505-1", ["base_salary", "pay_basis"]),
+        _record("2505-2", ["base_salary", "service_start"], service_start=""),
+    ]
+    plan = EnrichPlan(records)
+
+    assert plan.needs(records[0], "50-a") and plan.needs(records[0], "payroll")
+    assert plan.payroll_dependencies == 1  # The second officer requested a 50-a column anyway
+    assert plan.visits["50-a search"] == 2
+    assert plan.groups["50-a + payroll"] == 2
+
+
+def test_plan_built_in_chunks_matches_one_pass():
+    records = [
+        _record("2505-1", ["race", "badge"]),
+        _record("2505-2", ["base_salary"]),
+        _record("2505-3", ["profile_url"], profile_url="https://50-a.org/officer/T8QD"),
+        _record("2505-4", ["base_salary"], service_start="03/01/2012"),
+    ]
+    streamed = EnrichPlan()
+    streamed.add(records[:3])
+    streamed.add(records[3:])
+    whole = EnrichPlan(records)
+
+    assert (streamed.count("50-a"), streamed.count("payroll")) == (whole.count("50-a"), whole.count("payroll")) == (2, 2)
+    assert (streamed.visits, streamed.groups) == (whole.visits, whole.groups)
@@ -0,0 +1,115 @@
+"""
+fiftya_html against saved 50-a.org profile pages.
+
+The browser test renders each fixture in Chromium and checks that
+snapshot_from_html() returns exactly what PROFILE_SNAPSHOT_JS returns; it is
+skipped when no Playwright browser can be launched.
+"""
+from pathlib import Path
+
+import pytest
+
+import fiftya_html
+from fiftya_parser import PROFILE_SNAPSHOT_JS, SNAPSHOT_ARGS
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "fiftya"
+PROFILES = sorted(FIXTURES.glob("*.html"))
+PROFILE_URL = "https://50-a.org/officer/T8QD"
+
+
+def _read(name):
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def _inner_text(html, selector="div"):
+    return fiftya_html.parse_html(html).query_selector(selector).inner_text()
+
+
+@pytest.fixture(scope="module")
+def browser_page():
+    sync_api = pytest.importorskip("playwright.sync_api")
+    with sync_api.sync_playwright() as p:
+        try:
+            browser = p.chromium.launch(headless=True)
+        except Exception as e:
+            pytest.skip(f"no Playwright browser: {e}")
+        page = browser.new_page()
+        # Keep the fixture's links and images from loading anything
+        page.route("**/*", lambda route: route.abort())
+        yield page
+        browser.close()
+
+
+@pytest.mark.parametrize("path", PROFILES, ids=lambda p: p.name)
+def test_snapshot_matches_browser(browser_page, path):
+    html = path.read_text(encoding="utf-8")
+    browser_page.set_content(html)
+    expected = browser_page.evaluate(PROFILE_SNAPSHOT_JS, SNAPSHOT_ARGS)
+
+    assert fiftya_html.snapshot_from_html(html, url=expected["url"]) == expected
+
+
+def test_full_profile_fields():
+    fields, articles = fiftya_html.parse_profile_html(_read("officer_T8QD.html"), url=PROFILE_URL)
+
+    assert fields["badge"] == "4748"
+    assert (fields["race"], fields["gender"]) == ("Black", "Female")
+    assert fields["tax_id"] == "965911"
+    assert fields["email"] == "lenita.harrison@nypd.org"
+    assert fields["current_assignment"] == "75th Precinct"
+    assert fields["assignment_start"] == "April 2024"
+    assert fields["previous_assignments"] == "Housing Bureau, Patrol Services Bureau, Transit Bureau"
+    assert fields["precinct_number"] == 75
+    assert fields["service_start"] == "03/01/2012"
+    assert fields["last_earned"] == "$123,456.78"
+    assert fields["has_discipline"] == "Y"
+    assert (fields["num_complaints"], fields["num_substantiated"]) == (12, 4)
+    assert (fields["num_lawsuits"], fields["total_settlements"]) == (3, "$250,000")
+    assert [a["source"] for a in articles] == ["NY Daily News", "Gothamist"]
+    assert articles[0]["date_published"] == "2023-05-02"
+
+
+def test_sparse_profile_fields():
+    fields, articles = fiftya_html.parse_profile_html(_read("officer_X2PL.html"), url=PROFILE_URL)
+
+    assert fields["badge"] == "1207"
+    assert (fields["race"], fields["gender"]) == ("Hispanic", "Male")
+    assert fields["tax_id"] == "937721"
+    assert fields["email"] is None
+    assert fields["current_assignment"] == "Strategic Response Group 2"
+    assert fields["previous_assignments"] == "52nd Precinct"
+    assert fields["service_start"] == "09/01/2006"
+    assert fields["has_discipline"] == "N"
+    assert fields["num_unsubstantiated"] == 2
+    assert articles == []
+
+
+def test_page_without_identity():
+    assert fiftya_html.snapshot_from_html("<html><body><p>Not found</p></body></html>") is None
+    assert fiftya_html.parse_profile_html("") == (None, [])
+
+
+def test_inner_text_blocks_and_breaks():
+    html = "<div> Badge  #12,\n <b>Black</b> Male<p>Tax #9</p>after<br>line<br></div>"
+    assert _inner_text(html) == "Badge #12, Black Male\n\nTax #9\n\nafter\nline\n"
+
+
+def test_inner_text_skips_hidden():
+    html = "<div>a<script>x()</script><span hidden>b</span><noscript>c</noscript><!-- d -->e</div>"
+    assert _inner_text(html) == "ae"
+
+
+def test_inner_text_table_cells():
+    html = "<div><table><tr><td>1</td><td> 2 </td></tr><tr><th>3</th></tr></table></div>"
+    assert _inner_text(html) == "1\t2\n3"
+
+
+def test_descendant_selector_scope():
+    doc = fiftya_html.parse_html("<div class='command x'><p><a class='command' href='/c'>C</a></p></div>")
+    p = doc.query_selector("p")
+
+    # Like querySelector, ancestors in the selector may sit above the queried element
+    assert p.query_selector("div.command a.command").get_attribute("href") == "/c"
+    assert p.query_selector("a[href^='/']").get_attribute("href") == "/c"
+    assert p.query_selector("a[href$='d']") is None
+    assert len(doc.query_selector_all("div a")) == 1
@@ -0,0 +1,95 @@
+"""
+identity scoring: the first-name gate, ranking and the blocking index.
+"""
+from datetime import datetime
+
+import pytest
+
+import identity
+from identity import Identity, IdentityIndex, MATCH_THRESHOLD
+
+
+@pytest.mark.parametrize("query, candidate", [
+    (("Maria", "Garcia"), ("Mario", "Garcia")),
+    (("Sean", "O'Brien"), ("Shawn", "O'Brien")),
+    (("Christina", "Kelly"), ("Christopher", "Kelly")),
+    (("Lenita", "Harrison"), ("Leonard", "Harrison")),
+    (("Ana", "Perez-Smith"), ("Anna", "Smith")),
+])
+def test_different_first_names_never_match(query, candidate):
+    assert identity.score(Identity(*query), Identity(*candidate)) == 0.0
+
+
+@pytest.mark.parametrize("query, candidate", [
+    (("James", "Harris"), ("James", "Harrison")),
+    (("Carlos", "Martin"), ("Carlos", "Martinez")),
+    (("Lenita", "Harison"), ("Lenita", "Harrison")),  # A typo is still another name
+])
+def test_different_last_names_never_match(query, candidate):
+    a, b = Identity(*query), Identity(*candidate)
+    assert not identity.last_names_match(a, b)
+    assert identity.score(a, b) == 0.0
+
+
+@pytest.mark.parametrize("query, candidate", [
+    (("Maria", "Garcia"), ("MARIA", "GARCIA")),
+    (("Chris", "Kelly"), ("Christopher", "Kelly")),  # Trials page truncation
+    (("Ana", "Smith"), ("Ana", "Perez-Smith")),  # Compound last name
+    (("Lenita", "Harrison"), ("Lenita", "Harrison Jr")),
+    (("Sean", "OBrien"), ("Sean", "O'Brien")),
+    (("", "Garcia"), ("Mario", "Garcia")),  # Unknown first name: no gate
+])
+def test_compatible_names_match(query, candidate):
+    assert identity.score(Identity(*query), Identity(*candidate)) >= MATCH_THRESHOLD
+
+
+def test_conflicts_lower_confidence():
+    query = Identity("Maria", "Garcia", initial="L", badge="4748")
+
+    assert identity.score(query, Identity("Maria", "Garcia", initial="L", badge="4748")) == 1.0
+    assert identity.score(query, Identity("Maria", "Garcia", initial="T")) < MATCH_THRESHOLD
+    assert identity.score(query, Identity("Maria", "Garcia", badge="1207")) < 0.5
+
+
+def test_best_match_prefers_the_compatible_first_name():
+    candidates = [("mario", Identity("Mario", "Garcia")), ("maria", Identity("Maria", "Garcia"))]
+
+    assert identity.best_match(Identity("Maria", "Garcia"), candidates, MATCH_THRESHOLD) == ("maria", 1.0)
+    assert identity.best_match(Identity("Marisol", "Garcia"), candidates, MATCH_THRESHOLD) == (None, 0.0)
+
+
+def test_rank_breaks_ties_by_spelling():
+    # Both are truncations of 'Chris'; the closer full name ranks first whatever the input order
+    candidates = [("christopher", Identity("Christopher", "Kelly")), ("christy", Identity("Christy", "Kelly"))]
+    ranked = identity.rank(Identity("Chris", "Kelly"), candidates)
+
+    assert [item for item, _ in ranked] == ["christy", "christopher"]
+    assert ranked[0][1] == ranked[1][1]
+
+
+def test_rank_orders_by_service_start():
+    query = Identity("Lenita", "Harrison", service_start=datetime(2012, 3, 1))
+    candidates = [
+        ("far", Identity("Lenita", "Harrison", service_start=datetime(2002, 3, 1))),
+        ("near", Identity("Lenita", "Harrison", service_start=datetime(2012, 1, 9))),
+        ("other", Identity("Mario", "Harrison", service_start=datetime(2012, 3, 1))),
+    ]
+
+    assert [item for item, _ in identity.rank(query, candidates)] == ["near", "far"]
+
+
+def test_match_all_aligned_with_queries():
+    rows = [("MARIA", "GARCIA"), ("MARIO", "GARCIA"), ("ANA", "PEREZ-SMITH"), ("LENITA", "HARRISON"), ("JAMES", "HARRIS")]
+    index = IdentityIndex(rows, lambda row: Identity(*row))
+    queries = [Identity("Mario", "Garcia"), Identity("Robert", "Smith"), Identity("An", "Smith"),
+               Identity("Lenita", "Harris"), Identity("James", "Harris")]
+
+    results = index.match_all(queries, MATCH_THRESHOLD)
+
+    assert [[row for row, _ in found] for found in results] == [
+        [("MARIO", "GARCIA")],
+        [],
+        [("ANA", "PEREZ-SMITH")],
+        [],  # Harrison is another surname, James Harris another officer
+        [("JAMES", "HARRIS")],
+    ]
@@ -0,0 +1,70 @@
+"""
+OfficerRegistry imports of monthly CSVs, including re-imports after a rescrape merge.
+"""
+import csv
+import os
+
+from officer_registry import OfficerRegistry
+from rescrape_merge import RESCRAPE_FIELD_MAP
+
+HEADER = ["Date", "First", "Last"] + [column for column, _ in RESCRAPE_FIELD_MAP]
+DAY = 86400
+
+
+def _write_month(path, rows, mtime):
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=HEADER, restval="")
+        writer.writeheader()
+        writer.writerows(rows)
+    os.utime(path, (mtime, mtime))
+
+
+def _officer(first, last, badge, complaints):
+    return {
+        "First": first, "Last": last, "Badge": badge, "Profile URL": f"https://50-a.org/officer/{badge}",
+        "# Complaints": complaints, "Base Salary": "85292.00",
+    }
+
+
+def _verified(registry, badge, field):
+    return registry._conn.execute(
+        "SELECT f.value, f.verified_at FROM fields f JOIN officer_keys k ON k.officer_id = f.officer_id "
+        "WHERE k.key = ? AND f.field = ?", (f"badge:{badge}", field),
+    ).fetchone()
+
+
+def test_reimport_keeps_verification_time_of_unchanged_values(tmp_path):
+    month = tmp_path / "2025-05-copwatchdog.csv"
+    imported_at = 1_700_000_000
+    _write_month(month, [_officer("Lenita", "Harrison", "4748", "12"), _officer("Sean", "O'Brien", "1207", "3")], imported_at)
+    registry = OfficerRegistry(tmp_path / "registry.sqlite")
+    try:
+        assert registry.sync(tmp_path) == 2
+
+        # A rescrape merge patches one officer and rewrites the whole file
+        patched_at = imported_at + 40 * DAY
+        _write_month(month, [_officer("Lenita", "Harrison", "4748", "13"), _officer("Sean", "O'Brien", "1207", "3")], patched_at)
+        assert registry.sync(tmp_path) == 2
+
+        assert _verified(registry, "4748", "num_complaints") == ("13", patched_at)
+        assert _verified(registry, "4748", "base_salary") == ("85292.00", imported_at)
+        assert _verified(registry, "1207", "num_complaints") == ("3", imported_at)
+        assert _verified(registry, "1207", "base_salary") == ("85292.00", imported_at)
+    finally:
+        registry.close()
+
+
+def test_recorded_fetch_refreshes_unchanged_values(tmp_path):
+    month = tmp_path / "2025-05-copwatchdog.csv"
+    _write_month(month, [_officer("Lenita", "Harrison", "4748", "12")], 1_700_000_000)
+    registry = OfficerRegistry(tmp_path / "registry.sqlite")
+    try:
+        registry.sync(tmp_path)
+        record = {"First": "Lenita", "Last": "Harrison", "badge": "4748", "base_salary": "85292.00"}
+        registry.record_verified(record, ["payroll"])
+
+        value, verified_at = _verified(registry, "4748", "base_salary")
+        assert value == "85292.00"
+        assert verified_at > 1_700_000_000 + DAY
+    finally:
+        registry.close()
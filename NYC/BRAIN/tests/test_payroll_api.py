@@ -0,0 +1,116 @@
+"""
+payroll_api against a local stub of the SODA endpoint serving recorded JSON.
+"""
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import payroll_api
+from identity import Identity, IdentityIndex, MATCH_THRESHOLD
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+RECORDED_ROWS = json.loads((FIXTURES / "soda_payroll.json").read_text(encoding="utf-8"))
+
+_NAMES_RE = re.compile(r"upper\(last_name\) in \(([^)]*)\)")
+_YEARS_RE = re.compile(r"fiscal_year in \(([^)]*)\)")
+
+
+class _SodaStub(BaseHTTPRequestHandler):
+    """Applies the $where name/year filter and $limit/$offset paging to the recorded rows."""
+
+    requests = []
+
+    def do_GET(self):
+        params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        self.requests.append({"params": params, "token": self.headers.get("X-App-Token")})
+        where = params["$where"]
+        years = {y.strip() for y in _YEARS_RE.search(where).group(1).split(",")}
+        names = _NAMES_RE.search(where)
+        names = {n.strip()[1:-1].replace("''", "'") for n in names.group(1).split(",")} if names else None
+        rows = [
+            r for r in RECORDED_ROWS
+            if r["fiscal_year"] in years and (names is None or r["last_name"].upper() in names)
+        ]
+        offset, limit = int(params["$offset"]), int(params["$limit"])
+        body = json.dumps(rows[offset:offset + limit]).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def soda():
+    _SodaStub.requests = []
+    server = HTTPServer(("127.0.0.1", 0), _SodaStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/resource/k397-673e.json", _SodaStub.requests
+    server.shutdown()
+    server.server_close()
+
+
+def test_batched_query_filters_department_years_and_name_chunks(soda):
+    endpoint, requests = soda
+    names = ["Harrison", "perez-smith", "Garcia", "O'Brien", "Nobody"]
+    rows = payroll_api.fetch_payroll_rows(names, ("2025", "2024"), endpoint=endpoint, app_token="tok", batch_size=2)
+
+    assert len(requests) == 3
+    chunks = []
+    for request in requests:
+        where = request["params"]["$where"]
+        assert where.startswith("upper(agency_name) = 'POLICE DEPARTMENT'")
+        assert "fiscal_year in (2025, 2024)" in where
+        assert request["params"]["$order"] == ":id"
+        assert request["token"] == "tok"
+        chunks.append(_NAMES_RE.search(where).group(1))
+    assert chunks == ["'GARCIA', 'HARRISON'", "'NOBODY', 'O''BRIEN'", "'PEREZ-SMITH'"]
+    assert len(rows) == len(RECORDED_ROWS)
+
+
+def test_pages_until_a_short_page(soda):
+    endpoint, requests = soda
+    rows = payroll_api.fetch_payroll_rows(["Harrison"], ("2025", "2024"), endpoint=endpoint, page_limit=2)
+
+    assert [r["params"]["$offset"] for r in requests] == ["0", "2"]
+    assert len(rows) == 3
+
+
+def test_rows_use_explorer_cell_layout(soda):
+    endpoint, _ = soda
+    rows = payroll_api.fetch_payroll_rows(["Harrison"], ("2025",), endpoint=endpoint)
+    lenita = next(cells for cells in rows if cells[4] == "LENITA")
+
+    assert len(lenita) == len(payroll_api.PAYROLL_COLUMNS) == 17
+    assert lenita[0] == "2025"
+    assert lenita[6] == "03/05/2012"
+    assert lenita[10] == "$92,073.00"
+    assert lenita[12] == "2,080"
+    assert lenita[13] == "$91,842.43"
+    assert lenita[14] == "412.5"
+
+
+def test_in_memory_match_against_fetched_rows(soda):
+    endpoint, _ = soda
+    rows = payroll_api.fetch_payroll_rows(
+        ["Harrison", "Perez-Smith", "Smith", "Garcia"], ("2025", "2024"), endpoint=endpoint
+    )
+    index = IdentityIndex(rows, payroll_api.row_identity)
+
+    lenita = index.search(Identity("Lenita", "Harrison", initial="I"), MATCH_THRESHOLD)
+    assert {(cells[0], cells[4]) for cells, _ in lenita} == {("2025", "LENITA"), ("2024", "LENITA")}
+
+    # Trials page truncates first names; the compound payroll last name still matches
+    ana = index.search(Identity("An", "Smith"), MATCH_THRESHOLD)
+    assert [cells[3] for cells, _ in ana] == ["PEREZ-SMITH"]
+
+    assert index.search(Identity("Robert", "Harrison"), MATCH_THRESHOLD) == []
@@ -0,0 +1,62 @@
+"""
+PayrollSnapshot against a small snapshot built from the recorded SODA rows.
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+import payroll_api
+from names import norm, strip_suffix
+from payroll_snapshot import PayrollSnapshot
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+ROWS = [payroll_api.row_to_cells(row) for row in json.loads((FIXTURES / "soda_payroll.json").read_text(encoding="utf-8"))]
+
+
+def _key(cells):
+    # Same key main.py stores the synced rows under
+    return norm(strip_suffix(cells[3])), norm(cells[4])
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    snapshot = PayrollSnapshot(tmp_path / "payroll.sqlite")
+    snapshot.replace_rows(ROWS, _key)
+    yield snapshot
+    snapshot.close()
+
+
+def test_lookup_by_last_name_and_year(snapshot):
+    years = sorted({cells[0] for cells in ROWS}, reverse=True)
+    found = snapshot.lookup(["harrison"], years)
+
+    assert found == [cells for cells in ROWS if cells[3] == "HARRISON"]
+    assert snapshot.lookup(["harrison"], ["1999"]) == []
+    assert snapshot.fiscal_years() == years
+
+
+def test_variants_return_each_row_once(snapshot):
+    years = snapshot.fiscal_years()
+    # 'Perez-Smith' and 'Perez Smith' normalize to the same key; the parts are separate keys
+    found = snapshot.lookup(["perezsmith", "perezsmith", "perez", "smith"], years)
+
+    assert found == [cells for cells in ROWS if cells[3] == "PEREZ-SMITH"]
+    assert len({json.dumps(cells) for cells in found}) == len(found)
+
+
+def test_replace_rows_and_open_existing(tmp_path):
+    path = tmp_path / "payroll.sqlite"
+    assert PayrollSnapshot.open_existing(path) is None
+
+    snapshot = PayrollSnapshot(path)
+    snapshot.replace_rows(ROWS, _key)
+    snapshot.replace_rows(ROWS[:2], _key)  # A re-sync replaces, never appends
+    snapshot.close()
+
+    reopened = PayrollSnapshot.open_existing(path)
+    try:
+        assert reopened.row_count() == 2
+        assert reopened.meta("synced_at")
+    finally:
+        reopened.close()
@@ -0,0 +1,125 @@
+"""
+PostgresSink against a live Postgres server.
+
+Uses the pg_dsn fixture (THOTH_TEST_DSN or a throwaway cluster, never the
+--db-sink settings) and works in a throwaway schema.
+"""
+import os
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+from psycopg2 import sql
+from psycopg2.extensions import cursor as base_cursor
+
+import pg_sink
+
+FIELDNAMES = ["First Name", "Last Name", "Badge", "# Complaints"]
+SCHEMA = f"thoth_test_{os.getpid()}"
+
+
+class _CountingCursor(base_cursor):
+    """Counts COPY statements so tests can see the batching."""
+
+    copies = 0
+
+    def copy_expert(self, *args, **kwargs):
+        _CountingCursor.copies += 1
+        return super().copy_expert(*args, **kwargs)
+
+
+@pytest.fixture
+def conn(pg_dsn):
+    try:
+        conn = psycopg2.connect(pg_dsn, cursor_factory=_CountingCursor, connect_timeout=3)
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"no Postgres server: {e}")
+    _CountingCursor.copies = 0
+    yield conn
+    conn.rollback()
+    with conn.cursor() as cursor:
+        cursor.execute(sql.SQL("DROP SCHEMA IF EXISTS {} CASCADE").format(sql.Identifier(SCHEMA)))
+    conn.commit()
+    conn.close()
+
+
+def _rows(conn, table, columns, order):
+    with conn.cursor() as cursor:
+        cursor.execute(sql.SQL("SELECT {} FROM {} ORDER BY {}").format(
+            sql.SQL(", ").join(map(sql.Identifier, columns)),
+            sql.Identifier(SCHEMA, table),
+            sql.SQL(", ").join(map(sql.Identifier, order)),
+        ))
+        return cursor.fetchall()
+
+
+def _officer(first, last, badge, complaints, **extra):
+    return dict({"First Name": first, "Last Name": last, "Badge": badge, "# Complaints": complaints}, **extra)
+
+
+def test_records_copied_in_batches_and_upserted(conn):
+    sink = pg_sink.PostgresSink(conn, FIELDNAMES, schema=SCHEMA, batch_size=2)
+    records = [
+        _officer("Lenita", "Harrison", "4748", "12"),
+        _officer("Sean", "O'Brien", "1207", "3"),
+        _officer("Ana", "Perez-Smith", "N/A", "0"),  # No badge: no source_id
+        _officer("Maria", "Garcia", "2211", "1", source_id="raw-77"),
+        _officer("Lenita", "Harrison", "4748", "13"),  # Tried twice: the later row wins
+        _officer("Mario", "Garcia", "5150", "0"),
+    ]
+
+    assert sink.write_records(records, "2025-06", dict) == (4, 1)
+    assert _CountingCursor.copies == 2
+    assert _rows(conn, "officers_scraped", ["source_id", "version_tag", "first_name", "num_complaints"], ["source_id"]) == [
+        ("2025-06-1207", "2025-06", "Sean", "3"),
+        ("2025-06-4748", "2025-06", "Lenita", "13"),
+        ("2025-06-5150", "2025-06", "Mario", "0"),
+        ("raw-77", "2025-06", "Maria", "1"),
+    ]
+
+    # A later run updates rows in place on source_id
+    assert sink.write_records([_officer("Sean", "O'Brien", "1207", "4")], "2025-06", dict) == (1, 0)
+    rows = _rows(conn, "officers_scraped", ["source_id", "num_complaints"], ["source_id"])
+    assert len(rows) == 4
+    assert ("2025-06-1207", "4") in rows
+
+
+def test_enrichment_upserted_on_source_and_column(conn):
+    sink = pg_sink.PostgresSink(conn, FIELDNAMES, schema=SCHEMA, batch_size=2)
+    written = sink.write_enrichment([
+        ("raw-1", "badge", "4748"),
+        ("raw-1", "tax_id", "965911"),
+        ("raw-2", "badge", "1207"),
+        ("raw-1", "badge", "4749"),  # Same key again: the later value wins
+    ])
+
+    assert written == 3
+    assert _CountingCursor.copies == 2
+    assert sink.write_enrichment([("raw-2", "badge", "1208")]) == 1
+    assert _rows(conn, "enrichment_scraped", pg_sink.ENRICHMENT_COLUMNS, ["source_id", "column_name"]) == [
+        ("raw-1", "badge", "4749"),
+        ("raw-1", "tax_id", "965911"),
+        ("raw-2", "badge", "1208"),
+    ]
+
+
+def test_articles_upserted_on_article_id(conn):
+    sink = pg_sink.PostgresSink(conn, FIELDNAMES, schema=SCHEMA)
+    article = {"article_id": 1, "badge": "4748", "first_name": "Lenita", "last_name": "Harrison",
+               "title": "Officer named in Brooklyn stop", "source": "NY Daily News",
+               "date_published": "2023-05-02", "url": "https://www.nydailynews.com/2023/05/02/officer-story/"}
+
+    assert sink.write_articles([article, dict(article, article_id=2, title="Precinct review")]) == 2
+    assert sink.write_articles([dict(article, source="Daily News")]) == 1
+    assert _rows(conn, "articles_scraped", ["article_id", "source", "title"], ["article_id"]) == [
+        (1, "Daily News", "Officer named in Brooklyn stop"),
+        (2, "NY Daily News", "Precinct review"),
+    ]
+
+
+def test_nothing_to_write(conn):
+    sink = pg_sink.PostgresSink(conn, FIELDNAMES, schema=SCHEMA)
+
+    assert sink.write_records([_officer("Ana", "Perez-Smith", "", "0")], "2025-06", dict) == (0, 1)
+    assert sink.write_enrichment([]) == 0
+    assert _CountingCursor.copies == 0
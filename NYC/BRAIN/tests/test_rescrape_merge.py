@@ -0,0 +1,80 @@
+"""
+Rescrape merge: matching rescraped officers to monthly CSV rows and patching them.
+"""
+import csv
+
+from rescrape_merge import RowIndex, group_by_monthly_file, merge_rescraped
+
+FIELDS = ["First", "Last", "Badge", "Race", "Date"]
+
+
+def _row(first, last, badge="", race="", date="10/01/2025"):
+    return {"First": first, "Last": last, "Badge": badge, "Race": race, "Date": date}
+
+
+def _write_csv(path, rows):
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def test_same_name_officers_with_different_badges():
+    rows = [_row("John", "Smith", "1111"), _row("John", "Smith", "2222"), _row("John", "Smith", "2222", date="10/08/2025")]
+    record = {"source_id": "2510-2222", "First": "John", "Last": "Smith", "badge": "2222", "race": "White"}
+
+    stats = merge_rescraped(rows, [record], month="2510")
+
+    assert [r["Race"] for r in rows] == ["", "White", "White"]
+    assert [r["Date"] for r in rows] == ["10/01/2025", "10/01/2025", "10/08/2025"]  # Trial columns untouched
+    assert stats == {"rows_updated": 2, "fields_changed": 2, "matched": 1, "unmatched": 0, "ambiguous": 0}
+
+
+def test_source_id_badge_is_only_trusted_for_its_own_month():
+    rows = [_row("Jane", "Doe", "1111"), _row("Mary", "Major", "3333")]
+    index = RowIndex(rows)
+    # '2509-3333' was the trial of another officer in a different month's file
+    record = {"source_id": "2509-3333", "First": "Jane", "Last": "Doe", "badge": "1111"}
+
+    assert index.match(rows, record, month="2510") == ([0], "badge")
+    assert index.match(rows, record, month="2509") == ([1], "source_id")
+
+
+def test_ambiguous_name_without_badge_is_refused():
+    rows = [_row("John", "Smith", "1111"), _row("John", "Smith", "2222")]
+    record = {"source_id": "", "First": "John", "Last": "Smith", "badge": "", "race": "White"}
+
+    stats = merge_rescraped(rows, [record], month="2510")
+
+    assert stats["ambiguous"] == 1 and stats["matched"] == 0
+    assert [r["Race"] for r in rows] == ["", ""]
+
+
+def test_missing_values_do_not_clear_cells():
+    rows = [_row("Jane", "Doe", "1111", race="Black")]
+    record = {"source_id": "2510-1111", "First": "Jane", "Last": "Doe", "badge": "1111", "race": None, "gender": ""}
+
+    stats = merge_rescraped(rows, [record], month="2510")
+
+    assert rows[0]["Race"] == "Black"
+    assert stats["rows_updated"] == 0 and stats["matched"] == 1
+
+
+def test_group_by_monthly_file(tmp_path):
+    default = tmp_path / "2510-copwatchdog.csv"
+    older = tmp_path / "2509-copwatchdog.csv"
+    _write_csv(default, [])
+    _write_csv(older, [])
+    records = [
+        {"source_id": "2509-1111"},
+        {"source_id": "2510-2222"},
+        {"source_id": "2407-3333"},  # No such file: falls back to the run's CSV
+        {"source_id": "lenita|harrison"},
+        {"source_id": "2509-4444"},
+    ]
+
+    groups = group_by_monthly_file(records, default, tmp_path)
+
+    assert list(groups) == [default, older]
+    assert [r["source_id"] for r in groups[default]] == ["2510-2222", "2407-3333", "lenita|harrison"]
+    assert [r["source_id"] for r in groups[older]] == ["2509-1111", "2509-4444"]
@@ -0,0 +1,112 @@
+"""
+Resource policies: which requests are blocked, and the sampled bytes-saved accounting.
+"""
+import logging
+
+import pytest
+
+import resource_policy
+from resource_policy import POLICIES, ResourceStats
+
+
+class _Frame:
+    def __init__(self, url):
+        self.url = url
+
+
+class _Request:
+    def __init__(self, resource_type, url, page_url="https://50-a.org/search"):
+        self.resource_type = resource_type
+        self.url = url
+        self.frame = _Frame(page_url)
+
+
+class _Response:
+    def __init__(self, request, length):
+        self.request = request
+        self.headers = {"content-length": str(length)} if length is not None else {}
+
+
+class _Route:
+    def __init__(self):
+        self.outcome = None
+
+    def abort(self, reason):
+        self.outcome = "abort"
+
+    def continue_(self):
+        self.outcome = "continue"
+
+
+class _Context:
+    """Drives the handlers install() registers, like a browser context would."""
+
+    def __init__(self):
+        self.handler = None
+        self.listeners = {}
+
+    def route(self, pattern, handler):
+        self.handler = handler
+
+    def on(self, event, listener):
+        self.listeners[event] = listener
+
+    def load(self, request, length=None):
+        route = _Route()
+        self.handler(route, request)
+        if route.outcome == "continue":
+            self.listeners["response"](_Response(request, length))
+        return route.outcome
+
+
+@pytest.mark.parametrize("policy, resource_type, url, page_url, expected", [
+    ("light", "image", "https://50-a.org/img/officer/T8QD.jpg", None, "type:image"),
+    ("light", "script", "https://www.googletagmanager.com/gtm.js", None, "domain:googletagmanager.com"),
+    ("light", "script", "https://50-a.org/static/search.js", "https://50-a.org/officer/T8QD", None),
+    ("light", "document", "https://50-a.org/img/x.jpg", None, None),
+    ("strict", "script", "https://50-a.org/static/search.js", "https://50-a.org/officer/T8QD", "no-js"),
+    ("strict", "script", "https://50-a.org/static/search.js", "https://50-a.org/search", None),
+    ("strict", "stylesheet", "https://50-a.org/static/site.css", None, "type:stylesheet"),
+])
+def test_block_reason(policy, resource_type, url, page_url, expected):
+    assert POLICIES[policy].block_reason(resource_type, url, page_url) == expected
+
+
+def test_off_installs_nothing():
+    context = _Context()
+    resource_policy.install(context, POLICIES["off"], ResourceStats())
+    assert context.handler is None and not context.listeners
+
+
+def test_bytes_saved_from_sampled_requests():
+    context = _Context()
+    stats = ResourceStats(sample_every=4)
+    resource_policy.install(context, POLICIES["light"], stats)
+
+    outcomes = [context.load(_Request("image", f"https://50-a.org/img/{i}.jpg"), length=30_000) for i in range(8)]
+    context.load(_Request("font", "https://50-a.org/f.woff2"))  # Matched once, never sampled
+    context.load(_Request("document", "https://50-a.org/officer/T8QD"), length=12_000)
+
+    # Every 4th image went through to be measured instead of being aborted
+    assert outcomes == ["abort", "abort", "abort", "continue"] * 2
+    assert stats.blocked == {"type:image": 6, "type:font": 1}
+    assert stats.sampled == {"type:image": [2, 2, 60_000]}
+    assert stats.bytes_saved("type:image") == 6 * 30_000
+    assert stats.bytes_saved("type:font") is None
+    assert (stats.loaded_requests, stats.loaded_bytes) == (1, 12_000)  # Samples are not counted as loaded
+
+
+def test_summary_reports_measured_bytes(caplog):
+    stats = ResourceStats(sample_every=2)
+    for _ in range(4):
+        if stats.take_sample("type:image"):
+            stats.record_sample("type:image", 50_000)
+        else:
+            stats.record_blocked("type:image")
+    stats.record_blocked("type:font")
+
+    with caplog.at_level(logging.INFO):
+        stats.log_summary("light")
+
+    assert "blocked 3 requests, saving about 0.1 MB (1 of 2 rules sized from samples)" in caplog.text
+    assert "type:font: 1 requests, bytes not measured (0 of 0 samples sized)" in caplog.text
@@ -0,0 +1,122 @@
+"""
+Sharded runs: deterministic partitioning, shard files and the merge back into one run.
+"""
+import pytest
+
+import shards
+from article_store import ArticleStore
+
+COUNT = 3
+
+
+def _key(record):
+    return record["source_id"]
+
+
+def _records(total=40):
+    # Repeat trials of one officer share a source_id, so they must land in the same shard
+    return [{"source_id": f"2505-{i % 31}", "Name": f"Officer {i % 31}", "row_note": i} for i in range(total)]
+
+
+def _articles(record):
+    officer = record["source_id"]
+    return [
+        {"badge": officer, "title": f"Story {n}", "url": f"https://news.example.com/{officer}/{n}"}
+        for n in range(record["row_note"] % 3)
+    ]
+
+
+def _write_shards(tmp_path, records, stem="2505-copwatchdog"):
+    manifest = {"mode": "full", "version_tag": "2505", "count": COUNT, "total_records": len(records)}
+    for index in range(1, COUNT + 1):
+        selected = shards.partition(records, index, COUNT, _key)
+        shards.write_shard(
+            shards.shard_path(tmp_path, stem, index, COUNT),
+            dict(manifest, index=index),
+            ((row, record, _articles(record)) for row, record in selected),
+        )
+
+
+@pytest.mark.parametrize("spec, expected", [("2/4", (2, 4)), (" 1 / 1 ", (1, 1))])
+def test_parse_shard_spec(spec, expected):
+    assert shards.parse_shard_spec(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["0/4", "5/4", "2-4", "", "1/0"])
+def test_parse_shard_spec_rejects(spec):
+    with pytest.raises(ValueError):
+        shards.parse_shard_spec(spec)
+
+
+def test_partition_is_deterministic_and_complete():
+    records = _records()
+    selections = [shards.partition(records, index, COUNT, _key) for index in range(1, COUNT + 1)]
+
+    rows = sorted(row for selected in selections for row, _ in selected)
+    assert rows == list(range(len(records)))
+    for index, selected in enumerate(selections, start=1):
+        # Every trial of an officer is in the shard its key hashes to
+        assert {shards.shard_of(_key(record), COUNT) for _, record in selected} <= {index}
+    # Same split whatever the list order: membership depends on the key only
+    reordered = shards.partition(list(reversed(records)), 1, COUNT, _key)
+    assert {r["row_note"] for _, r in reordered} == {r["row_note"] for _, r in selections[0]}
+
+
+def test_merge_round_trip_matches_unsharded_order(tmp_path):
+    records = _records()
+    _write_shards(tmp_path / "shards", records)
+
+    stem, paths = shards.find_shard_set(tmp_path / "shards", COUNT)
+    manifest, merged, articles = shards.load_shards(paths)
+
+    assert stem == "2505-copwatchdog"
+    assert manifest["total_records"] == len(records)
+    assert merged == records
+    assert articles == [article for record in records for article in _articles(record)]
+
+
+def test_merge_assigns_article_ids_like_an_unsharded_run(tmp_path):
+    records = _records()
+    _write_shards(tmp_path / "shards", records)
+    _, _, merged_articles = shards.load_shards(shards.find_shard_set(tmp_path / "shards", COUNT)[1])
+
+    (tmp_path / "unsharded").mkdir()
+    (tmp_path / "merged").mkdir()
+    unsharded = ArticleStore(tmp_path / "unsharded" / "articles.csv")
+    merged = ArticleStore(tmp_path / "merged" / "articles.csv")
+    expected, _, _ = unsharded.append([a for record in records for a in _articles(record)])
+    appended, _, _ = merged.append(merged_articles)
+
+    assert [(a["article_id"], a["url"]) for a in appended] == [(a["article_id"], a["url"]) for a in expected]
+    assert (tmp_path / "merged" / "articles.csv").read_bytes() == (tmp_path / "unsharded" / "articles.csv").read_bytes()
+
+
+def test_merge_rejects_missing_or_duplicate_rows(tmp_path):
+    records = _records()
+    _write_shards(tmp_path, records)
+    paths = [shards.shard_path(tmp_path, "2505-copwatchdog", index, COUNT) for index in range(1, COUNT + 1)]
+
+    with pytest.raises(ValueError, match="missing or duplicate"):
+        shards.load_shards(paths[:-1])
+    with pytest.raises(ValueError, match="missing or duplicate"):
+        shards.load_shards(paths + paths[:1])
+
+
+def test_merge_rejects_shards_of_another_run(tmp_path):
+    records = _records()
+    _write_shards(tmp_path, records)
+    other = shards.shard_path(tmp_path, "2505-copwatchdog", 2, COUNT)
+    shards.write_shard(other, {"mode": "rescrape", "version_tag": "2505", "count": COUNT,
+                               "total_records": len(records), "index": 2}, [])
+
+    paths = [shards.shard_path(tmp_path, "2505-copwatchdog", index, COUNT) for index in range(1, COUNT + 1)]
+    with pytest.raises(ValueError, match="mode"):
+        shards.load_shards(paths)
+
+
+def test_find_shard_set_needs_a_complete_set(tmp_path):
+    _write_shards(tmp_path, _records())
+    shards.shard_path(tmp_path, "2505-copwatchdog", 3, COUNT).unlink()
+
+    with pytest.raises(ValueError, match="no complete set"):
+        shards.find_shard_set(tmp_path, COUNT)
@@ -0,0 +1,69 @@
+"""
+HostThrottle: per-host concurrency cap, shared request spacing and the per-officer pause.
+"""
+import threading
+import time
+
+from throttle import HostThrottle, RateLimiter
+
+
+def test_rate_limiter_spaces_starts_across_threads():
+    limiter = RateLimiter(min_ms=20, max_ms=20)
+    waits = []
+    threads = [threading.Thread(target=lambda: waits.append(limiter.wait())) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Each caller waits one more jitter than the caller before it
+    for position, waited in enumerate(sorted(waits)):
+        assert waited >= position * 0.020 - 0.005
+
+
+def test_slot_caps_in_flight_requests_per_host():
+    throttle = HostThrottle(per_host_limit=2, min_ms=0, max_ms=0)
+    running = {"50-a.org": 0, "www.seethroughny.net": 0}
+    peak = dict(running)
+    lock = threading.Lock()
+
+    def load(url):
+        host = throttle.host_of(url)
+        with throttle.slot(url):
+            with lock:
+                running[host] += 1
+                peak[host] = max(peak[host], running[host])
+            time.sleep(0.02)
+            with lock:
+                running[host] -= 1
+
+    urls = ["https://50-a.org/search"] * 6 + ["https://www.seethroughny.net/payrolls"] * 3
+    threads = [threading.Thread(target=load, args=(url,)) for url in urls]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert peak == {"50-a.org": 2, "www.seethroughny.net": 2}
+
+
+def test_page_loads_are_counted_per_thread():
+    throttle = HostThrottle(min_ms=0, max_ms=0)
+    with throttle.slot("https://50-a.org/officer/T8QD"):
+        pass
+    other = []
+    thread = threading.Thread(target=lambda: other.append(throttle.page_loads))
+    thread.start()
+    thread.join()
+
+    assert throttle.page_loads == 1
+    assert other == [0]
+
+
+def test_pause_sleeps_within_the_jitter_window():
+    throttle = HostThrottle(min_ms=10, max_ms=30)
+    started = time.monotonic()
+    slept = throttle.pause()
+
+    assert 0.010 <= slept <= 0.030
+    assert time.monotonic() - started >= slept
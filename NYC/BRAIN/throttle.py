@@ -0,0 +1,117 @@
+"""
+Request pacing for THOTH scrapers.
+
+Every page load against 50-a.org or NYC Open Data goes through a HostThrottle so
+that running several browser pages at once never raises the request rate above
+what the single-page scraper produced with its random 150-600 ms jitter. A
+single page still pauses for that jitter after each officer that needed a
+page load (HostThrottle.pause), as the original 50-a loop did.
+"""
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+# Jitter window between request starts (milliseconds), same as the original single-page loop
+JITTER_MIN_MS = 150
+JITTER_MAX_MS = 600
+
+
+class RateLimiter:
+    """
+    Shared pacing gate: consecutive request starts are spaced by a random
+    jitter, no matter how many workers are calling wait().
+    """
+
+    def __init__(self, min_ms=JITTER_MIN_MS, max_ms=JITTER_MAX_MS):
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        """
+        Block until this caller's slot comes up.
+
+        Returns:
+            Seconds spent waiting
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + random.uniform(self.min_ms, self.max_ms) / 1000.0
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+        return max(delay, 0.0)
+
+
+class HostThrottle:
+    """
+    Per-host concurrency cap plus a per-host RateLimiter.
+
+    Args:
+        per_host_limit: Maximum number of in-flight requests against one host
+        min_ms: Lower bound of the jitter between request starts on one host
+        max_ms: Upper bound of the jitter between request starts on one host
+    """
+
+    def __init__(self, per_host_limit=2, min_ms=JITTER_MIN_MS, max_ms=JITTER_MAX_MS):
+        self.per_host_limit = max(1, int(per_host_limit))
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._limiters = {}
+        self._local = threading.local()
+
+    @staticmethod
+    def host_of(url_or_host):
+        """Return the bare hostname for a URL (or pass a hostname through unchanged)."""
+        if "://" in url_or_host:
+            return urlparse(url_or_host).netloc.lower()
+        return url_or_host.lower()
+
+    @property
+    def page_loads(self):
+        """Number of slots the calling thread has taken so far."""
+        return getattr(self._local, "loads", 0)
+
+    def pause(self):
+        """
+        Sleep for one random jitter, the single-page loop's pause between officers.
+
+        Returns:
+            Seconds slept
+        """
+        delay = random.uniform(self.min_ms, self.max_ms) / 1000.0
+        time.sleep(delay)
+        return delay
+
+    def _get(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.per_host_limit)
+                self._limiters[host] = RateLimiter(self.min_ms, self.max_ms)
+            return self._semaphores[host], self._limiters[host]
+
+    @contextmanager
+    def slot(self, url_or_host):
+        """
+        Hold one of the host's concurrency slots and wait for its next rate slot.
+
+        Args:
+            url_or_host: Target URL or hostname
+        """
+        host = self.host_of(url_or_host)
+        semaphore, limiter = self._get(host)
+        semaphore.acquire()
+        self._local.loads = self.page_loads + 1
+        try:
+            waited = limiter.wait()
+            logging.debug(f"Throttle: {host} slot acquired after {waited * 1000:.0f}ms")
+            yield
+        finally:
+            semaphore.release()
@@ -0,0 +1,182 @@
+"""
+Targeted page-readiness waits with adaptive timeouts.
+
+wait_until="networkidle" waits for 500 ms of network silence, which on the
+analytics-heavy payroll explorer and on 50-a costs seconds per officer. A
+WaitProfile instead names the element that proves a page is usable (the 50-a
+search box, the profile identity block, the payroll results table); pages are
+loaded with domcontentloaded and then only that selector is awaited.
+
+WaitTracker keeps recent load times per profile, shrinks each timeout towards
+a multiple of the observed p95 (never above the profile's base timeout) and
+totals every second spent waiting so the run log shows how much was idle.
+"""
+import logging
+import math
+import threading
+import time
+from collections import deque
+
+# Samples kept per profile and needed before timeouts start adapting
+WINDOW_SIZE = 200
+MIN_SAMPLES = 20
+P95_MULTIPLIER = 3.0
+
+
+class WaitProfile:
+    """
+    How to tell that a page (or an in-page action) is ready.
+
+    Args:
+        name: Profile name used in logs and metrics
+        ready_selector: CSS selector that appears once the page is usable
+        base_timeout_ms: Timeout used until enough samples exist; also the adaptive ceiling
+        min_timeout_ms: Floor for the adaptive timeout
+    """
+
+    def __init__(self, name, ready_selector, base_timeout_ms, min_timeout_ms):
+        self.name = name
+        self.ready_selector = ready_selector
+        self.base_timeout_ms = base_timeout_ms
+        self.min_timeout_ms = min_timeout_ms
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    idx = max(0, math.ceil(pct / 100.0 * len(sorted_values)) - 1)
+    return sorted_values[idx]
+
+
+class WaitTracker:
+    """
+    Runs readiness waits and records their durations (thread-safe).
+
+    Args:
+        profiles: Dict of profile name -> WaitProfile
+        adaptive: If False, always use each profile's base timeout
+    """
+
+    def __init__(self, profiles, adaptive=True):
+        self.profiles = profiles
+        self.adaptive = adaptive
+        self._lock = threading.Lock()
+        self._samples = {name: deque(maxlen=WINDOW_SIZE) for name in profiles}
+        self._stats = {name: {"waits": 0, "timeouts": 0, "seconds": 0.0} for name in profiles}
+        self.sleep_seconds = 0.0
+        self.started = time.monotonic()
+
+    def timeout_ms(self, name):
+        """Current timeout for a profile: base until MIN_SAMPLES, then p95 x P95_MULTIPLIER within [min, base]."""
+        profile = self.profiles[name]
+        if not self.adaptive:
+            return profile.base_timeout_ms
+        with self._lock:
+            samples = sorted(self._samples[name])
+        if len(samples) < MIN_SAMPLES:
+            return profile.base_timeout_ms
+        adaptive = int(_percentile(samples, 95) * P95_MULTIPLIER)
+        return max(profile.min_timeout_ms, min(profile.base_timeout_ms, adaptive))
+
+    def _record(self, name, elapsed_ms, timed_out):
+        with self._lock:
+            stats = self._stats[name]
+            stats["waits"] += 1
+            stats["seconds"] += elapsed_ms / 1000.0
+            if timed_out:
+                stats["timeouts"] += 1
+            else:
+                # Timeouts are censored samples; keeping them would only ratchet the p95 up to the cap
+                self._samples[name].append(elapsed_ms)
+
+    def navigate(self, page, url, name, timeout_ms=None):
+        """
+        Load url with domcontentloaded and wait for the profile's ready selector.
+
+        The selector wait is skipped for HTTP error responses (status >= 400)
+        so callers can handle a 404 without sitting through the timeout.
+
+        Args:
+            page: Playwright page
+            url: URL to load
+            name: WaitProfile name
+            timeout_ms: Override for the whole load (defaults to the adaptive timeout)
+
+        Returns:
+            Playwright Response (or None), as page.goto returns
+
+        Raises:
+            Playwright TimeoutError if the page is not ready in time
+        """
+        return self._load(page, name, timeout_ms, lambda t: page.goto(url, wait_until="domcontentloaded", timeout=t))
+
+    def reload(self, page, name, timeout_ms=None):
+        """Reload the current page and wait for the profile's ready selector (see navigate)."""
+        return self._load(page, name, timeout_ms, lambda t: page.reload(wait_until="domcontentloaded", timeout=t))
+
+    def _load(self, page, name, timeout_ms, load):
+        profile = self.profiles[name]
+        budget = timeout_ms or self.timeout_ms(name)
+        started = time.monotonic()
+        timed_out = True
+        try:
+            response = load(budget)
+            if response is not None and response.status >= 400:
+                timed_out = False
+                return response
+            remaining = max(1, budget - int((time.monotonic() - started) * 1000))
+            page.wait_for_selector(profile.ready_selector, timeout=remaining)
+            timed_out = False
+            return response
+        finally:
+            self._record(name, (time.monotonic() - started) * 1000, timed_out)
+
+    def wait_ready(self, page, name, timeout_ms=None):
+        """
+        Wait for the profile's ready selector after an in-page action (search submit, click).
+
+        Returns:
+            The matched element handle
+
+        Raises:
+            Playwright TimeoutError if the selector does not appear in time
+        """
+        profile = self.profiles[name]
+        budget = timeout_ms or self.timeout_ms(name)
+        started = time.monotonic()
+        timed_out = True
+        try:
+            element = page.wait_for_selector(profile.ready_selector, timeout=budget)
+            timed_out = False
+            return element
+        finally:
+            self._record(name, (time.monotonic() - started) * 1000, timed_out)
+
+    def sleep(self, page, ms):
+        """Fixed pause (backoff, settle time); counted as idle time."""
+        page.wait_for_timeout(ms)
+        with self._lock:
+            self.sleep_seconds += ms / 1000.0
+
+    def log_summary(self):
+        """Log per-profile wait counts, p50/p95, current timeout and total idle time."""
+        elapsed = time.monotonic() - self.started
+        with self._lock:
+            snapshot = {name: (dict(stats), sorted(self._samples[name])) for name, stats in self._stats.items()}
+            sleep_seconds = self.sleep_seconds
+        waited = 0.0
+        for name, (stats, samples) in snapshot.items():
+            if not stats["waits"]:
+                continue
+            waited += stats["seconds"]
+            logging.info(
+                f"Waits: {name}: {stats['waits']} waits, {stats['timeouts']} timeouts, "
+                f"p50 {_percentile(samples, 50):.0f}ms, p95 {_percentile(samples, 95):.0f}ms, "
+                f"timeout now {self.timeout_ms(name)}ms, {stats['seconds']:.1f}s total"
+            )
+        idle = waited + sleep_seconds
+        share = (idle / elapsed * 100) if elapsed else 0.0
+        logging.info(
+            f"Waits: {idle:.1f}s idle of {elapsed:.1f}s run ({share:.0f}%): "
+            f"{waited:.1f}s waiting for pages, {sleep_seconds:.1f}s fixed pauses"
+        )